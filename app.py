@@ -1,34 +1,82 @@
+import io
 import os
-import uuid
 import json
 import re
-from flask import Flask, render_template, request, send_file, flash, redirect, session, jsonify, url_for
+import difflib
+import gzip
+import time
+import shutil
+import zipfile
+import tempfile
+import asyncio
+import threading
+import functools
+import mimetypes
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from flask import Flask, Response, render_template, request, send_file, send_from_directory, flash, redirect, session, jsonify, url_for, g
+from flask import before_render_template, template_rendered, abort, has_request_context
+from markupsafe import Markup, escape
+from jinja2 import pass_context
 from werkzeug.utils import secure_filename
-from PyPDF2 import PdfReader
-from docx import Document
-from docx.enum.text import WD_PARAGRAPH_ALIGNMENT
-from openpyxl import Workbook
-from openpyxl.styles import Font, Alignment, Border, Side, PatternFill
-from openpyxl.utils import get_column_letter
-import google.generativeai as genai
-from playwright.sync_api import sync_playwright
-import pdfplumber
+from werkzeug.exceptions import NotFound
 import logging
+from logging_config import configure_logging, log_payload, ProfileSummary
+from metrics import (
+    observe_stage, observe_duration, record_cache, metrics_payload,
+    CHROMIUM_BROWSERS, CHROMIUM_LAUNCHES, REQUEST_DURATION, REQUESTS_IN_FLIGHT,
+    RESUME_REUSE, RESUME_SIMILARITY, PARSE_SECONDS_SAVED, LLM_JSON_PARSES
+)
+import async_backends
+import llm_gateway
+import llm_client
+import llm_routing
+import llm_usage
+import single_flight
+import resume_index
+import profile_store
+import skill_index
+import jd_match
+import skill_catalog
+import json_salvage
+import artifact_store
 from datetime import timedelta
 import traceback
-import urllib.parse
-import bleach
 from flask_session import Session
 
-# Configure logging
-logging.basicConfig(level=logging.DEBUG, format='%(asctime)s - %(levelname)s - %(message)s')
-
-# Gemini API Key
-api_key = os.getenv("GEMINI_API_KEY")
-if not api_key:
-    raise RuntimeError("Missing GEMINI_API_KEY environment variable")
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# Configure logging (LOG_LEVEL, LOG_FORMAT, LOG_FILE, LOG_PAYLOAD_* env vars)
+configure_logging()
+
+# Heavy backends (Gemini client, Playwright, pdfplumber, python-docx, openpyxl,
+# bleach, numpy/scipy) are imported on first use so the app, health checks and the
+# create-from-scratch flow boot without them. Under gunicorn with
+# GUNICORN_PRELOAD=1 the master calls preload_backends() before forking, so
+# workers share those pages copy-on-write instead.
+HEAVY_BACKEND_MODULES = [
+    'google.generativeai', 'playwright.sync_api', 'playwright.async_api', 'pdfplumber', 'docx',
+    'openpyxl', 'openpyxl.styles', 'lxml.html', 'bleach', 'numpy', 'scipy.sparse'
+]
 
-genai.configure(api_key=api_key)
+def preload_backends():
+    import importlib
+    module_names = list(HEAVY_BACKEND_MODULES)
+    if 'weasyprint' in {PDF_RENDERER, *PDF_RENDERER_BY_DESIGN.values()}:
+        module_names.append('weasyprint')
+    for module_name in module_names:
+        try:
+            importlib.import_module(module_name)
+        except (ImportError, OSError) as e:
+            # OSError: WeasyPrint installed without its Pango libraries
+            logging.warning("Could not preload %s: %s", module_name, e)
+    try:
+        docx_skeleton()
+    except Exception as e:
+        logging.warning("Could not build DOCX skeleton: %s", e)
+    logging.info("Preloaded %d backend modules", len(module_names))
 
 app = Flask(__name__)
 app.secret_key = 'supersecret'
@@ -40,6 +88,16 @@ os.makedirs(UPLOAD_FOLDER, exist_ok=True)
 os.makedirs(GENERATED_FOLDER, exist_ok=True)
 app.config['UPLOAD_FOLDER'] = UPLOAD_FOLDER
 
+# Response compression
+app.config['COMPRESS_ENABLED'] = os.getenv('COMPRESS_ENABLED', '1') != '0'
+app.config['COMPRESS_MIN_SIZE'] = int(os.getenv('COMPRESS_MIN_SIZE', '1024'))
+app.config['COMPRESS_LEVEL'] = int(os.getenv('COMPRESS_LEVEL', '6'))
+app.config['COMPRESS_BR_LEVEL'] = int(os.getenv('COMPRESS_BR_LEVEL', '5'))
+app.config['COMPRESS_MIMETYPES'] = [
+    'text/html', 'text/css', 'text/plain', 'text/xml',
+    'application/json', 'application/javascript', 'image/svg+xml'
+]
+
 # Configure server-side sessions
 app.config['SESSION_TYPE'] = 'filesystem'
 Session(app)
@@ -50,7 +108,169 @@ def jinja_format_date(date_str):
 
 app.jinja_env.filters['format_date'] = jinja_format_date
 
-model = genai.GenerativeModel("gemini-1.5-flash")
+# Fingerprinted static assets (built by build_assets.py)
+ASSET_DIST_FOLDER = os.path.join(app.static_folder, 'dist')
+ASSET_MANIFEST_PATH = os.path.join(ASSET_DIST_FOLDER, 'manifest.json')
+ASSET_CACHE_CONTROL = 'public, max-age=31536000, immutable'
+
+def load_asset_manifest():
+    try:
+        with open(ASSET_MANIFEST_PATH, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+        logging.info("Loaded asset manifest with %s entries", len(manifest))
+        return manifest
+    except FileNotFoundError:
+        logging.info("No asset manifest found, serving unfingerprinted static files")
+        return {}
+    except Exception as e:
+        logging.error("Error loading asset manifest: %s", e)
+        return {}
+
+ASSET_MANIFEST = load_asset_manifest()
+ASSET_INLINE_CACHE = {}
+
+def asset_url(filename):
+    return url_for('static', filename=ASSET_MANIFEST.get(filename, filename))
+
+def read_asset(filename):
+    record_cache('asset_inline', filename in ASSET_INLINE_CACHE)
+    if filename not in ASSET_INLINE_CACHE:
+        with open(os.path.join(app.static_folder, filename), 'r', encoding='utf-8') as f:
+            ASSET_INLINE_CACHE[filename] = f.read()
+    return ASSET_INLINE_CACHE[filename]
+
+@pass_context
+def asset_tag(context, filename):
+    # Exports are rendered from a string with no base URL, so assets must be inlined
+    inline = context.get('inline_assets', False)
+    if filename.endswith('.css'):
+        if inline:
+            return Markup(f"<style>\n{read_asset(filename)}</style>")
+        return Markup(f'<link rel="stylesheet" href="{escape(asset_url(filename))}">')
+    if inline:
+        return Markup(f"<script>\n{read_asset(filename)}</script>")
+    return Markup(f'<script src="{escape(asset_url(filename))}"></script>')
+
+app.jinja_env.globals['asset_url'] = asset_url
+app.jinja_env.globals['asset_tag'] = asset_tag
+
+def choose_compression(accept_encodings):
+    if brotli is not None and accept_encodings['br']:
+        return 'br'
+    if accept_encodings['gzip']:
+        return 'gzip'
+    return None
+
+def compress_payload(data, encoding):
+    if encoding == 'br':
+        return brotli.compress(data, quality=app.config['COMPRESS_BR_LEVEL'])
+    return gzip.compress(data, compresslevel=app.config['COMPRESS_LEVEL'])
+
+@app.after_request
+def compress_response(response):
+    # PDF/DOCX/XLSX are not in the allowlist: they are already zip/deflate-compressed
+    if (not app.config['COMPRESS_ENABLED']
+            or response.direct_passthrough
+            or response.is_streamed
+            or response.status_code < 200 or response.status_code >= 300
+            or 'Content-Encoding' in response.headers
+            or response.mimetype not in app.config['COMPRESS_MIMETYPES']):
+        return response
+    response.vary.add('Accept-Encoding')
+    encoding = choose_compression(request.accept_encodings)
+    if encoding is None:
+        return response
+    data = response.get_data()
+    if len(data) < app.config['COMPRESS_MIN_SIZE']:
+        return response
+    response.set_data(compress_payload(data, encoding))
+    response.headers['Content-Encoding'] = encoding
+    if response.headers.get('ETag'):
+        # The representation changed, so a strong validator no longer applies
+        response.headers['ETag'] = f"W/{response.headers['ETag'].removeprefix('W/')}"
+    return response
+
+@app.before_request
+def start_request_timer():
+    g.request_started = time.perf_counter()
+    REQUESTS_IN_FLIGHT.inc()
+
+@app.teardown_request
+def finish_request_timer(exc):
+    started = g.pop('request_started', None)
+    if started is None:
+        return
+    REQUESTS_IN_FLIGHT.dec()
+    REQUEST_DURATION.labels(endpoint=request.endpoint or 'unknown', method=request.method).observe(time.perf_counter() - started)
+
+@before_render_template.connect_via(app)
+def start_template_timer(sender, template, context, **extra):
+    g.template_render_started = time.perf_counter()
+
+@template_rendered.connect_via(app)
+def record_template_render(sender, template, context, **extra):
+    started = g.pop('template_render_started', None)
+    if started is not None:
+        observe_duration('template_render', template.name or '', time.perf_counter() - started)
+
+@app.route('/healthz')
+def healthz():
+    return jsonify({'status': 'ok'})
+
+@app.route('/metrics')
+def metrics():
+    payload, content_type = metrics_payload()
+    return Response(payload, headers={'Content-Type': content_type})
+
+@app.route('/static/dist/<path:filename>')
+def fingerprinted_asset(filename):
+    accepted = request.accept_encodings
+    mimetype = mimetypes.guess_type(filename)[0] or 'application/octet-stream'
+    for encoding, suffix in (('br', '.br'), ('gzip', '.gz')):
+        if not accepted[encoding]:
+            continue
+        try:
+            response = send_from_directory(ASSET_DIST_FOLDER, filename + suffix, mimetype=mimetype)
+        except NotFound:
+            continue
+        response.headers['Content-Encoding'] = encoding
+        break
+    else:
+        response = send_from_directory(ASSET_DIST_FOLDER, filename, mimetype=mimetype)
+    response.headers['Cache-Control'] = ASSET_CACHE_CONTROL
+    response.vary.add('Accept-Encoding')
+    return response
+
+# Created lazily by get_model(), one per model name (llm_routing.py picks the
+# model for each task); tests and benchmarks may assign a stand-in to model,
+# which then serves every task
+model = None
+models = {}
+model_lock = threading.Lock()
+
+def get_model(task=None):
+    if model is not None:
+        return model
+    name = llm_routing.settings(task).model if task else llm_routing.LLM_MODEL
+    if name in models:
+        return models[name]
+    with model_lock:
+        if name not in models:
+            api_key = os.getenv("GEMINI_API_KEY")
+            if not api_key:
+                raise RuntimeError("Missing GEMINI_API_KEY environment variable")
+            import google.generativeai as genai
+            if llm_client.LLM_CLIENT_POOL:
+                # Pooled connections, transport and endpoint override: see llm_client.py
+                models[name] = llm_client.attach(genai.GenerativeModel(name), api_key)
+                return models[name]
+            if not models:
+                # GEMINI_API_ENDPOINT lets load tests point the client at a local stand-in
+                # (benchmarks/gemini_standin.py); plain http:// endpoints need GEMINI_TRANSPORT=rest.
+                client_options = {'api_endpoint': os.getenv('GEMINI_API_ENDPOINT')} if os.getenv('GEMINI_API_ENDPOINT') else None
+                genai.configure(api_key=api_key, transport=os.getenv('GEMINI_TRANSPORT') or None, client_options=client_options)
+            models[name] = genai.GenerativeModel(name)
+    return models[name]
 
 VALID_SECTION_IDS = [
     'education-section', 'experience-section', 'summary-section', 'projects-section',
@@ -66,70 +286,72 @@ ALLOWED_TAGS = ['b', 'i', 'ul', 'ol', 'li']
 ALLOWED_ATTRIBUTES = {}
 
 # Excel styling
-HEADER_FONT = Font(name='Arial', size=12, bold=True, color='FFFFFF')
-HEADER_FILL = PatternFill(start_color='4F81BD', end_color='4F81BD', fill_type='solid')
-DATA_FONT = Font(name='Arial', size=11)
-BORDER = Border(
-    left=Side(style='thin'), 
-    right=Side(style='thin'), 
-    top=Side(style='thin'), 
-    bottom=Side(style='thin')
-)
-CENTER_ALIGN = Alignment(horizontal='center', vertical='center')
-LEFT_ALIGN = Alignment(horizontal='left', vertical='center', wrap_text=True)
-
-def apply_cell_style(cell, is_header=False):
-    if is_header:
-        cell.font = HEADER_FONT
-        cell.fill = HEADER_FILL
-        cell.alignment = CENTER_ALIGN
-    else:
-        cell.font = DATA_FONT
-        cell.alignment = LEFT_ALIGN
-    cell.border = BORDER
+@functools.lru_cache(maxsize=None)
+def xlsx_styles():
+    from openpyxl.styles import Font, Alignment, Border, Side, PatternFill
+    return {
+        'header_font': Font(name='Arial', size=12, bold=True, color='FFFFFF'),
+        'header_fill': PatternFill(start_color='4F81BD', end_color='4F81BD', fill_type='solid'),
+        'data_font': Font(name='Arial', size=11),
+        'border': Border(
+            left=Side(style='thin'),
+            right=Side(style='thin'),
+            top=Side(style='thin'),
+            bottom=Side(style='thin')
+        ),
+        'center_align': Alignment(horizontal='center', vertical='center'),
+        'left_align': Alignment(horizontal='left', vertical='center', wrap_text=True),
+    }
 
 def allowed_file(filename):
     return '.' in filename and filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
 
 def extract_text(filepath, ext):
-    try:
-        if ext == 'pdf':
-            with pdfplumber.open(filepath) as pdf:
-                text = ''
-                for page in pdf.pages:
-                    text += page.extract_text() or ''
-                    for table in page.extract_tables():
-                        for row in table:
-                            text += ' | '.join([cell or '' for cell in row]) + '\n'
-                logging.info(f"Extracted text from PDF file '{filepath}': {text[:100]}...")
-                return text
-        elif ext == 'docx':
-            doc = Document(filepath)
-            text = []
-            for para in doc.paragraphs:
-                if para.style.name.startswith('Heading'):
-                    text.append(f"# {para.text}")
-                else:
-                    text.append(para.text)
-            for table in doc.tables:
-                table_text = []
-                for row in table.rows:
-                    row_text = ' | '.join(cell.text.strip() for cell in row.cells)
-                    table_text.append(row_text)
-                text.append('\n'.join(table_text))
-            full_text = '\n'.join(line for line in text if line.strip())
-            logging.info(f"Extracted text from DOCX file '{filepath}': {full_text[:100]}...")
-            return full_text
-        elif ext == 'txt':
-            with open(filepath, 'r', encoding='utf-8') as f:
-                text = f.read()
-                logging.info(f"Extracted text from TXT file '{filepath}': {text[:100]}...")
-                return text
-        return ""
-    except Exception as e:
-        logging.error(f"Error extracting text from {filepath}: {e}")
-        return ""
+    with observe_stage('extract_text', ext):
+        try:
+            if ext == 'pdf':
+                import pdfplumber
+                with pdfplumber.open(filepath) as pdf:
+                    text = ''
+                    for page in pdf.pages:
+                        text += page.extract_text() or ''
+                        for table in page.extract_tables():
+                            for row in table:
+                                text += ' | '.join([cell or '' for cell in row]) + '\n'
+                    logging.info("Extracted %d characters from PDF file '%s'", len(text), filepath)
+                    log_payload("Extracted PDF text", text)
+                    return text
+            elif ext == 'docx':
+                from docx import Document
+                doc = Document(filepath)
+                text = []
+                for para in doc.paragraphs:
+                    if para.style.name.startswith('Heading'):
+                        text.append(f"# {para.text}")
+                    else:
+                        text.append(para.text)
+                for table in doc.tables:
+                    table_text = []
+                    for row in table.rows:
+                        row_text = ' | '.join(cell.text.strip() for cell in row.cells)
+                        table_text.append(row_text)
+                    text.append('\n'.join(table_text))
+                full_text = '\n'.join(line for line in text if line.strip())
+                logging.info("Extracted %d characters from DOCX file '%s'", len(full_text), filepath)
+                log_payload("Extracted DOCX text", full_text)
+                return full_text
+            elif ext == 'txt':
+                with open(filepath, 'r', encoding='utf-8') as f:
+                    text = f.read()
+                    logging.info("Extracted %d characters from TXT file '%s'", len(text), filepath)
+                    log_payload("Extracted TXT text", text)
+                    return text
+            return ""
+        except Exception as e:
+            logging.error("Error extracting text from %s: %s", filepath, e)
+            return ""
 
+@observe_stage('clean_formatting')
 def clean_formatting(text):
     text = re.sub(r'\r\n|\r', '\n', text)
     text = re.sub(r'\n{3,}', '\n\n', text)
@@ -185,37 +407,245 @@ def has_html_formatting(text):
         return False
     return bool(re.search(r'</?(b|i|ul|ol|li)>', text, re.IGNORECASE))
 
-def generate_bullet_points(text, field_name):
-    if not text or has_html_formatting(text):
-        logging.info(f"Skipping bullet point generation for {field_name} due to existing HTML or empty text")
-        return text
-    prompt = f"""
+def usage_scope():
+    # (route, client) that llm_usage.py charges a call to
+    if not has_request_context():
+        return 'background', ''
+    return request.endpoint or 'unknown', llm_usage.client_key(getattr(session, 'sid', '') or '')
+
+def llm_request(prompt, variant, config, scope, use_async):
+    # One attempt for llm_gateway; usage is recorded per attempt, so a hedged duplicate that answers counts too
+    settings = llm_routing.settings(variant)
+    if use_async:
+        async def attempt(timeout):
+            response = await async_backends.generate_content(get_model(variant), prompt, {'timeout': timeout}, config)
+            # SQLite may wait on another worker's write lock; not on the shared loop
+            await asyncio.to_thread(llm_usage.record, variant, settings.model, scope, prompt, response)
+            return response
+        return attempt
+    def attempt(timeout):
+        response = get_model(variant).generate_content(prompt, generation_config=config, request_options={'timeout': timeout})
+        llm_usage.record(variant, settings.model, scope, prompt, response)
+        return response
+    return attempt
+
+# Rate limiting, retries, deadlines, hedging and the circuit breaker live in llm_gateway.py;
+# each task's model and sampling settings in llm_routing.py, token accounting and budgets in llm_usage.py
+def llm_generate(prompt, variant, generation_config=None):
+    settings = llm_routing.settings(variant)
+    config = llm_routing.generation_config(variant, generation_config)
+    scope = usage_scope()
+    llm_usage.check(scope, prompt, settings.model)
+    with observe_stage('llm', variant):
+        if async_backends.ASYNC_BACKENDS:
+            return async_backends.run(llm_gateway.call_async(
+                variant, llm_request(prompt, variant, config, scope, True), settings.deadline, settings.hedge))
+        return llm_gateway.call(variant, llm_request(prompt, variant, config, scope, False), settings.deadline, settings.hedge)
+
+async def llm_generate_async(prompt, variant, generation_config=None):
+    settings = llm_routing.settings(variant)
+    config = llm_routing.generation_config(variant, generation_config)
+    scope = usage_scope()
+    await asyncio.to_thread(llm_usage.check, scope, prompt, settings.model)
+    with observe_stage('llm', variant):
+        return await llm_gateway.call_async(
+            variant, llm_request(prompt, variant, config, scope, True), settings.deadline, settings.hedge)
+
+# JSON calls ask Gemini for application/json constrained to a response schema.
+# LLM_JSON_MODE=mime asks for JSON without the schema, off asks for neither and
+# leaves it to the prompt, as before. Schemas use the SDK's dict form.
+LLM_JSON_MODE = os.getenv('LLM_JSON_MODE', 'schema').strip().lower()
+
+def string_schema():
+    return {'type': 'string'}
+
+def object_schema(*fields):
+    return {'type': 'object', 'properties': {field: string_schema() for field in fields}}
+
+PROJECTS_SCHEMA = {'type': 'array', 'items': object_schema('title', 'description')}
+PROFILE_SCHEMA = {
+    'type': 'object',
+    'properties': {
+        'name': string_schema(),
+        'education_training_certifications': {'type': 'array', 'items': object_schema('title', 'start_date', 'end_date')},
+        'total_experience': string_schema(),
+        'professional_summary': string_schema(),
+        'netweb_projects': PROJECTS_SCHEMA,
+        'past_projects': PROJECTS_SCHEMA,
+        'roles_responsibilities': string_schema(),
+        'technical_skills': {'type': 'array', 'items': string_schema()},
+        'personal_details': object_schema(
+            'employee_id', 'permanent_address', 'local_address', 'contact_number', 'date_of_joining',
+            'designation', 'overall_experience', 'date_of_birth', 'passport_details'),
+        'work_experience': {'type': 'array', 'items': object_schema('company_name', 'start_date', 'end_date', 'role', 'responsibilities')},
+    },
+}
+# With the skill catalog on Gemini lists skills flat and skill_catalog buckets
+# them; SKILL_CATALOG=0 asks for Gemini's own buckets
+BUCKETED_PROFILE_SCHEMA = dict(PROFILE_SCHEMA, properties=dict(PROFILE_SCHEMA['properties'], technical_skills={
+    'type': 'object', 'properties': {category: {'type': 'array', 'items': string_schema()} for category in skill_catalog.CATEGORIES},
+}))
+SKILL_BUCKETS_SCHEMA = {'type': 'array', 'items': object_schema('skill', 'category')}
+GRAMMAR_SCHEMA = {'type': 'array', 'items': object_schema('field', 'field_id', 'original', 'suggested', 'reason')}
+
+def json_config(schema):
+    if LLM_JSON_MODE == 'off':
+        return None
+    if LLM_JSON_MODE == 'mime':
+        return {'response_mime_type': 'application/json'}
+    return {'response_mime_type': 'application/json', 'response_schema': schema}
+
+def bullet_points_prompt(text, field_name):
+    return f"""
     Convert the following text from the '{field_name}' field into concise bullet points. Each bullet should be a complete sentence or idea ending in a period, keeping the content professional and concise. Return only the bullet-pointed text, one bullet per line, starting with '- '.
     Text:
     {text}
     """
+
+def bullet_points_from_response(response, field_name):
+    bullet_points = response.text.strip()
+    logging.info("Generated bullet points for %s (%d chars)", field_name, len(bullet_points))
+    log_payload("Bullet points", bullet_points)
+    return bullet_points
+
+def generate_bullet_points(text, field_name):
+    if not text or has_html_formatting(text):
+        logging.info("Skipping bullet point generation for %s due to existing HTML or empty text", field_name)
+        return text
     try:
-        response = model.generate_content(prompt)
-        bullet_points = response.text.strip()
-        logging.info(f"Generated bullet points for {field_name}: {bullet_points}")
-        return bullet_points
+        response = llm_generate(bullet_points_prompt(text, field_name), 'bullet_points')
+        return bullet_points_from_response(response, field_name)
     except Exception as e:
-        logging.error(f"Failed to generate bullet points for {field_name}: {e}")
+        logging.error("Failed to generate bullet points for %s: %s", field_name, e)
         return text
 
-def extract_json(text):
+async def generate_bullet_points_async(text, field_name):
+    if not text or has_html_formatting(text):
+        return text
     try:
-        if "```json" in text:
-            match = re.findall(r"```json(.*?)```", text, re.DOTALL)
-            if match:
-                return json.loads(match[0].strip())
-        return json.loads(text)
+        response = await llm_generate_async(bullet_points_prompt(text, field_name), 'bullet_points')
+        return bullet_points_from_response(response, field_name)
     except Exception as e:
-        logging.error(f"Error parsing JSON: {e}")
-        return {}
+        logging.error("Failed to generate bullet points for %s: %s", field_name, e)
+        return text
 
+def generate_bullet_points_batch(items):
+    # items are (text, field_name) pairs; in async mode the calls run concurrently
+    if async_backends.ASYNC_BACKENDS and len(items) > 1:
+        return async_backends.run_all([generate_bullet_points_async(text, field_name) for text, field_name in items])
+    return [generate_bullet_points(text, field_name) for text, field_name in items]
+
+def extract_json(text, task='', whole_fields=False):
+    # Strict parse first; anything else goes through json_salvage, which repairs
+    # common defects and keeps the complete part of a cut-off response.
+    # whole_fields drops top-level fields that the cut left incomplete.
+    document = text.strip()
+    fenced = json_salvage.FENCE_RE.search(document)
+    if fenced:
+        document = fenced.group(1).strip()
+    try:
+        data = json.loads(document)
+        LLM_JSON_PARSES.labels(task=task, outcome='clean').inc()
+        return data
+    except ValueError:
+        pass
+    try:
+        result = json_salvage.parse(text)
+    except ValueError as e:
+        LLM_JSON_PARSES.labels(task=task, outcome='failed').inc()
+        logging.error("Error parsing JSON: %s", e)
+        return {}
+    if result.truncated:
+        LLM_JSON_PARSES.labels(task=task, outcome='truncated').inc()
+        logging.warning("Salvaged truncated JSON for %s (%d chars), incomplete fields: %s, repairs: %s",
+                        task, len(text), result.cut_keys, result.repairs)
+        if whole_fields and isinstance(result.value, dict):
+            return {key: value for key, value in result.value.items() if key not in result.cut_keys}
+    else:
+        LLM_JSON_PARSES.labels(task=task, outcome='repaired').inc()
+        logging.warning("Repaired JSON for %s: %s", task, result.repairs)
+    return result.value
+
+
+def normalize_structured_data(data):
+    data = {
+        'name': data.get('name', '') or '',
+        'education_training_certifications': data.get('education_training_certifications', []) or [],
+        'total_experience': data.get('total_experience', '') or '',
+        'professional_summary': data.get('professional_summary', '') or '',
+        'netweb_projects': data.get('netweb_projects', []) or [],
+        'past_projects': data.get('past_projects', []) or [],
+        'roles_responsibilities': data.get('roles_responsibilities', '') or '',
+        'technical_skills': data.get('technical_skills', {
+            'web_technologies': [], 'scripting_languages': [], 'frameworks': [],
+            'databases': [], 'web_servers': [], 'tools': []
+        }) or {
+            'web_technologies': [], 'scripting_languages': [], 'frameworks': [],
+            'databases': [], 'web_servers': [], 'tools': []
+        },
+        'personal_details': data.get('personal_details', {
+            'employee_id': '', 'permanent_address': '', 'local_address': '',
+            'contact_number': '', 'date_of_joining': '', 'designation': '',
+            'overall_experience': '', 'date_of_birth': '', 'passport_details': ''
+        }) or {
+            'employee_id': '', 'permanent_address': '', 'local_address': '',
+            'contact_number': '', 'date_of_joining': '', 'designation': '',
+            'overall_experience': '', 'date_of_birth': '', 'passport_details': ''
+        },
+        'work_experience': data.get('work_experience', []) or []
+    }
+    for exp in data['work_experience']:
+        exp['company_name'] = exp.get('company_name', '') or ''
+        exp['start_date'] = exp.get('start_date', '') or ''
+        exp['end_date'] = exp.get('end_date', '') or ''
+        exp['role'] = exp.get('role', '') or ''
+        exp['responsibilities'] = exp.get('responsibilities', '') or ''
+    return data
+
+def add_bullet_points(data, skip=()):
+    # skip holds texts that were already bulleted in an earlier parse
+    bullet_targets = [(data, 'professional_summary', 'professional_summary'),
+                      (data, 'roles_responsibilities', 'roles_responsibilities')]
+    bullet_targets += [(exp, 'responsibilities', f"work_experience_responsibilities_{exp['role']}") for exp in data['work_experience']]
+    bullet_targets = [t for t in bullet_targets if t[0][t[1]] and not has_html_formatting(t[0][t[1]]) and t[0][t[1]] not in skip]
+    bullet_points = generate_bullet_points_batch([(target[key], field_name) for target, key, field_name in bullet_targets])
+    for (target, key, _), text in zip(bullet_targets, bullet_points):
+        target[key] = text
+
+def assign_skill_buckets(names, previous=None):
+    # Buckets for skills the catalog does not know: the bucket an earlier parse gave
+    # them, otherwise Gemini's. Returns {name: category}; names left out go to tools.
+    previous = {name.lower(): category for category, skills in (previous or {}).items() if isinstance(skills, list) for name in skills}
+    assigned = {name: previous[name.lower()] for name in names if name.lower() in previous}
+    missing = [name for name in names if name not in assigned]
+    if not missing:
+        return assigned
+    prompt = f"""
+    Assign each of the following technical skills from a resume to exactly one of these categories: {', '.join(skill_catalog.CATEGORIES)}.
+    Return a JSON array of {{"skill": "", "category": ""}} objects, one per skill, with the skill exactly as given.
+    Skills:
+    {json.dumps(missing, ensure_ascii=False)}
+    """
+    try:
+        response = llm_generate(prompt, 'skill_buckets', json_config(SKILL_BUCKETS_SCHEMA))
+        suggestions = extract_json(response.text, 'skill_buckets')
+    except Exception as e:
+        logging.error("Failed to categorize %d unknown skills: %s", len(missing), e)
+        return assigned
+    if not isinstance(suggestions, list):
+        logging.warning("Skill buckets is not a list (%s)", type(suggestions).__name__)
+        return assigned
+    assigned.update((item.get('skill'), item.get('category')) for item in suggestions if isinstance(item, dict))
+    logging.info("Categorized %d skills unknown to the catalog", len(missing))
+    return assigned
 
 def generate_structured_data(text):
+    if skill_catalog.SKILL_CATALOG_ENABLED:
+        skills_template = '[]'
+        skills_instruction = 'as a flat list of skill names written as in the resume'
+    else:
+        skills_template = json.dumps({category: [] for category in skill_catalog.CATEGORIES})
+        skills_instruction = 'categorizing into web_technologies, scripting_languages, frameworks, databases, web_servers, and tools'
     prompt = f"""
     You are an expert HR resume parser with advanced natural language understanding. Convert the following resume text into structured JSON with these fields:
     {{
@@ -226,14 +656,7 @@ def generate_structured_data(text):
       "netweb_projects": [{{"title": "", "description": ""}}],
       "past_projects": [{{"title": "", "description": ""}}],
       "roles_responsibilities": "",
-      "technical_skills": {{
-        "web_technologies": [],
-        "scripting_languages": [],
-        "frameworks": [],
-        "databases": [],
-        "web_servers": [],
-        "tools": []
-      }},
+      "technical_skills": {skills_template},
       "personal_details": {{
         "employee_id": "",
         "permanent_address": "",
@@ -255,7 +678,7 @@ def generate_structured_data(text):
     - Identify 'netweb_projects' for projects explicitly mentioning 'NetWeb' or associated with the current company.
     - Identify 'past_projects' for projects under previous employers or not associated with 'NetWeb'.
     - Extract 'roles_responsibilities' from headers like 'Roles and Responsibilities', 'Key Responsibilities', or similar. If no explicit section exists, intelligently infer responsibilities from job descriptions, bullet points, or achievements under 'Work Experience', 'Professional Experience', or similar sections. Ensure responsibilities are specific, actionable tasks or outcomes (e.g., 'Developed a web application', 'Led a team of 5 engineers') and formatted as concise bullet points.
-    - Extract 'technical_skills' from lists under headers like 'Technical Skill Set', 'Skills', or similar, categorizing into web_technologies, scripting_languages, frameworks, databases, web_servers, and tools.
+    - Extract 'technical_skills' from lists under headers like 'Technical Skill Set', 'Skills', or similar, {skills_instruction}.
     - For 'personal_details', extract fields like 'employee_id', 'permanent_address', etc., from sections like 'Personal Details' or similar. Standardize 'date_of_joining' and 'date_of_birth' to 'YYYY-MM'.
     - Extract 'work_experience' from sections like 'Work Experience' or 'Professional Experience', including company name, role, dates (standardized to 'YYYY-MM'), and responsibilities. Extract 'company_name' from the organization or employer name associated with each role (e.g., 'Google', 'NetWeb'). If responsibilities are missing, infer them from job descriptions or achievements in the same section.
     - Leave fields empty if data is missing, but maintain the JSON structure. Ensure all text fields are clean and concise.
@@ -263,65 +686,110 @@ def generate_structured_data(text):
     {text}
     """
     try:
-        response = model.generate_content(prompt)
-        logging.info(f"Raw AI response: {response.text}")
-        data = extract_json(response.text)
-        data = {
-            'name': data.get('name', '') or '',
-            'education_training_certifications': data.get('education_training_certifications', []) or [],
-            'total_experience': data.get('total_experience', '') or '',
-            'professional_summary': data.get('professional_summary', '') or '',
-            'netweb_projects': data.get('netweb_projects', []) or [],
-            'past_projects': data.get('past_projects', []) or [],
-            'roles_responsibilities': data.get('roles_responsibilities', '') or '',
-            'technical_skills': data.get('technical_skills', {
-                'web_technologies': [], 'scripting_languages': [], 'frameworks': [],
-                'databases': [], 'web_servers': [], 'tools': []
-            }) or {
-                'web_technologies': [], 'scripting_languages': [], 'frameworks': [],
-                'databases': [], 'web_servers': [], 'tools': []
-            },
-            'personal_details': data.get('personal_details', {
-                'employee_id': '', 'permanent_address': '', 'local_address': '',
-                'contact_number': '', 'date_of_joining': '', 'designation': '',
-                'overall_experience': '', 'date_of_birth': '', 'passport_details': ''
-            }) or {
-                'employee_id': '', 'permanent_address': '', 'local_address': '',
-                'contact_number': '', 'date_of_joining': '', 'designation': '',
-                'overall_experience': '', 'date_of_birth': '', 'passport_details': ''
-            },
-            'work_experience': data.get('work_experience', []) or []
-        }
-        if data['professional_summary'] and not has_html_formatting(data['professional_summary']):
-            data['professional_summary'] = generate_bullet_points(data['professional_summary'], 'professional_summary')
-        if data['roles_responsibilities'] and not has_html_formatting(data['roles_responsibilities']):
-            data['roles_responsibilities'] = generate_bullet_points(data['roles_responsibilities'], 'roles_responsibilities')
-        for exp in data['work_experience']:
-            if exp.get('responsibilities') and not has_html_formatting(exp['responsibilities']):
-                exp['responsibilities'] = generate_bullet_points(exp['responsibilities'], f"work_experience_responsibilities_{exp.get('role', '')}")
-            exp['company_name'] = exp.get('company_name', '') or ''
-            exp['start_date'] = exp.get('start_date', '') or ''
-            exp['end_date'] = exp.get('end_date', '') or ''
-            exp['role'] = exp.get('role', '') or ''
-            exp['responsibilities'] = exp.get('responsibilities', '') or ''
-        logging.info(f"Generated structured resume data: {json.dumps(data, indent=2)}")
+        schema = PROFILE_SCHEMA if skill_catalog.SKILL_CATALOG_ENABLED else BUCKETED_PROFILE_SCHEMA
+        response = llm_generate(prompt, 'structured_data', json_config(schema))
+        log_payload("Raw AI response", response.text)
+        data = normalize_structured_data(extract_json(response.text, 'structured_data'))
+        if skill_catalog.SKILL_CATALOG_ENABLED:
+            data['technical_skills'] = skill_catalog.categorize(data['technical_skills'], text, assign_skill_buckets)
+        add_bullet_points(data)
+        logging.info("Generated structured resume data: %s", ProfileSummary(data))
+        log_payload("Structured resume data", data)
         return data
+    except llm_gateway.LLMUnavailable:
+        raise
     except Exception as e:
-        logging.error(f"Failed to generate structured resume data: {e}")
+        logging.error("Failed to generate structured resume data: %s", e)
         return {}
 
+def bulleted_texts(profile):
+    texts = {profile.get('professional_summary', ''), profile.get('roles_responsibilities', '')}
+    texts.update(exp.get('responsibilities', '') for exp in profile.get('work_experience', []) if isinstance(exp, dict))
+    return texts - {''}
+
+def patch_structured_data(previous_text, previous_profile, text):
+    # Re-extracts only what the revision changed: Gemini gets the earlier profile and a
+    # line diff, returns the changed top-level fields, and only those get new bullet points
+    diff = '\n'.join(difflib.unified_diff(previous_text.splitlines(), text.splitlines(), 'previous', 'revised', n=2, lineterm=''))
+    prompt_profile, schema = previous_profile, BUCKETED_PROFILE_SCHEMA
+    if skill_catalog.SKILL_CATALOG_ENABLED:
+        prompt_profile = dict(previous_profile, technical_skills=skill_catalog.flatten(previous_profile.get('technical_skills')))
+        schema = PROFILE_SCHEMA
+    prompt = f"""
+    You previously converted a resume into the JSON profile below. The candidate has sent a revised resume; the changes are given as a unified diff of the resume text.
+    Return a JSON object containing only the top-level profile fields whose values change because of the diff, each with its complete new value in the same structure as the profile.
+    Inside a returned field, keep everything the diff does not touch exactly as it is in the profile. Standardize new dates to 'YYYY-MM'. Return {{}} if no field changes.
+    Profile:
+    {json.dumps(prompt_profile, ensure_ascii=False)}
+    Diff:
+    {diff}
+    """
+    try:
+        response = llm_generate(prompt, 'structured_patch', json_config(schema))
+        log_payload("Raw AI patch response", response.text)
+        changes = extract_json(response.text, 'structured_patch', whole_fields=True)
+        if not isinstance(changes, dict):
+            logging.warning("Structured patch is not an object (%s)", type(changes).__name__)
+            return {}
+        changes = {key: value for key, value in changes.items() if key in previous_profile}
+        data = normalize_structured_data({**json.loads(json.dumps(previous_profile)), **changes})
+        if 'technical_skills' in changes and skill_catalog.SKILL_CATALOG_ENABLED:
+            data['technical_skills'] = skill_catalog.categorize(
+                data['technical_skills'], text,
+                functools.partial(assign_skill_buckets, previous=previous_profile.get('technical_skills')))
+        add_bullet_points(data, skip=bulleted_texts(previous_profile))
+        logging.info("Patched structured resume data, changed fields: %s", sorted(changes))
+        return data
+    except llm_gateway.LLMUnavailable:
+        raise
+    except Exception as e:
+        logging.error("Failed to patch structured resume data: %s", e)
+        return {}
+
+def parse_resume(text):
+    # Reuses the closest earlier parse when the text is a near-duplicate (resume_index.py)
+    match = resume_index.find_similar(text) if resume_index.enabled() else None
+    outcome = 'miss'
+    if match is not None:
+        similarity, previous = match
+        RESUME_SIMILARITY.observe(similarity)
+        if previous['text'] == text:
+            RESUME_REUSE.labels(outcome='exact').inc()
+            PARSE_SECONDS_SAVED.inc(previous['parse_seconds'])
+            logging.info("Reusing parse of identical resume %s", previous['id'])
+            return previous['profile']
+        if similarity >= resume_index.RESUME_REUSE_THRESHOLD:
+            start = time.perf_counter()
+            profile = patch_structured_data(previous['text'], previous['profile'], text)
+            elapsed = time.perf_counter() - start
+            if profile:
+                RESUME_REUSE.labels(outcome='patched').inc()
+                PARSE_SECONDS_SAVED.inc(max(0.0, previous['parse_seconds'] - elapsed))
+                logging.info("Patched parse of resume %s (similarity %.2f) in %.2fs", previous['id'], similarity, elapsed)
+                # Keep the full-parse duration so later savings are measured against it
+                resume_index.add(text, profile, previous['parse_seconds'])
+                return profile
+            # A failed patch falls back to a full parse, counted once as patch_failed
+            outcome = 'patch_failed'
+    RESUME_REUSE.labels(outcome=outcome).inc()
+    start = time.perf_counter()
+    profile = generate_structured_data(text)
+    if profile and resume_index.enabled():
+        resume_index.add(text, profile, time.perf_counter() - start)
+    return profile
+
 def check_grammar(text_fields):
     prompt = """
     Analyze the following text fields from a resume form and provide grammar suggestions.
     For each field, return a JSON array of suggestions with:
     [
-        {
+        {{
             "field": "field_name",
             "field_id": "field_id",
             "original": "original_text",
             "suggested": "corrected_text",
             "reason": "reason_for_suggestion"
-        }
+        }}
     ]
     Only include fields with grammar issues. Return an empty array if no suggestions are needed.
     Text fields:
@@ -329,21 +797,23 @@ def check_grammar(text_fields):
     """
     try:
         text_fields_json = json.dumps(text_fields, indent=2)
-        response = model.generate_content(prompt.format(text_fields=text_fields_json))
-        suggestions = extract_json(response.text)
+        response = llm_generate(prompt.format(text_fields=text_fields_json), 'grammar', json_config(GRAMMAR_SCHEMA))
+        suggestions = extract_json(response.text, 'grammar')
         if not isinstance(suggestions, list):
-            logging.warning(f"Grammar suggestions is not a list, defaulting to []: {suggestions}")
+            logging.warning("Grammar suggestions is not a list (%s), defaulting to []", type(suggestions).__name__)
             return []
-        logging.info(f"Grammar suggestions: {json.dumps(suggestions, indent=2)}")
+        logging.info("Grammar suggestions: %d", len(suggestions))
+        log_payload("Grammar suggestions", suggestions)
         return suggestions
     except Exception as e:
-        logging.error(f"Failed to check grammar: {e}")
+        logging.error("Failed to check grammar: %s", e)
         return []
 
 def sanitize_text(text, allow_html=False):
     if not isinstance(text, str):
         text = '' if text is None else str(text)
     if allow_html:
+        import bleach
         return bleach.clean(text, tags=ALLOWED_TAGS, attributes=ALLOWED_ATTRIBUTES)
     return (text.replace('&', '&amp;')
                .replace('<', '&lt;')
@@ -351,9 +821,10 @@ def sanitize_text(text, allow_html=False):
                .replace('"', '&quot;')
                .replace("'", '&#x27;'))
 
+@observe_stage('sanitize')
 def sanitize_profile_data(profile):
     if not isinstance(profile, dict):
-        logging.warning(f"Profile is not a dict, returning default structure: {profile}")
+        logging.warning("Profile is not a dict (%s), returning default structure", type(profile).__name__)
         return {
             'name': '',
             'education_training_certifications': [],
@@ -377,9 +848,8 @@ def sanitize_profile_data(profile):
     html_fields = ['professional_summary', 'roles_responsibilities']
     sanitized = {}
     for k, v in profile.items():
-        logging.debug(f"Sanitizing field {k}: {v}")
         if v is None:
-            logging.warning(f"Field {k} is None, setting to default value")
+            logging.warning("Field %s is None, setting to default value", k)
             if k in ['name', 'total_experience', 'professional_summary', 'roles_responsibilities']:
                 v = ''
             elif k in ['education_training_certifications', 'netweb_projects', 'past_projects', 'work_experience']:
@@ -439,343 +909,576 @@ def sanitize_profile_data(profile):
             ]
         else:
             sanitized[k] = sanitize_text(v, allow_html=False)
-    logging.debug(f"Sanitized profile: {json.dumps(sanitized, indent=2)}")
+    log_payload("Sanitized profile", sanitized)
     return sanitized
 
-def render_html_to_pdf(html_string, output_path):
+PDF_OPTIONS = {
+    'format': "A4",
+    'print_background': True,
+    'margin': {
+        "top": "1cm",
+        "right": "1cm",
+        "bottom": "1cm",
+        "left": "1cm"
+    },
+    'prefer_css_page_size': True,
+    'scale': 0.8
+}
+
+def render_pdf_chromium(html_string, output):
     try:
+        if async_backends.ASYNC_BACKENDS:
+            logging.info("Generating PDF (shared browser)")
+            write_output(output, async_backends.run(async_backends.render_pdf(html_string, PDF_OPTIONS)))
+            logging.info("Successfully generated PDF")
+            return
+        from playwright.sync_api import sync_playwright
         with sync_playwright() as p:
             browser = p.chromium.launch(headless=True, timeout=120000)
+            CHROMIUM_LAUNCHES.inc()
+            CHROMIUM_BROWSERS.labels(state='busy').inc()
             try:
                 page = browser.new_page()
                 page.set_viewport_size({"width": 794, "height": 1123})
                 page.set_content(html_string, timeout=120000, wait_until='domcontentloaded')
                 page.wait_for_load_state('networkidle', timeout=120000)
                 page.emulate_media(media="print")
-                logging.info(f"Generating PDF at {output_path}")
-                page.pdf(
-                    path=output_path,
-                    format="A4",
-                    print_background=True,
-                    margin={
-                        "top": "1cm",
-                        "right": "1cm",
-                        "bottom": "1cm",
-                        "left": "1cm"
-                    },
-                    prefer_css_page_size=True,
-                    scale=0.8
-                )
-                logging.info(f"Successfully generated PDF at {output_path}")
+                logging.info("Generating PDF")
+                write_output(output, page.pdf(**PDF_OPTIONS))
+                logging.info("Successfully generated PDF")
             finally:
                 browser.close()
+                CHROMIUM_BROWSERS.labels(state='busy').dec()
     except Exception as e:
-        logging.error(f"Failed to generate PDF: {str(e)}\n{traceback.format_exc()}")
+        logging.error("Failed to generate PDF: %s", e, exc_info=True)
         raise Exception(f"PDF generation failed: {str(e)}. Ensure Playwright is installed and Chromium is available.")
 
+# WeasyPrint has no page.pdf() options; the same defaults go in as the first
+# stylesheet so each design's own @page rules still win, as prefer_css_page_size
+# lets them in Chromium
+WEASYPRINT_PAGE_CSS = "<style>@page { size: A4; margin: 1cm; }</style>"
+WEASYPRINT_FETCH_TIMEOUT = 10
+
+def weasyprint_url_fetcher(url):
+    from urllib.parse import unquote, urlparse
+    from weasyprint import default_url_fetcher
+    if url.startswith('file://'):
+        # Root-relative links like /static/css/x.css resolve to file:///static/...;
+        # map them onto the app and refuse anything outside the static folder
+        path = unquote(urlparse(url).path)
+        if path.startswith(app.root_path + os.sep):
+            path = path[len(app.root_path):]
+        path = os.path.realpath(os.path.join(app.root_path, path.lstrip('/')))
+        if not path.startswith(os.path.realpath(app.static_folder) + os.sep):
+            raise ValueError(f"Refusing to load {url}")
+        return default_url_fetcher('file://' + path)
+    return default_url_fetcher(url, timeout=WEASYPRINT_FETCH_TIMEOUT)
+
+def render_pdf_weasyprint(html_string, output):
+    try:
+        from weasyprint import HTML
+        logging.info("Generating PDF (weasyprint)")
+        if '<head>' in html_string:
+            html_string = html_string.replace('<head>', '<head>' + WEASYPRINT_PAGE_CSS, 1)
+        else:
+            html_string = WEASYPRINT_PAGE_CSS + html_string
+        document = HTML(string=html_string, base_url=app.root_path + os.sep, url_fetcher=weasyprint_url_fetcher)
+        document.write_pdf(output, zoom=PDF_OPTIONS['scale'])
+        logging.info("Successfully generated PDF")
+    except Exception as e:
+        logging.error("Failed to generate PDF with WeasyPrint: %s", e, exc_info=True)
+        raise Exception(f"PDF generation failed: {str(e)}. Ensure WeasyPrint and its Pango libraries are installed.")
+
+PDF_RENDERERS = {
+    'chromium': render_pdf_chromium,
+    'weasyprint': render_pdf_weasyprint,
+}
+
+def load_pdf_renderer_config():
+    # PDF_RENDERER sets the default; PDF_RENDERER_BY_DESIGN overrides it per
+    # design, e.g. "d1=weasyprint,d2=weasyprint"
+    default = os.getenv('PDF_RENDERER', 'chromium').strip().lower()
+    if default not in PDF_RENDERERS:
+        logging.warning("Unknown PDF_RENDERER %r, using chromium", default)
+        default = 'chromium'
+    by_design = {}
+    for item in os.getenv('PDF_RENDERER_BY_DESIGN', '').split(','):
+        design, _, renderer = item.partition('=')
+        design, renderer = design.strip(), renderer.strip().lower()
+        if not design:
+            continue
+        if renderer not in PDF_RENDERERS:
+            logging.warning("Unknown PDF renderer %r for design %s, ignoring", renderer, design)
+            continue
+        by_design[design] = renderer
+    return default, by_design
+
+PDF_RENDERER, PDF_RENDERER_BY_DESIGN = load_pdf_renderer_config()
+
+def pdf_renderer_for(design):
+    return PDF_RENDERER_BY_DESIGN.get(design, PDF_RENDERER)
+
+def render_html_to_pdf(html_string, output, renderer=None):
+    renderer = renderer or PDF_RENDERER
+    with observe_stage('render_export', f'pdf_{renderer}'):
+        PDF_RENDERERS[renderer](html_string, output)
+
+# Exporters write to a path or to any binary file object. Downloads render into
+# a SpooledTemporaryFile that stays in memory up to EXPORT_SPILL_THRESHOLD
+# bytes and rolls over to an anonymous temp file in generated/ beyond that.
+# The response closes it once the body has been streamed, so there is no
+# file left to clean up and nothing is removed before it is sent.
+EXPORT_SPILL_THRESHOLD = int(os.getenv('EXPORT_SPILL_THRESHOLD', str(8 * 1024 * 1024)))
+
+def export_buffer():
+    return tempfile.SpooledTemporaryFile(max_size=EXPORT_SPILL_THRESHOLD, dir=GENERATED_FOLDER)
+
+def write_output(output, data):
+    if isinstance(output, (str, os.PathLike)):
+        with open(output, 'wb') as f:
+            f.write(data)
+    else:
+        output.write(data)
+
+def send_export(buffer, download_name, mimetype=None):
+    size = buffer.seek(0, os.SEEK_END)
+    buffer.seek(0)
+    response = send_file(buffer, as_attachment=True, download_name=download_name, mimetype=mimetype)
+    # send_file only knows the length of plain BytesIO objects
+    response.content_length = size
+    return response
+
 def cleanup_file(filepath):
     try:
         if os.path.exists(filepath):
             os.remove(filepath)
-            logging.info(f"Cleaned up file: {filepath}")
+            logging.info("Cleaned up file: %s", filepath)
     except Exception as e:
-        logging.error(f"Error cleaning up file {filepath}: {str(e)}")
+        logging.error("Error cleaning up file %s: %s", filepath, e)
 
 def should_skip_section(section_id, hidden_sections):
     return section_id in (hidden_sections or [])
 
-def render_html_to_docx(profile, output_path, hidden_sections=None, hidden_dates=None):
+# DOCX exports are cloned from a skeleton built once per process: only the
+# styles the exporter uses, the logo in the header and page numbers in the
+# footer. DOCX_TEMPLATE_PATH swaps in a corporate .docx instead; it must
+# define the styles in DOCX_STYLES. python-docx's blank template carries
+# ~800 KB of style definitions that used to be parsed and re-zipped on every
+# export.
+DOCX_TEMPLATE_PATH = os.getenv('DOCX_TEMPLATE_PATH', '')
+DOCX_LOGO_PATH = os.path.join(app.root_path, 'static', 'images', 'netweb-logo.jpg')
+DOCX_STYLES = ['Normal', 'Title', 'Heading 1', 'Heading 2', 'List Bullet']
+DOCX_HEADING_COLOR = (0x1F, 0x38, 0x64)
+
+def build_docx_skeleton():
+    from docx import Document
+    from docx.oxml import OxmlElement
+    from docx.oxml.ns import qn
+    from docx.shared import Cm, Pt, RGBColor
+    from docx.enum.text import WD_ALIGN_PARAGRAPH
+    doc = Document()
+
+    styles = doc.styles.element
+    by_id = {style.get(qn('w:styleId')): style for style in styles.findall(qn('w:style'))}
+    keep = {doc.styles[name].style_id for name in DOCX_STYLES + ['Header', 'Footer']}
+    keep |= {style.get(qn('w:styleId')) for style in by_id.values() if style.get(qn('w:default')) == '1'}
+    pending = list(keep)
+    while pending:
+        style = by_id.get(pending.pop())
+        for ref in ('w:basedOn', 'w:link', 'w:next'):
+            element = style.find(qn(ref)) if style is not None else None
+            target = element.get(qn('w:val')) if element is not None else None
+            if target in by_id and target not in keep:
+                keep.add(target)
+                pending.append(target)
+    for style_id, style in by_id.items():
+        if style_id not in keep:
+            styles.remove(style)
+    for latent in styles.findall(qn('w:latentStyles')):
+        styles.remove(latent)
+    for rel_id, rel in list(doc.part.rels.items()):
+        if rel.reltype.endswith('/stylesWithEffects'):
+            doc.part.drop_rel(rel_id)
+    for rel_id, rel in list(doc.part.package.rels.items()):
+        if rel.reltype.endswith('/thumbnail'):
+            del doc.part.package.rels[rel_id]
+
+    doc.styles['Normal'].font.name = 'Calibri'
+    doc.styles['Normal'].font.size = Pt(10.5)
+    for name in ('Title', 'Heading 1', 'Heading 2'):
+        doc.styles[name].font.color.rgb = RGBColor(*DOCX_HEADING_COLOR)
+
+    section = doc.sections[0]
+    section.top_margin = section.bottom_margin = Cm(2)
+    section.left_margin = section.right_margin = Cm(2)
+    header = section.header.paragraphs[0]
+    header.alignment = WD_ALIGN_PARAGRAPH.RIGHT
+    if os.path.exists(DOCX_LOGO_PATH):
+        header.add_run().add_picture(DOCX_LOGO_PATH, width=Cm(4))
+    footer = section.footer.paragraphs[0]
+    footer.alignment = WD_ALIGN_PARAGRAPH.CENTER
+    footer.add_run("Page ")
+    page_field = OxmlElement('w:fldSimple')
+    page_field.set(qn('w:instr'), 'PAGE')
+    page_run = OxmlElement('w:r')
+    page_text = OxmlElement('w:t')
+    page_text.text = '1'
+    page_run.append(page_text)
+    page_field.append(page_run)
+    footer._p.append(page_field)
+    return doc
+
+@functools.lru_cache(maxsize=1)
+def docx_skeleton():
+    # Returns (package bytes, {style name: style id}); built once per process
+    from docx import Document
+    if DOCX_TEMPLATE_PATH:
+        with open(DOCX_TEMPLATE_PATH, 'rb') as f:
+            data = f.read()
+        doc = Document(io.BytesIO(data))
+    else:
+        doc = build_docx_skeleton()
+        buffer = io.BytesIO()
+        doc.save(buffer)
+        data = buffer.getvalue()
+    style_ids = {}
+    for name in DOCX_STYLES:
+        try:
+            style_ids[name] = doc.styles[name].style_id
+        except KeyError:
+            logging.warning("DOCX template has no %r style, falling back to Normal", name)
+    logging.info("Loaded DOCX skeleton (%d bytes)", len(data))
+    return data, style_ids
+
+class DocxBuilder:
+    # Appends paragraphs with style ids resolved once, instead of python-docx's
+    # per-paragraph lookup by style name (which scans every style each time)
+    def __init__(self):
+        from docx import Document
+        data, self.style_ids = docx_skeleton()
+        self.doc = Document(io.BytesIO(data))
+
+    def paragraph(self, text='', style=None):
+        paragraph = self.doc.add_paragraph(text)
+        if style in self.style_ids:
+            paragraph._p.style = self.style_ids[style]
+        return paragraph
+
+    def heading(self, text, level):
+        return self.paragraph(text, 'Title' if level == 0 else f'Heading {level}')
+
+    def bullet(self, text):
+        return self.paragraph(text, 'List Bullet')
+
+    def html(self, html_text):
+        # Block-level HTML from the rich text fields: each <li> becomes a
+        # bullet, <p>/<div> a paragraph, loose text and inline tags a paragraph
+        from lxml import html
+        try:
+            root = html.fromstring(f"<div>{html_text or ''}</div>")
+        except Exception as e:
+            logging.error("Error converting HTML to DOCX: %s", e)
+            self.paragraph(html_text or '')
+            return
+        loose = []
+
+        def loose_paragraph():
+            if not loose:
+                loose.append(self.paragraph())
+            return loose[0]
+
+        if root.text and root.text.strip():
+            self.add_inline(loose_paragraph(), root.text)
+        for element in root:
+            if element.tag in ('ul', 'ol'):
+                loose.clear()
+                for item in element.iter('li'):
+                    self.add_inline_element(self.bullet(''), item)
+            elif element.tag in ('p', 'div', 'li'):
+                loose.clear()
+                self.add_inline_element(self.paragraph(), element)
+            elif element.tag == 'br':
+                loose_paragraph().add_run().add_break()
+            else:
+                self.add_inline_element(loose_paragraph(), element, element.tag in ('b', 'strong'), element.tag in ('i', 'em'))
+            if element.tail and element.tail.strip():
+                self.add_inline(loose_paragraph(), element.tail)
+
+    def add_inline(self, paragraph, text, bold=False, italic=False):
+        run = paragraph.add_run(text)
+        if bold:
+            run.bold = True
+        if italic:
+            run.italic = True
+
+    def add_inline_element(self, paragraph, element, bold=False, italic=False):
+        if element.text:
+            self.add_inline(paragraph, element.text, bold, italic)
+        for child in element:
+            if child.tag in ('ul', 'ol'):
+                # Nested list items are emitted by the caller's iter('li')
+                pass
+            elif child.tag == 'br':
+                paragraph.add_run().add_break()
+            else:
+                self.add_inline_element(paragraph, child, bold or child.tag in ('b', 'strong'), italic or child.tag in ('i', 'em'))
+            if child.tail:
+                self.add_inline(paragraph, child.tail, bold, italic)
+
+    def save(self, output):
+        self.doc.save(output)
+
+@observe_stage('render_export', 'docx')
+def render_html_to_docx(profile, output, hidden_sections=None, hidden_dates=None):
     if hidden_sections is None:
         hidden_sections = []
     if hidden_dates is None:
         hidden_dates = []
     try:
-        doc = Document()
-        doc.add_heading('Professional Resume', 0)
+        doc = DocxBuilder()
+        doc.heading('Professional Resume', 0)
         
         if profile.get('name'):
-            doc.add_heading(profile['name'], level=1)
+            doc.heading(profile['name'], 1)
         
         if not should_skip_section('education-section', hidden_sections) and profile.get('education_training_certifications'):
-            doc.add_heading('Education, Training, and Certifications', level=1)
+            doc.heading('Education, Training, and Certifications', 1)
             for item in profile['education_training_certifications']:
                 title = item.get('title', '')
                 if 'education-dates' not in hidden_dates:
                     start_date = format_date_for_display(item.get('start_date', 'N/A'))
                     end_date = format_date_for_display(item.get('end_date', 'N/A'))
-                    doc.add_paragraph(f"{title} ({start_date} - {end_date})", style='ListBullet')
+                    doc.bullet(f"{title} ({start_date} - {end_date})")
                 else:
-                    doc.add_paragraph(f"{title}", style='ListBullet')
+                    doc.bullet(f"{title}")
         
         if not should_skip_section('experience-section', hidden_sections) and profile.get('total_experience'):
-            doc.add_heading('Total Experience', level=1)
-            doc.add_paragraph(profile['total_experience'])
+            doc.heading('Total Experience', 1)
+            doc.paragraph(profile['total_experience'])
         
         if not should_skip_section('summary-section', hidden_sections) and profile.get('professional_summary'):
-            doc.add_heading('Professional Achievements', level=1)
-            para = doc.add_paragraph()
-            html_to_docx(para, profile['professional_summary'])
+            doc.heading('Professional Achievements', 1)
+            doc.html(profile['professional_summary'])
         
         if not should_skip_section('projects-section', hidden_sections):
             if profile.get('netweb_projects'):
-                doc.add_heading('NetWeb Projects', level=1)
+                doc.heading('NetWeb Projects', 1)
                 for project in profile['netweb_projects']:
                     if project.get('title'):
-                        doc.add_heading(project['title'], level=2)
+                        doc.heading(project['title'], 2)
                     if project.get('description'):
-                        para = doc.add_paragraph()
-                        html_to_docx(para, project['description'])
+                        doc.html(project['description'])
             
             if profile.get('past_projects'):
-                doc.add_heading('Past Projects', level=1)
+                doc.heading('Past Projects', 1)
                 for project in profile['past_projects']:
                     if project.get('title'):
-                        doc.add_heading(project['title'], level=2)
+                        doc.heading(project['title'], 2)
                     if project.get('description'):
-                        para = doc.add_paragraph()
-                        html_to_docx(para, project['description'])
+                        doc.html(project['description'])
         
         if not should_skip_section('roles-section', hidden_sections) and profile.get('roles_responsibilities'):
-            doc.add_heading('Roles and Responsibilities', level=1)
-            para = doc.add_paragraph()
-            html_to_docx(para, profile['roles_responsibilities'])
+            doc.heading('Roles and Responsibilities', 1)
+            doc.html(profile['roles_responsibilities'])
         
         if not should_skip_section('work-experience-section', hidden_sections) and profile.get('work_experience'):
-            doc.add_heading('Work Experience', level=1)
+            doc.heading('Work Experience', 1)
             for exp in profile['work_experience']:
                 company_name = exp.get('company_name', 'Unknown Company')
                 role = exp.get('role', 'Unknown Role')
                 if 'work-experience-dates' not in hidden_dates:
                     start_date = format_date_for_display(exp.get('start_date', 'N/A'))
                     end_date = format_date_for_display(exp.get('end_date', 'N/A'))
-                    doc.add_heading(f"{company_name} - {role} ({start_date} - {end_date})", level=2)
+                    doc.heading(f"{company_name} - {role} ({start_date} - {end_date})", 2)
                 else:
-                    doc.add_heading(f"{company_name} - {role}", level=2)
+                    doc.heading(f"{company_name} - {role}", 2)
                 if exp.get('responsibilities'):
-                    para = doc.add_paragraph()
-                    html_to_docx(para, exp['responsibilities'])
+                    doc.html(exp['responsibilities'])
         
         if not should_skip_section('skills-section', hidden_sections) and profile.get('technical_skills'):
             skills = profile['technical_skills']
             if any(skills.values()):
-                doc.add_heading('Technical Skills', level=1)
+                doc.heading('Technical Skills', 1)
                 for skill_type, skill_list in skills.items():
                     if skill_list:
-                        doc.add_heading(skill_type.replace('_', ' ').title(), level=2)
+                        doc.heading(skill_type.replace('_', ' ').title(), 2)
                         for skill in skill_list:
-                            doc.add_paragraph(str(skill), style='ListBullet')
+                            doc.bullet(str(skill))
         
         if not should_skip_section('personal-details-section', hidden_sections) and profile.get('personal_details'):
             personal = profile['personal_details']
             if any(personal.values()):
-                doc.add_heading('Personal Details', level=1)
+                doc.heading('Personal Details', 1)
                 for key, value in personal.items():
                     if value and (key not in ['date_of_joining', 'date_of_birth'] or 'personal-dates' not in hidden_dates):
                         if key in ['date_of_joining', 'date_of_birth']:
                             value = format_date_for_display(value)
-                        doc.add_paragraph(f"{key.replace('_', ' ').title()}: {value}")
+                        doc.paragraph(f"{key.replace('_', ' ').title()}: {value}")
         
-        doc.save(output_path)
-        logging.info(f"Generated DOCX at {output_path}")
+        doc.save(output)
+        logging.info("Generated DOCX")
     except Exception as e:
-        logging.error(f"Error generating DOCX: {e}")
+        logging.error("Error generating DOCX: %s", e)
         raise
 
-def html_to_docx(paragraph, html_text):
+# XLSX layout engine. Sections are described declaratively in XLSX_SECTIONS
+# and each kind expands into rows of (column, value, style) cells; a variant
+# picks the sheet title, column widths and which sections to include. Cells
+# get one of two NamedStyles registered once per workbook, so writing a cell
+# costs a single style assignment instead of four style objects to hash.
+XLSX_HEADER = 'profile_header'
+XLSX_DATA = 'profile_data'
+
+def register_xlsx_styles(wb):
+    from openpyxl.styles import NamedStyle
+    styles = xlsx_styles()
+    wb.add_named_style(NamedStyle(name=XLSX_HEADER, font=styles['header_font'], fill=styles['header_fill'],
+                                  alignment=styles['center_align'], border=styles['border']))
+    wb.add_named_style(NamedStyle(name=XLSX_DATA, font=styles['data_font'],
+                                  alignment=styles['left_align'], border=styles['border']))
+
+def html_to_plain_text(text):
+    # One line per list item/paragraph/line break, joined with '; ' for a single cell
     from lxml import html
-    try:
-        tree = html.fromstring(f"<div>{html_text or ''}</div>")
-        current_run = paragraph.add_run()
-        
-        def process_element(element, run):
-            if element.tag == 'b':
-                run.bold = True
-                for child in element.iterchildren():
-                    process_element(child, run)
-            elif element.tag == 'i':
-                run.italic = True
-                for child in element.iterchildren():
-                    process_element(child, run)
-            elif element.tag == 'li':
-                run.text = f"- {element.text or ''}"
-                run.paragraph.style = 'ListBullet'
-                for child in element.iterchildren():
-                    new_run = paragraph.add_run()
-                    process_element(child, new_run)
-            elif element.tag in ('ul', 'ol'):
-                for child in element.iterchildren():
-                    process_element(child, run)
-            else:
-                if element.text:
-                    run.text = element.text
-                for child in element.iterchildren():
-                    new_run = paragraph.add_run()
-                    process_element(child, new_run)
-        
-        for child in tree.iterchildren():
-            process_element(child, current_run)
-    except Exception as e:
-        logging.error(f"Error converting HTML to DOCX: {e}")
-        paragraph.add_run(html_text or '')
+    if not text:
+        return ''
+    root = html.fromstring(f"<div>{text}</div>")
+    for element in root.iter('li', 'p', 'div', 'br'):
+        element.tail = '\n' + (element.tail or '')
+    lines = (line.strip() for line in root.text_content().split('\n'))
+    return '; '.join(line for line in lines if line)
+
+def xlsx_value_rows(title, value, hidden_dates):
+    return [[(1, title, XLSX_HEADER), (2, value, XLSX_DATA)], None]
+
+def xlsx_html_rows(title, value, hidden_dates):
+    return [[(1, title, XLSX_HEADER), (2, html_to_plain_text(value), XLSX_DATA)], None]
+
+def xlsx_education_rows(title, items, hidden_dates):
+    rows = [[(1, title, XLSX_HEADER)]]
+    for item in items:
+        text = item.get('title', '')
+        if 'education-dates' not in hidden_dates:
+            start_date = format_date_for_display(item.get('start_date', 'N/A'))
+            end_date = format_date_for_display(item.get('end_date', 'N/A'))
+            text = f"{text} ({start_date} - {end_date})"
+        rows.append([(2, text, XLSX_DATA)])
+    return rows + [None]
+
+def xlsx_project_rows(title, projects, hidden_dates):
+    rows = [[(1, title, XLSX_HEADER)]]
+    for project in projects:
+        if project.get('title'):
+            rows.append([(2, f"Title: {project['title']}", XLSX_HEADER)])
+        if project.get('description'):
+            rows.append([(2, "Description", XLSX_HEADER), (3, html_to_plain_text(project['description']), XLSX_DATA)])
+        rows.append(None)
+    return rows
+
+def xlsx_work_rows(title, experience, hidden_dates):
+    rows = [[(1, title, XLSX_HEADER)]]
+    for exp in experience:
+        heading = f"{exp.get('company_name', 'Unknown Company')} - {exp.get('role', 'Unknown Role')}"
+        if 'work-experience-dates' not in hidden_dates:
+            start_date = format_date_for_display(exp.get('start_date', 'N/A'))
+            end_date = format_date_for_display(exp.get('end_date', 'N/A'))
+            heading = f"{heading} ({start_date} - {end_date})"
+        rows.append([(2, heading, XLSX_HEADER)])
+        if exp.get('responsibilities'):
+            rows.append([(2, "Responsibilities", XLSX_HEADER), (3, html_to_plain_text(exp['responsibilities']), XLSX_DATA)])
+        rows.append(None)
+    return rows
+
+def xlsx_skill_rows(title, skills, hidden_dates):
+    if not any(skills.values()):
+        return []
+    rows = [[(1, title, XLSX_HEADER)]]
+    for skill_type, skill_list in skills.items():
+        if skill_list:
+            rows.append([(2, skill_type.replace('_', ' ').title(), XLSX_HEADER)])
+            rows += [[(3, str(skill), XLSX_DATA)] for skill in skill_list]
+            rows.append(None)
+    return rows
+
+def xlsx_personal_rows(title, personal, hidden_dates):
+    if not any(personal.values()):
+        return []
+    rows = [[(1, title, XLSX_HEADER)]]
+    for key, value in personal.items():
+        if value and (key not in ['date_of_joining', 'date_of_birth'] or 'personal-dates' not in hidden_dates):
+            if key in ['date_of_joining', 'date_of_birth']:
+                value = format_date_for_display(value)
+            rows.append([(2, key.replace('_', ' ').title(), XLSX_HEADER), (3, str(value), XLSX_DATA)])
+    return rows + [None]
+
+# (section id that can hide it, title, profile key, row builder)
+XLSX_SECTIONS = [
+    (None, "Name", 'name', xlsx_value_rows),
+    ('education-section', "Education, Training, and Certifications", 'education_training_certifications', xlsx_education_rows),
+    ('experience-section', "Total Experience", 'total_experience', xlsx_value_rows),
+    ('summary-section', "Professional Achievements", 'professional_summary', xlsx_html_rows),
+    ('projects-section', "NetWeb Projects", 'netweb_projects', xlsx_project_rows),
+    ('projects-section', "Past Projects", 'past_projects', xlsx_project_rows),
+    ('roles-section', "Roles and Responsibilities", 'roles_responsibilities', xlsx_html_rows),
+    ('work-experience-section', "Work Experience", 'work_experience', xlsx_work_rows),
+    ('skills-section', "Technical Skills", 'technical_skills', xlsx_skill_rows),
+    ('personal-details-section', "Personal Details", 'personal_details', xlsx_personal_rows),
+]
 
-def render_html_to_xlsx(profile, output_path, hidden_sections=None, hidden_dates=None):
+XLSX_VARIANTS = {
+    'full': {'sheet_title': "Resume", 'metric': 'xlsx', 'sections': XLSX_SECTIONS},
+    'skills': {'sheet_title': "Technical Skills", 'metric': 'xlsx_skills',
+               'sections': [section for section in XLSX_SECTIONS if section[2] == 'technical_skills']},
+}
+XLSX_COLUMN_WIDTHS = {'A': 30, 'B': 50, 'C': 50}
+
+def xlsx_layout(profile, sections, hidden_sections, hidden_dates):
+    rows = []
+    for section_id, title, key, build_rows in sections:
+        if section_id and should_skip_section(section_id, hidden_sections):
+            continue
+        if profile.get(key):
+            rows += build_rows(title, profile[key], hidden_dates)
+    return rows
+
+def render_html_to_xlsx(profile, output, hidden_sections=None, hidden_dates=None, variant='full'):
     if hidden_sections is None:
         hidden_sections = []
     if hidden_dates is None:
         hidden_dates = []
+    spec = XLSX_VARIANTS[variant]
+    from openpyxl import Workbook
+    with observe_stage('render_export', spec['metric']):
+        try:
+            wb = Workbook()
+            register_xlsx_styles(wb)
+            ws = wb.active
+            ws.title = spec['sheet_title']
+            for column, width in XLSX_COLUMN_WIDTHS.items():
+                ws.column_dimensions[column].width = width
+            for row_index, cells in enumerate(xlsx_layout(profile, spec['sections'], hidden_sections, hidden_dates), 1):
+                for column, value, style in cells or ():
+                    cell = ws.cell(row=row_index, column=column, value=value)
+                    cell.style = style
+            wb.save(output)
+            logging.info("Generated XLSX (%s)", variant)
+        except Exception as e:
+            logging.error("Error generating XLSX: %s", e)
+            raise
+
+def store_session_profile(source):
+    # Saves the session's profile as a new version in the repository (profile_store.py)
+    if not profile_store.PROFILE_STORE_ENABLED:
+        return
     try:
-        wb = Workbook()
-        ws = wb.active
-        ws.title = "Resume"
-        row = 1
-        
-        def add_html_text(cell, text):
-            if not text:
-                return
-            plain_text = bleach.clean(text, tags=[], strip=True).replace('\n', '; ')
-            cell.value = plain_text
-            apply_cell_style(cell)
-        
-        ws.column_dimensions['A'].width = 30
-        ws.column_dimensions['B'].width = 50
-        ws.column_dimensions['C'].width = 50
-        
-        if profile.get('name'):
-            ws.cell(row=row, column=1).value = "Name"
-            apply_cell_style(ws.cell(row=row, column=1), is_header=True)
-            ws.cell(row=row, column=2).value = profile['name']
-            apply_cell_style(ws.cell(row=row, column=2))
-            row += 2
-        
-        if not should_skip_section('education-section', hidden_sections) and profile.get('education_training_certifications'):
-            ws.cell(row=row, column=1).value = "Education, Training, and Certifications"
-            apply_cell_style(ws.cell(row=row, column=1), is_header=True)
-            row += 1
-            for item in profile['education_training_certifications']:
-                title = item.get('title', '')
-                if 'education-dates' not in hidden_dates:
-                    start_date = format_date_for_display(item.get('start_date', 'N/A'))
-                    end_date = format_date_for_display(item.get('end_date', 'N/A'))
-                    ws.cell(row=row, column=2).value = f"{title} ({start_date} - {end_date})"
-                else:
-                    ws.cell(row=row, column=2).value = f"{title}"
-                apply_cell_style(ws.cell(row=row, column=2))
-                row += 1
-            row += 1
-        
-        if not should_skip_section('experience-section', hidden_sections) and profile.get('total_experience'):
-            ws.cell(row=row, column=1).value = "Total Experience"
-            apply_cell_style(ws.cell(row=row, column=1), is_header=True)
-            ws.cell(row=row, column=2).value = profile['total_experience']
-            apply_cell_style(ws.cell(row=row, column=2))
-            row += 2
-        
-        if not should_skip_section('summary-section', hidden_sections) and profile.get('professional_summary'):
-            ws.cell(row=row, column=1).value = "Professional Achievements"
-            apply_cell_style(ws.cell(row=row, column=1), is_header=True)
-            add_html_text(ws.cell(row=row, column=2), profile['professional_summary'])
-            row += 2
-        
-        if not should_skip_section('projects-section', hidden_sections):
-            if profile.get('netweb_projects'):
-                ws.cell(row=row, column=1).value = "NetWeb Projects"
-                apply_cell_style(ws.cell(row=row, column=1), is_header=True)
-                row += 1
-                for project in profile['netweb_projects']:
-                    if project.get('title'):
-                        ws.cell(row=row, column=2).value = f"Title: {project['title']}"
-                        apply_cell_style(ws.cell(row=row, column=2), is_header=True)
-                        row += 1
-                    if project.get('description'):
-                        ws.cell(row=row, column=2).value = "Description"
-                        apply_cell_style(ws.cell(row=row, column=2), is_header=True)
-                        add_html_text(ws.cell(row=row, column=3), project['description'])
-                        row += 1
-                    row += 1
-            
-            if profile.get('past_projects'):
-                ws.cell(row=row, column=1).value = "Past Projects"
-                apply_cell_style(ws.cell(row=row, column=1), is_header=True)
-                row += 1
-                for project in profile['past_projects']:
-                    if project.get('title'):
-                        ws.cell(row=row, column=2).value = f"Title: {project['title']}"
-                        apply_cell_style(ws.cell(row=row, column=2), is_header=True)
-                        row += 1
-                    if project.get('description'):
-                        ws.cell(row=row, column=2).value = "Description"
-                        apply_cell_style(ws.cell(row=row, column=2), is_header=True)
-                        add_html_text(ws.cell(row=row, column=3), project['description'])
-                        row += 1
-                    row += 1
-        
-        if not should_skip_section('roles-section', hidden_sections) and profile.get('roles_responsibilities'):
-            ws.cell(row=row, column=1).value = "Roles and Responsibilities"
-            apply_cell_style(ws.cell(row=row, column=1), is_header=True)
-            add_html_text(ws.cell(row=row, column=2), profile['roles_responsibilities'])
-            row += 2
-        
-        if not should_skip_section('work-experience-section', hidden_sections) and profile.get('work_experience'):
-            ws.cell(row=row, column=1).value = "Work Experience"
-            apply_cell_style(ws.cell(row=row, column=1), is_header=True)
-            row += 1
-            for exp in profile['work_experience']:
-                company_name = exp.get('company_name', 'Unknown Company')
-                role = exp.get('role', 'Unknown Role')
-                if 'work-experience-dates' not in hidden_dates:
-                    start_date = format_date_for_display(exp.get('start_date', 'N/A'))
-                    end_date = format_date_for_display(exp.get('end_date', 'N/A'))
-                    ws.cell(row=row, column=2).value = f"{company_name} - {role} ({start_date} - {end_date})"
-                else:
-                    ws.cell(row=row, column=2).value = f"{company_name} - {role}"
-                apply_cell_style(ws.cell(row=row, column=2), is_header=True)
-                row += 1
-                if exp.get('responsibilities'):
-                    ws.cell(row=row, column=2).value = "Responsibilities"
-                    apply_cell_style(ws.cell(row=row, column=2), is_header=True)
-                    add_html_text(ws.cell(row=row, column=3), exp['responsibilities'])
-                    row += 1
-                row += 1
-        
-        if not should_skip_section('skills-section', hidden_sections) and profile.get('technical_skills'):
-            skills = profile['technical_skills']
-            if any(skills.values()):
-                ws.cell(row=row, column=1).value = "Technical Skills"
-                apply_cell_style(ws.cell(row=row, column=1), is_header=True)
-                row += 1
-                for skill_type, skill_list in skills.items():
-                    if skill_list:
-                        ws.cell(row=row, column=2).value = skill_type.replace('_', ' ').title()
-                        apply_cell_style(ws.cell(row=row, column=2), is_header=True)
-                        row += 1
-                        for skill in skill_list:
-                            ws.cell(row=row, column=3).value = str(skill)
-                            apply_cell_style(ws.cell(row=row, column=3))
-                            row += 1
-                        row += 1
-        
-        if not should_skip_section('personal-details-section', hidden_sections) and profile.get('personal_details'):
-            personal = profile['personal_details']
-            if any(personal.values()):
-                ws.cell(row=row, column=1).value = "Personal Details"
-                apply_cell_style(ws.cell(row=row, column=1), is_header=True)
-                row += 1
-                for key, value in personal.items():
-                    if value and (key not in ['date_of_joining', 'date_of_birth'] or 'personal-dates' not in hidden_dates):
-                        if key in ['date_of_joining', 'date_of_birth']:
-                            value = format_date_for_display(value)
-                        ws.cell(row=row, column=2).value = key.replace('_', ' ').title()
-                        apply_cell_style(ws.cell(row=row, column=2), is_header=True)
-                        ws.cell(row=row, column=3).value = str(value)
-                        apply_cell_style(ws.cell(row=row, column=3))
-                        row += 1
-                row += 1
-        
-        wb.save(output_path)
-        logging.info(f"Generated XLSX at {output_path}")
+        profile_id, _ = profile_store.save(
+            session['profile'], session.get('hidden_sections', []), session.get('hidden_dates', []),
+            session.get('design', 'display_profile'), source, profile_id=session.get('profile_id'))
+        session['profile_id'] = profile_id
+        skill_index.update(profile_id, session['profile'])
+        jd_match.update(profile_id, session['profile'])
     except Exception as e:
-        logging.error(f"Error generating XLSX: {e}")
-        raise
+        logging.error("Failed to store profile: %s", e, exc_info=True)
 
 @app.route('/', methods=['GET', 'POST'])
 def index():
@@ -803,7 +1506,18 @@ def index():
             logging.warning("No valid input provided")
             return redirect('/')
         formatted_text = clean_formatting(text)
-        profile = generate_structured_data(formatted_text)
+        try:
+            # Double submits and simultaneous uploads of the same CV share one parse
+            profile = single_flight.run(single_flight.content_key('structured_data', formatted_text),
+                                        lambda: parse_resume(formatted_text))
+        except llm_usage.BudgetExceeded as e:
+            logging.warning("Profile generation rejected: %s", e)
+            flash("You have reached today's limit for AI processing. Please try again tomorrow or create a profile from scratch.")
+            return redirect('/')
+        except llm_gateway.LLMUnavailable as e:
+            logging.warning("Profile generation rejected: %s", e)
+            flash("The AI service is busy right now. Please try again in a minute.")
+            return redirect('/')
         if not profile:
             flash("Unable to generate profile data from the provided input. Please try again.")
             logging.error("Profile generation failed")
@@ -814,11 +1528,13 @@ def index():
         session['hidden_dates'] = []
         session['creation_method'] = 'upload'
         session['design'] = 'display_profile'
-        logging.info(f"Initialized session: profile keys={list(profile.keys())}, hidden_sections=[], hidden_dates=[], creation_method=upload, design=display_profile")
+        session.pop('profile_id', None)
+        store_session_profile('upload')
+        logging.info("Initialized session: profile keys=%s, hidden_sections=[], hidden_dates=[], creation_method=upload, design=display_profile", list(profile.keys()))
         try:
             return render_template("display_profile.html", profile=profile, hidden_sections=[], hidden_dates=[])
         except Exception as e:
-            logging.error(f"Template rendering error for display_profile.html: {str(e)}\n{traceback.format_exc()}")
+            logging.error("Template rendering error for display_profile.html: %s", e, exc_info=True)
             flash(f"Template error: {str(e)}. Please ensure display_profile.html exists.")
             return redirect('/')
     if not session.get('profile'):
@@ -827,6 +1543,7 @@ def index():
         session.pop('hidden_dates', None)
         session.pop('creation_method', None)
         session.pop('design', None)
+        session.pop('profile_id', None)
     return render_template("index.html")
 
 @app.route('/create-from-scratch', methods=['GET'])
@@ -841,15 +1558,13 @@ def create_from_scratch():
         return render_template("create-from-scratch.html")
     except Exception as e:
         flash(f"Template error: {str(e)}. Please ensure create-from-scratch.html exists.")
-        logging.error(f"Template rendering error for create-from-scratch.html: {str(e)}")
+        logging.error("Template rendering error for create-from-scratch.html: %s", e)
         return redirect('/')
 
 @app.route('/submit_from_scratch', methods=['POST'])
 def submit_from_scratch():
     logging.info("Received form submission from create-from-scratch.html")
-    form_data = request.form.to_dict(flat=False)
-    for key, value in form_data.items():
-        logging.debug(f"{key}: {value}")
+    log_payload("Form data", request.form.to_dict(flat=False))
 
     profile_data = {
         "name": request.form.get('full_name', '').strip(),
@@ -946,18 +1661,22 @@ def submit_from_scratch():
     session['hidden_dates'] = []
     session['creation_method'] = 'scratch'
     session['design'] = 'display_profile'
-    logging.info(f"Stored profile in session: {json.dumps(profile_data, indent=2)}")
+    session.pop('profile_id', None)
+    store_session_profile('scratch')
+    logging.info("Stored profile in session: %s", ProfileSummary(profile_data))
+    log_payload("Stored profile", profile_data)
 
     try:
         logging.info("Redirecting to display_profile")
         return redirect(url_for('display_profile'))
     except Exception as e:
         flash(f"Routing error: {str(e)}. Please ensure display_profile route is defined.")
-        logging.error(f"Routing error for display_profile: {str(e)}")
+        logging.error("Routing error for display_profile: %s", e)
         return redirect('/create_from_scratch')
 
 @app.route('/check_grammar', methods=['POST'])
 def check_grammar_route():
+    import bleach
     data = request.get_json()
     if not data:
         return jsonify({"error": "No data provided"}), 400
@@ -1010,13 +1729,14 @@ def check_grammar_route():
     
     formatted_suggestions = [
         {
-            "field": k,
-            "field_id": text_fields[k]['id'],
-            "original": v['original'],
-            "suggested": v['suggested'],
-            "reason": v['reason']
+            "field": suggestion['field'],
+            "field_id": text_fields[suggestion['field']]['id'],
+            "original": suggestion.get('original', ''),
+            "suggested": suggestion.get('suggested', ''),
+            "reason": suggestion.get('reason', '')
         }
-        for k, v in [(k, v) for k, v in suggestions if k in text_fields]
+        for suggestion in suggestions
+        if isinstance(suggestion, dict) and suggestion.get('field') in text_fields
     ]
     
     return jsonify(formatted_suggestions)
@@ -1030,42 +1750,40 @@ def edit_profile():
         flash("No profile data available. Please upload or create a profile.")
         logging.warning("No profile data in session for /edit_profile")
         return redirect('/')
-    logging.info(f"Edit profile: profile keys={list(profile.keys())}, hidden_sections={hidden_sections}, hidden_dates={hidden_dates}")
+    logging.info("Edit profile: profile keys=%s, hidden_sections=%s, hidden_dates=%s", list(profile.keys()), hidden_sections, hidden_dates)
     try:
         return render_template("edit.html", profile=profile, hidden_sections=hidden_sections, hidden_dates=hidden_dates)
     except Exception as e:
         flash(f"Template error: {str(e)}. Please ensure edit.html exists.")
-        logging.error(f"Template rendering error for edit.html: {str(e)}")
+        logging.error("Template rendering error for edit.html: %s", e)
         return redirect('/')
 
 @app.route('/update_profile', methods=['POST'])
 def update_profile():
     action = request.form.get('action')
     logging.info("Received profile update form data:")
-    form_data = request.form.to_dict(flat=False)
-    for key, value in form_data.items():
-        logging.debug(f"{key}: {value}")
+    log_payload("Form data", request.form.to_dict(flat=False))
     
     hidden_sections = []
     hidden_dates = []
     try:
         hidden_sections = json.loads(request.form.get('hidden_sections', '[]'))
         if not isinstance(hidden_sections, list):
-            logging.warning(f"hidden_sections is not a valid list, defaulting to empty list: {hidden_sections}")
+            logging.warning("hidden_sections is not a valid list, defaulting to empty list: %s", hidden_sections)
             hidden_sections = []
         hidden_sections = [section for section in hidden_sections if section in VALID_SECTION_IDS]
     except json.JSONDecodeError as e:
-        logging.error(f"Error decoding hidden_sections: {e}")
+        logging.error("Error decoding hidden_sections: %s", e)
         hidden_sections = []
     
     try:
         hidden_dates = json.loads(request.form.get('hidden_dates', '[]'))
         if not isinstance(hidden_dates, list):
-            logging.warning(f"hidden_dates is not a valid list, defaulting to empty list: {hidden_dates}")
+            logging.warning("hidden_dates is not a valid list, defaulting to empty list: %s", hidden_dates)
             hidden_dates = []
         hidden_dates = [dates for dates in hidden_dates if dates in VALID_DATES_IDS]
     except json.JSONDecodeError as e:
-        logging.error(f"Error decoding hidden_dates: {e}")
+        logging.error("Error decoding hidden_dates: %s", e)
         hidden_dates = []
 
     profile_data = {
@@ -1181,7 +1899,7 @@ def update_profile():
     if errors:
         for error in errors:
             flash(error)
-        logging.warning(f"Validation failed: {errors}")
+        logging.warning("Validation failed: %s", errors)
         return render_template("edit.html", profile=profile_data, hidden_sections=hidden_sections, hidden_dates=hidden_dates)
 
     profile_data = sanitize_profile_data(profile_data)
@@ -1189,16 +1907,22 @@ def update_profile():
     session['profile'] = profile_data
     session['hidden_sections'] = hidden_sections
     session['hidden_dates'] = hidden_dates
-    logging.info(f"Updated session profile: {json.dumps(profile_data, indent=2)}")
-    logging.info(f"Updated session hidden_sections: {hidden_sections}, hidden_dates: {hidden_dates}")
+    logging.info("Updated session profile: %s", ProfileSummary(profile_data))
+    log_payload("Updated profile", profile_data)
+    logging.info("Updated session hidden_sections: %s, hidden_dates: %s", hidden_sections, hidden_dates)
 
     if action == 'save':
-        logging.info(f"Rendering {session.get('design', 'display_profile')}.html with hidden_sections: {hidden_sections}, hidden_dates: {hidden_dates}")
+        store_session_profile('edit')
+        logging.info("Rendering %s.html with hidden_sections: %s, hidden_dates: %s", session.get('design', 'display_profile'), hidden_sections, hidden_dates)
+        try:
+            schedule_prerender(session.get('design', 'display_profile'), profile_data, hidden_sections, hidden_dates)
+        except Exception as e:
+            logging.warning("Could not schedule pre-render: %s", e)
         try:
             return render_template(f"{session.get('design', 'display_profile')}.html", profile=profile_data, hidden_sections=hidden_sections, hidden_dates=hidden_dates)
         except Exception as e:
             flash(f"Template error: {str(e)}. Please ensure {session.get('design', 'display_profile')}.html exists.")
-            logging.error(f"Template rendering error for {session.get('design', 'display_profile')}.html: {str(e)}\n{traceback.format_exc()}")
+            logging.error("Template rendering error for %s.html: %s", session.get('design', 'display_profile'), e, exc_info=True)
             return redirect('/')
     else:
         flash("Invalid action requested. Please save or update the profile.")
@@ -1211,7 +1935,7 @@ def display_profile():
     hidden_sections = session.get('hidden_sections', [])
     hidden_dates = session.get('hidden_dates', [])
     design = session.get('design', 'display_profile')
-    logging.info(f"Rendering display_profile: profile_keys={list(profile.keys())}, hidden_sections={hidden_sections}, hidden_dates={hidden_dates}, design={design}")
+    logging.info("Rendering display_profile: profile_keys=%s, hidden_sections=%s, hidden_dates=%s, design=%s", list(profile.keys()), hidden_sections, hidden_dates, design)
     try:
         return render_template(
             f"{design}.html",
@@ -1220,7 +1944,7 @@ def display_profile():
             hidden_dates=hidden_dates
         )
     except Exception as e:
-        logging.error(f"Template rendering error for {design}.html: {str(e)}\n{traceback.format_exc()}")
+        logging.error("Template rendering error for %s.html: %s", design, e, exc_info=True)
         flash(f"Template error: {str(e)}. Falling back to default template.")
         return render_template(
             "display_profile.html",
@@ -1236,13 +1960,13 @@ def switch_design():
         # Get the design parameter from the POST request
         design = request.form.get('design')
         if design not in ['display_profile', 'display_profile', 'd1', 'd2', 'd3']:  # Added display_profile
-            logging.error(f"Invalid design selected: {design}")
+            logging.error("Invalid design selected: %s", design)
             return jsonify({'error': 'Invalid design selected'}), 400
 
         # Update the session with the selected design
         session.permanent = True
         session['design'] = design
-        logging.info(f"Switched design to: {design}")
+        logging.info("Switched design to: %s", design)
 
         # Load profile data and hidden sections from session
         profile = session.get('profile', {})
@@ -1258,21 +1982,25 @@ def switch_design():
         # Render the corresponding design template
         try:
             html = render_template(f'{design}.html', profile=safe_profile, hidden_sections=hidden_sections)
-            logging.info(f"Successfully rendered {design}.html")
-            return jsonify({'html': html})
+            logging.info("Successfully rendered %s.html", design)
         except Exception as e:
-            logging.error(f"Template rendering failed for {design}.html: {str(e)}\n{traceback.format_exc()}")
+            logging.error("Template rendering failed for %s.html: %s", design, e, exc_info=True)
             return jsonify({'error': f"Failed to render template: {str(e)}"}), 500
+        try:
+            schedule_prerender(design, profile, hidden_sections, session.get('hidden_dates', []))
+        except Exception as e:
+            logging.warning("Could not schedule pre-render: %s", e)
+        return jsonify({'html': html})
 
     except Exception as e:
-        logging.error(f"Unexpected error in switch_design: {str(e)}\n{traceback.format_exc()}")
+        logging.error("Unexpected error in switch_design: %s", e, exc_info=True)
         return jsonify({'error': f"An unexpected error occurred: {str(e)}"}), 500
 
 @app.route('/download', methods=['POST'])
 def download():
     try:
         profile = session.get('profile', {})
-        logging.info(f"Download PDF - Session profile: {json.dumps(profile, indent=2) if profile else 'None'}, creation_method: {session.get('creation_method', 'None')}")
+        logging.info("Download PDF - Session profile: %s, creation_method: %s", ProfileSummary(profile) if profile else 'None', session.get('creation_method', 'None'))
 
         if not profile:
             flash("No profile data available. Please create or upload a profile.")
@@ -1302,24 +2030,24 @@ def download():
         try:
             hidden_sections_str = request.form.get('hidden_sections', '[]')
             hidden_dates_str = request.form.get('hidden_dates', '[]')
-            logging.debug(f"Raw hidden_sections from form: {hidden_sections_str}")
-            logging.debug(f"Raw hidden_dates from form: {hidden_dates_str}")
+            logging.debug("Raw hidden_sections from form: %s", hidden_sections_str)
+            logging.debug("Raw hidden_dates from form: %s", hidden_dates_str)
             hidden_sections = json.loads(hidden_sections_str)
             hidden_dates = json.loads(hidden_dates_str)
             if not isinstance(hidden_sections, list):
-                logging.warning(f"hidden_sections is not a list, defaulting to empty: {hidden_sections}")
+                logging.warning("hidden_sections is not a list, defaulting to empty: %s", hidden_sections)
                 hidden_sections = []
             if not isinstance(hidden_dates, list):
-                logging.warning(f"hidden_dates is not a list, defaulting to empty: {hidden_dates}")
+                logging.warning("hidden_dates is not a list, defaulting to empty: %s", hidden_dates)
                 hidden_dates = []
             hidden_sections = [section for section in hidden_sections if section in VALID_SECTION_IDS]
             hidden_dates = [dates for dates in hidden_dates if dates in VALID_DATES_IDS]
         except json.JSONDecodeError as e:
-            logging.error(f"Error decoding hidden_sections or hidden_dates: {e}")
+            logging.error("Error decoding hidden_sections or hidden_dates: %s", e)
             hidden_sections = []
             hidden_dates = []
 
-        logging.info(f"Download PDF - hidden_sections: {hidden_sections}, hidden_dates: {hidden_dates}")
+        logging.info("Download PDF - hidden_sections: %s, hidden_dates: %s", hidden_sections, hidden_dates)
 
         session.permanent = True
         session['hidden_sections'] = hidden_sections
@@ -1335,62 +2063,57 @@ def download():
                 template,
                 profile=safe_profile,
                 hidden_sections=hidden_sections,
-                hidden_dates=hidden_dates
+                hidden_dates=hidden_dates,
+                inline_assets=True
             )
         except Exception as e:
-            logging.error(f"Template rendering failed for {template}: {str(e)}\n{traceback.format_exc()}")
+            logging.error("Template rendering failed for %s: %s", template, e, exc_info=True)
             flash(f"Failed to render resume template: {str(e)}")
             return redirect('/')
 
-        output_path = os.path.join(GENERATED_FOLDER, f"resume_{uuid.uuid4().hex}.pdf")
+        safe_name = safe_profile.get('name', 'Resume').replace(' ', '_').replace('/', '_')
+        download_name = f"{safe_name}_Resume.pdf"
+
+        artifact = prerendered_export('pdf', export_artifact_key('pdf', design, html_content))
+        if artifact is not None:
+            logging.info("Sending pre-rendered PDF as %s", download_name)
+            return send_export(artifact, download_name, mimetype='application/pdf')
 
+        buffer = export_buffer()
         try:
-            render_html_to_pdf(html_content, output_path)
+            render_html_to_pdf(html_content, buffer, renderer=pdf_renderer_for(design))
         except Exception as e:
-            logging.error(f"PDF generation failed: {str(e)}\n{traceback.format_exc()}")
+            buffer.close()
+            logging.error("PDF generation failed: %s", e, exc_info=True)
             flash(f"Failed to generate PDF: {str(e)}")
             return redirect('/')
 
-        if not os.path.exists(output_path):
-            logging.error(f"PDF file not found at {output_path}")
-            flash("PDF file could not be generated. Please try again.")
-            return redirect('/')
-
-        if os.path.getsize(output_path) == 0:
-            logging.error(f"Generated PDF at {output_path} is empty")
+        if buffer.tell() == 0:
+            buffer.close()
+            logging.error("Generated PDF is empty")
             flash("Generated PDF is empty. Please try again.")
-            cleanup_file(output_path)
             return redirect('/')
 
-        safe_name = safe_profile.get('name', 'Resume').replace(' ', '_').replace('/', '_')
-        download_name = f"{safe_name}_Resume.pdf"
-
-        logging.info(f"Successfully generated PDF at {output_path}, sending as {download_name}")
+        logging.info("Successfully generated PDF (%d bytes), sending as %s", buffer.tell(), download_name)
 
         try:
-            return send_file(
-                output_path,
-                as_attachment=True,
-                download_name=download_name,
-                mimetype='application/pdf'
-            )
+            return send_export(buffer, download_name, mimetype='application/pdf')
         except Exception as e:
-            logging.error(f"Failed to send PDF file: {str(e)}\n{traceback.format_exc()}")
+            buffer.close()
+            logging.error("Failed to send PDF file: %s", e, exc_info=True)
             flash(f"Failed to download PDF: {str(e)}")
             return redirect('/')
-        finally:
-            cleanup_file(output_path)
 
     except Exception as e:
-        logging.error(f"Unexpected error in download route: {str(e)}\n{traceback.format_exc()}")
+        logging.error("Unexpected error in download route: %s", e, exc_info=True)
         flash(f"An unexpected error occurred: {str(e)}")
         return redirect('/')
 
 @app.route('/download_docx', methods=['POST'])
 def download_docx():
     profile = session.get('profile', {})
-    logging.info(f"Download DOCX - Session profile keys: {list(profile.keys()) if profile else 'None'}")
-    logging.info(f"Download DOCX - Form data: {request.form.to_dict()}")
+    logging.info("Download DOCX - Session profile keys: %s", list(profile.keys()) if profile else 'None')
+    log_payload("Download DOCX - Form data", request.form.to_dict())
 
     hidden_sections = []
     hidden_dates = []
@@ -1400,52 +2123,46 @@ def download_docx():
         hidden_sections = json.loads(hidden_sections_str)
         hidden_dates = json.loads(hidden_dates_str)
         if not isinstance(hidden_sections, list):
-            logging.warning(f"hidden_sections is not a valid list, defaulting to empty list: {hidden_sections}")
+            logging.warning("hidden_sections is not a valid list, defaulting to empty list: %s", hidden_sections)
             hidden_sections = []
         if not isinstance(hidden_dates, list):
-            logging.warning(f"hidden_dates is not a valid list, defaulting to empty list: {hidden_dates}")
+            logging.warning("hidden_dates is not a valid list, defaulting to empty list: %s", hidden_dates)
             hidden_dates = []
         hidden_sections = [section for section in hidden_sections if section in VALID_SECTION_IDS]
         hidden_dates = [dates for dates in hidden_dates if dates in VALID_DATES_IDS]
     except json.JSONDecodeError as e:
-        logging.error(f"Error decoding hidden_sections or hidden_dates: {e}\n{traceback.format_exc()}")
+        logging.error("Error decoding hidden_sections or hidden_dates: %s", e, exc_info=True)
         hidden_sections = []
         hidden_dates = []
 
-    logging.info(f"Download DOCX request - hidden_sections: {hidden_sections}, hidden_dates: {hidden_dates}")
+    logging.info("Download DOCX request - hidden_sections: %s, hidden_dates: %s", hidden_sections, hidden_dates)
 
     if not profile:
         flash("No profile data available. Please create or upload a profile.")
         logging.warning("No profile data in session for /download_docx")
         return redirect('/')
 
-    output_path = None
+    download_name = f"{profile.get('name', 'Employee').replace(' ', '_')}_Profile.docx"
+    artifact = prerendered_export('docx', export_artifact_key('docx', profile=profile, hidden_sections=hidden_sections, hidden_dates=hidden_dates))
+    if artifact is not None:
+        return send_export(artifact, download_name)
+
+    buffer = export_buffer()
     try:
         session.permanent = True
-        output_path = os.path.join(GENERATED_FOLDER, f"profile_{uuid.uuid4().hex}.docx")
-        render_html_to_docx(profile, output_path, hidden_sections, hidden_dates)
-        if not os.path.exists(output_path):
-            logging.error(f"DOCX file not found at {output_path}")
-            flash("DOCX file could not be generated. Please try again.")
-            return redirect('/')
-        return send_file(
-            output_path,
-            as_attachment=True,
-            download_name=f"{profile.get('name', 'Employee').replace(' ', '_')}_Profile.docx"
-        )
+        render_html_to_docx(profile, buffer, hidden_sections, hidden_dates)
+        return send_export(buffer, download_name)
     except Exception as e:
+        buffer.close()
         flash(f"Failed to generate DOCX: {str(e)}. Please try again or contact support.")
-        logging.error(f"DOCX generation failed: {str(e)}\n{traceback.format_exc()}")
+        logging.error("DOCX generation failed: %s", e, exc_info=True)
         return redirect('/')
-    finally:
-        if output_path:
-            cleanup_file(output_path)
 
 @app.route('/download_xlsx', methods=['POST'])
 def download_xlsx():
     profile = session.get('profile', {})
-    logging.info(f"Download XLSX - Session profile keys: {list(profile.keys()) if profile else 'None'}")
-    logging.info(f"Download XLSX - Form data: {request.form.to_dict()}")
+    logging.info("Download XLSX - Session profile keys: %s", list(profile.keys()) if profile else 'None')
+    log_payload("Download XLSX - Form data", request.form.to_dict())
 
     hidden_sections = []
     hidden_dates = []
@@ -1455,19 +2172,19 @@ def download_xlsx():
         hidden_sections = json.loads(hidden_sections_str)
         hidden_dates = json.loads(hidden_dates_str)
         if not isinstance(hidden_sections, list):
-            logging.warning(f"hidden_sections is not a valid list, defaulting to empty list: {hidden_sections}")
+            logging.warning("hidden_sections is not a valid list, defaulting to empty list: %s", hidden_sections)
             hidden_sections = []
         if not isinstance(hidden_dates, list):
-            logging.warning(f"hidden_dates is not a valid list, defaulting to empty list: {hidden_dates}")
+            logging.warning("hidden_dates is not a valid list, defaulting to empty list: %s", hidden_dates)
             hidden_dates = []
         hidden_sections = [section for section in hidden_sections if section in VALID_SECTION_IDS]
         hidden_dates = [dates for dates in hidden_dates if dates in VALID_DATES_IDS]
     except json.JSONDecodeError as e:
-        logging.error(f"Error decoding hidden_sections or hidden_dates: {e}\n{traceback.format_exc()}")
+        logging.error("Error decoding hidden_sections or hidden_dates: %s", e, exc_info=True)
         hidden_sections = []
         hidden_dates = []
 
-    logging.info(f"Download XLSX request - hidden_sections: {hidden_sections}, hidden_dates: {hidden_dates}")
+    logging.info("Download XLSX request - hidden_sections: %s, hidden_dates: %s", hidden_sections, hidden_dates)
 
     if not profile:
         flash("No profile data available. Please create or upload a profile.")
@@ -1475,58 +2192,392 @@ def download_xlsx():
         return redirect('/')
 
     skills_only = request.form.get('skills_only') == 'true'
-    output_path = None
+    download_name = f"{profile.get('name', 'Employee').replace(' ', '_')}_Profile.xlsx"
+    if not skills_only:
+        artifact = prerendered_export('xlsx', export_artifact_key('xlsx', profile=profile, hidden_sections=hidden_sections, hidden_dates=hidden_dates))
+        if artifact is not None:
+            return send_export(artifact, download_name)
+
+    buffer = export_buffer()
     try:
         session.permanent = True
-        output_path = os.path.join(GENERATED_FOLDER, f"profile_{uuid.uuid4().hex}.xlsx")
-        
-        if skills_only:
-            wb = Workbook()
-            ws = wb.active
-            ws.title = "Technical Skills"
-            row = 1
-            
-            ws.column_dimensions['A'].width = 30
-            ws.column_dimensions['B'].width = 50
-            
-            skills = profile.get('technical_skills', {})
-            if any(skills.values()) and 'skills-section' not in hidden_sections:
-                ws.cell(row=row, column=1).value = "Technical Skills"
-                apply_cell_style(ws.cell(row=row, column=1), is_header=True)
-                row += 1
-                for skill_type, skill_list in skills.items():
-                    if skill_list:
-                        ws.cell(row=row, column=2).value = skill_type.replace('_', ' ').title()
-                        apply_cell_style(ws.cell(row=row, column=2), is_header=True)
-                        row += 1
-                        for skill in skill_list:
-                            ws.cell(row=row, column=2).value = str(skill)
-                            apply_cell_style(ws.cell(row=row, column=2))
-                            row += 1
-                        row += 1
-            
-            wb.save(output_path)
-            logging.info(f"Generated skills-only XLSX at {output_path}")
-        else:
-            render_html_to_xlsx(profile, output_path, hidden_sections, hidden_dates)
-
-        if not os.path.exists(output_path):
-            logging.error(f"XLSX file not found at {output_path}")
-            flash("XLSX file could not be generated. Please try again.")
-            return redirect('/')
-        
-        return send_file(
-            output_path,
-            as_attachment=True,
-            download_name=f"{profile.get('name', 'Employee').replace(' ', '_')}_Profile.xlsx"
-        )
+        render_html_to_xlsx(profile, buffer, hidden_sections, hidden_dates, variant='skills' if skills_only else 'full')
+        return send_export(buffer, download_name)
     except Exception as e:
+        buffer.close()
         flash(f"Failed to generate XLSX: {str(e)}. Please try again or contact support.")
-        logging.error(f"XLSX generation failed: {str(e)}\n{traceback.format_exc()}")
+        logging.error("XLSX generation failed: %s", e, exc_info=True)
+        return redirect('/')
+
+# /download_bundle renders the selected formats side by side from the session
+# profile and returns a single ZIP. Each format renders on an
+# export pool thread: PDF waits on Chromium (the shared browser under
+# ASYNC_BACKENDS) while DOCX and XLSX build in Python, so the bundle takes
+# about as long as the slowest format rather than the sum.
+BUNDLE_FORMATS = ['pdf', 'docx', 'xlsx']
+EXPORT_THREADS = int(os.getenv('EXPORT_THREADS', '4'))
+export_pool = None
+export_pool_lock = threading.Lock()
+
+def get_export_pool():
+    global export_pool
+    if export_pool is None:
+        with export_pool_lock:
+            if export_pool is None:
+                export_pool = ThreadPoolExecutor(max_workers=EXPORT_THREADS, thread_name_prefix='export')
+    return export_pool
+
+def reset_export_pool():
+    global export_pool, export_pool_lock
+    export_pool = None
+    export_pool_lock = threading.Lock()
+
+os.register_at_fork(after_in_child=reset_export_pool)
+
+def export_basename(profile):
+    return secure_filename(profile.get('name') or 'Employee') or 'Employee'
+
+def render_bundle_member(fmt, profile, html_content, renderer, hidden_sections, hidden_dates):
+    # PDF renders the sanitized template HTML; DOCX and XLSX take the session
+    # profile as /download_docx and /download_xlsx do, since they escape it themselves
+    key = (artifact_store.artifact_key('pdf', renderer, html_content) if fmt == 'pdf'
+           else export_artifact_key(fmt, profile=profile, hidden_sections=hidden_sections, hidden_dates=hidden_dates))
+    artifact = prerendered_export(fmt, key)
+    if artifact is not None:
+        return artifact
+    buffer = export_buffer()
+    try:
+        if fmt == 'pdf':
+            render_html_to_pdf(html_content, buffer, renderer=renderer)
+        elif fmt == 'docx':
+            render_html_to_docx(profile, buffer, hidden_sections, hidden_dates)
+        else:
+            render_html_to_xlsx(profile, buffer, hidden_sections, hidden_dates)
+        return buffer
+    except Exception:
+        buffer.close()
+        raise
+
+@app.route('/download_bundle', methods=['POST'])
+def download_bundle():
+    profile = session.get('profile', {})
+    if not profile:
+        flash("No profile data available. Please create or upload a profile.")
+        logging.warning("No profile data in session for /download_bundle")
+        return redirect('/')
+
+    formats = []
+    for value in request.form.getlist('formats') or [','.join(BUNDLE_FORMATS)]:
+        formats += [fmt.strip().lower() for fmt in value.split(',') if fmt.strip().lower() in BUNDLE_FORMATS]
+    formats = list(dict.fromkeys(formats))
+    if not formats:
+        flash("Please choose at least one format to download.")
+        return redirect('/')
+
+    try:
+        hidden_sections = json.loads(request.form.get('hidden_sections', '[]'))
+        hidden_dates = json.loads(request.form.get('hidden_dates', '[]'))
+    except json.JSONDecodeError as e:
+        logging.error("Error decoding hidden_sections or hidden_dates: %s", e)
+        hidden_sections, hidden_dates = [], []
+    hidden_sections = [section for section in hidden_sections if section in VALID_SECTION_IDS] if isinstance(hidden_sections, list) else []
+    hidden_dates = [dates for dates in hidden_dates if dates in VALID_DATES_IDS] if isinstance(hidden_dates, list) else []
+    logging.info("Download bundle %s - hidden_sections: %s, hidden_dates: %s", formats, hidden_sections, hidden_dates)
+
+    session.permanent = True
+    session['hidden_sections'] = hidden_sections
+    session['hidden_dates'] = hidden_dates
+    design = session.get('design', 'display_profile')
+    safe_name = export_basename(profile)
+    member_names = {'pdf': f"{safe_name}_Resume.pdf", 'docx': f"{safe_name}_Profile.docx", 'xlsx': f"{safe_name}_Profile.xlsx"}
+
+    with observe_stage('render_export', 'bundle'):
+        html_content = None
+        if 'pdf' in formats:
+            html_content = render_template(
+                f"{design}.html",
+                profile=sanitize_profile_data(profile),
+                hidden_sections=hidden_sections,
+                hidden_dates=hidden_dates,
+                inline_assets=True
+            )
+        futures = {
+            get_export_pool().submit(render_bundle_member, fmt, profile, html_content, pdf_renderer_for(design),
+                                     hidden_sections, hidden_dates): fmt
+            for fmt in formats
+        }
+        bundle = export_buffer()
+        errors = []
+        with zipfile.ZipFile(bundle, 'w', zipfile.ZIP_STORED) as archive:
+            # Already-compressed formats; written in the order they finish
+            for future in as_completed(futures):
+                fmt = futures[future]
+                try:
+                    member = future.result()
+                except Exception as e:
+                    logging.error("Bundle %s export failed: %s", fmt, e)
+                    errors.append(f"{fmt.upper()}: {str(e).splitlines()[0] if str(e) else type(e).__name__}")
+                    continue
+                with member:
+                    member.seek(0)
+                    with archive.open(member_names[fmt], 'w') as destination:
+                        shutil.copyfileobj(member, destination)
+            if errors and len(errors) < len(formats):
+                archive.writestr('errors.txt', "Some formats could not be generated:\n" + '\n'.join(errors) + '\n')
+
+    if len(errors) == len(formats):
+        bundle.close()
+        flash(f"Failed to generate downloads: {'; '.join(errors)}")
         return redirect('/')
+    logging.info("Generated bundle %s (%d failed)", formats, len(errors))
+    return send_export(bundle, f"{safe_name}_Profile.zip", mimetype='application/zip')
+
+# Speculative pre-rendering (opt-in with PRERENDER_FORMATS, e.g. "pdf" or
+# "pdf,docx,xlsx"). Saving a profile or switching design queues renders of
+# the current state on a low-priority pool and stores them in the artifact
+# store. The download routes hash the state they are asked for and send a
+# matching artifact straight away, waiting on a render that is already
+# running in this process. A newer save or switch for the same session
+# cancels that session's queued renders; one already running finishes and
+# is kept, since the user may switch back.
+PRERENDER_FORMATS = [fmt.strip() for fmt in os.getenv('PRERENDER_FORMATS', '').split(',') if fmt.strip() in BUNDLE_FORMATS]
+PRERENDER_THREADS = int(os.getenv('PRERENDER_THREADS', '1'))
+PRERENDER_NICE = int(os.getenv('PRERENDER_NICE', '10'))
+EXPORT_EXTENSIONS = {'pdf': 'pdf', 'docx': 'docx', 'xlsx': 'xlsx'}
+prerender_pool = None
+prerender_pool_lock = threading.Lock()
+prerender_lock = threading.RLock()
+prerender_jobs = {}
+prerender_inflight = {}
+
+def lower_thread_priority():
+    # Linux applies nice values per thread, and Chromium children inherit it
+    try:
+        os.setpriority(os.PRIO_PROCESS, threading.get_native_id(), PRERENDER_NICE)
+    except (AttributeError, OSError) as e:
+        logging.debug("Could not lower pre-render thread priority: %s", e)
+
+def get_prerender_pool():
+    global prerender_pool
+    if prerender_pool is None:
+        with prerender_pool_lock:
+            if prerender_pool is None:
+                prerender_pool = ThreadPoolExecutor(max_workers=PRERENDER_THREADS, thread_name_prefix='prerender',
+                                                    initializer=lower_thread_priority)
+    return prerender_pool
+
+def reset_prerender_state():
+    global prerender_pool, prerender_pool_lock, prerender_lock, prerender_jobs, prerender_inflight
+    prerender_pool = None
+    prerender_pool_lock = threading.Lock()
+    prerender_lock = threading.RLock()
+    prerender_jobs = {}
+    prerender_inflight = {}
+
+os.register_at_fork(after_in_child=reset_prerender_state)
+
+def export_artifact_key(fmt, design=None, html_content=None, profile=None, hidden_sections=None, hidden_dates=None):
+    # PDFs are keyed on the exact HTML handed to the renderer, DOCX/XLSX on their inputs
+    if fmt == 'pdf':
+        return artifact_store.artifact_key('pdf', pdf_renderer_for(design), html_content)
+    return artifact_store.artifact_key(fmt, profile, hidden_sections or [], hidden_dates or [])
+
+def prerender_export(fmt, key, design, html_content, profile, hidden_sections, hidden_dates):
+    buffer = export_buffer()
+    try:
+        with observe_stage('prerender', fmt):
+            if fmt == 'pdf':
+                render_html_to_pdf(html_content, buffer, renderer=pdf_renderer_for(design))
+            elif fmt == 'docx':
+                render_html_to_docx(profile, buffer, hidden_sections, hidden_dates)
+            else:
+                render_html_to_xlsx(profile, buffer, hidden_sections, hidden_dates)
+            artifact_store.put(key, EXPORT_EXTENSIONS[fmt], buffer)
+        logging.info("Pre-rendered %s %s", fmt, key[:12])
+    except Exception as e:
+        logging.warning("Pre-render of %s failed: %s", fmt, e)
     finally:
-        if output_path:
-            cleanup_file(output_path)
+        buffer.close()
+
+def forget_prerender(key, future):
+    with prerender_lock:
+        if prerender_inflight.get(key) is future:
+            del prerender_inflight[key]
+
+def schedule_prerender(design, profile, hidden_sections, hidden_dates):
+    if not PRERENDER_FORMATS or not profile:
+        return
+    sid = getattr(session, 'sid', None)
+    safe_profile = sanitize_profile_data(profile)
+    html_content = None
+    if 'pdf' in PRERENDER_FORMATS:
+        html_content = render_template(
+            f"{design}.html",
+            profile=safe_profile,
+            hidden_sections=hidden_sections,
+            hidden_dates=hidden_dates,
+            inline_assets=True
+        )
+    with prerender_lock:
+        for future in prerender_jobs.pop(sid, []):
+            future.cancel()
+        for other_sid in [other for other, futures in prerender_jobs.items() if all(f.done() for f in futures)]:
+            del prerender_jobs[other_sid]
+        futures = []
+        for fmt in PRERENDER_FORMATS:
+            # Each format is keyed on what its download route renders
+            rendered_profile = safe_profile if fmt == 'pdf' else profile
+            key = export_artifact_key(fmt, design, html_content, rendered_profile, hidden_sections, hidden_dates)
+            if key in prerender_inflight or artifact_store.exists(key, EXPORT_EXTENSIONS[fmt]):
+                continue
+            future = get_prerender_pool().submit(prerender_export, fmt, key, design, html_content,
+                                                 rendered_profile, hidden_sections, hidden_dates)
+            prerender_inflight[key] = future
+            future.add_done_callback(functools.partial(forget_prerender, key))
+            futures.append(future)
+        prerender_jobs[sid] = futures
+    logging.info("Queued %d pre-renders for %s", len(futures), design)
+
+def prerendered_export(fmt, key):
+    # Returns an open artifact file, or None when the caller should render itself
+    if not PRERENDER_FORMATS:
+        return None
+    with prerender_lock:
+        future = prerender_inflight.get(key)
+    if future is not None:
+        if future.running():
+            try:
+                future.result(async_backends.BACKEND_TIMEOUT)
+            except Exception:
+                pass
+        else:
+            # Still queued behind other renders; rendering now is faster
+            future.cancel()
+    artifact = artifact_store.get(key, EXPORT_EXTENSIONS[fmt])
+    record_cache('prerender', artifact is not None)
+    return artifact
+
+@app.route('/profiles')
+def list_profiles():
+    if not profile_store.PROFILE_STORE_ENABLED:
+        abort(404)
+    query = request.args.get('q', '').strip()
+    page = max(1, request.args.get('page', 1, type=int))
+    page_size = profile_store.LIST_PAGE_SIZE
+    # One extra row tells us whether there is a next page
+    rows = profile_store.list_profiles(query, limit=page_size + 1, offset=(page - 1) * page_size)
+    for row in rows:
+        row['updated'] = time.strftime('%Y-%m-%d %H:%M', time.localtime(row['updated']))
+    return render_template("profiles.html", profiles=rows[:page_size], query=query, page=page,
+                           has_next=len(rows) > page_size, formats=BUNDLE_FORMATS)
+
+@app.route('/profiles/<int:profile_id>')
+def open_profile(profile_id):
+    if not profile_store.PROFILE_STORE_ENABLED:
+        abort(404)
+    stored = profile_store.load(profile_id, request.args.get('version', type=int))
+    if stored is None:
+        flash("That stored profile no longer exists.")
+        return redirect(url_for('list_profiles'))
+    session.permanent = True
+    session['profile'] = stored['profile']
+    session['hidden_sections'] = stored['hidden_sections']
+    session['hidden_dates'] = stored['hidden_dates']
+    session['design'] = stored['design']
+    session['creation_method'] = 'stored'
+    session['profile_id'] = profile_id
+    logging.info("Opened stored profile %s version %s", profile_id, stored['version'])
+    return redirect(url_for('display_profile'))
+
+@app.route('/profiles/<int:profile_id>/export/<fmt>')
+def export_stored_profile(profile_id, fmt):
+    if not profile_store.PROFILE_STORE_ENABLED or fmt not in BUNDLE_FORMATS:
+        abort(404)
+    stored = profile_store.load(profile_id, request.args.get('version', type=int))
+    if stored is None:
+        abort(404)
+    design = stored['design']
+    html_content = None
+    if fmt == 'pdf':
+        html_content = render_template(
+            f"{design}.html",
+            profile=sanitize_profile_data(stored['profile']),
+            hidden_sections=stored['hidden_sections'],
+            hidden_dates=stored['hidden_dates'],
+            inline_assets=True
+        )
+    try:
+        buffer = render_bundle_member(fmt, stored['profile'], html_content, pdf_renderer_for(design),
+                                      stored['hidden_sections'], stored['hidden_dates'])
+    except Exception as e:
+        logging.error("Export of stored profile %s as %s failed: %s", profile_id, fmt, e, exc_info=True)
+        flash(f"Failed to generate {fmt.upper()}: {str(e)}")
+        return redirect(url_for('list_profiles'))
+    suffix = 'Resume' if fmt == 'pdf' else 'Profile'
+    return send_export(buffer, f"{export_basename(stored['profile'])}_{suffix}.{fmt}")
+
+@app.route('/search')
+def search_profiles():
+    # Boolean skill search over stored profiles, e.g. ?q=Python AND Kubernetes AND NOT Java
+    if not profile_store.PROFILE_STORE_ENABLED:
+        abort(404)
+    query = request.args.get('q', '').strip()
+    limit = min(max(1, request.args.get('limit', profile_store.LIST_PAGE_SIZE, type=int)), skill_index.MAX_RESULTS)
+    offset = max(0, request.args.get('offset', 0, type=int))
+    start = time.perf_counter()
+    try:
+        with observe_stage('skill_search'):
+            total, profile_ids = skill_index.search(query, limit, offset)
+    except skill_index.QueryError as e:
+        return jsonify({'error': str(e)}), 400
+    return jsonify({
+        'query': query,
+        'total': total,
+        'offset': offset,
+        'results': [
+            dict(row, url=url_for('open_profile', profile_id=row['id']))
+            for row in profile_store.summaries(profile_ids)
+        ],
+        'took_ms': round((time.perf_counter() - start) * 1000, 2),
+    })
+
+@app.route('/usage')
+def llm_usage_summary():
+    # Gemini calls, tokens and estimated cost for one UTC day (?day=YYYY-MM-DD, default today)
+    if not llm_usage.LLM_USAGE_ENABLED:
+        abort(404)
+    day = request.args.get('day') or llm_usage.today()
+    if not re.fullmatch(r'\d{4}-\d{2}-\d{2}', day):
+        return jsonify({'error': "day must be YYYY-MM-DD"}), 400
+    return jsonify(llm_usage.summary(day))
+
+@app.route('/match', methods=['POST'])
+def match_profiles():
+    # Ranks stored profiles against a job description (form field or JSON "text")
+    if not profile_store.PROFILE_STORE_ENABLED:
+        abort(404)
+    data = request.get_json(silent=True) or request.form
+    text = (data.get('text') or '').strip()
+    if not text:
+        return jsonify({'error': "No job description provided"}), 400
+    try:
+        limit = max(1, int(data.get('limit') or 10))
+    except (TypeError, ValueError):
+        return jsonify({'error': "limit must be a number"}), 400
+    start = time.perf_counter()
+    try:
+        with observe_stage('jd_match'):
+            ranked = jd_match.rank(text, limit)
+    except jd_match.NotReady as e:
+        return jsonify({'error': str(e)}), 503, {'Retry-After': '5'}
+    rows = {row['id']: row for row in profile_store.summaries([profile_id for profile_id, _, _ in ranked])}
+    return jsonify({
+        'results': [
+            dict(rows[profile_id], score=round(score, 4), matched_terms=terms, url=url_for('open_profile', profile_id=profile_id))
+            for profile_id, score, terms in ranked if profile_id in rows
+        ],
+        'took_ms': round((time.perf_counter() - start) * 1000, 2),
+    })
 
 if __name__ == '__main__':
     port = int(os.environ.get("PORT", 5000))
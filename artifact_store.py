@@ -0,0 +1,82 @@
+import os
+import json
+import time
+import hashlib
+import logging
+import tempfile
+
+# Finished exports keyed by a hash of everything that went into them. Files
+# live under ARTIFACT_DIR so every worker on the host sees the same store;
+# writes go through a temp file and os.replace, so readers never see a
+# partial artifact. Entries older than ARTIFACT_TTL are ignored and swept.
+ARTIFACT_DIR = os.getenv('ARTIFACT_DIR', os.path.join('generated', 'artifacts'))
+ARTIFACT_TTL = float(os.getenv('ARTIFACT_TTL', '1800'))
+PURGE_INTERVAL = 300
+
+_last_purge = 0.0
+
+
+def artifact_key(*parts):
+    payload = json.dumps(parts, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def artifact_path(key, extension):
+    return os.path.join(ARTIFACT_DIR, f"{key}.{extension}")
+
+
+def exists(key, extension):
+    try:
+        return time.time() - os.path.getmtime(artifact_path(key, extension)) < ARTIFACT_TTL
+    except OSError:
+        return False
+
+
+def get(key, extension):
+    # Returns an open binary file or None; the caller closes it
+    if not exists(key, extension):
+        return None
+    try:
+        return open(artifact_path(key, extension), 'rb')
+    except OSError:
+        return None
+
+
+def put(key, extension, source):
+    os.makedirs(ARTIFACT_DIR, exist_ok=True)
+    source.seek(0)
+    fd, temp_path = tempfile.mkstemp(dir=ARTIFACT_DIR, suffix='.part')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            while True:
+                chunk = source.read(1024 * 1024)
+                if not chunk:
+                    break
+                f.write(chunk)
+        os.replace(temp_path, artifact_path(key, extension))
+    except Exception:
+        os.unlink(temp_path)
+        raise
+    purge()
+
+
+def purge(force=False):
+    global _last_purge
+    now = time.time()
+    if not force and now - _last_purge < PURGE_INTERVAL:
+        return
+    _last_purge = now
+    removed = 0
+    try:
+        entries = list(os.scandir(ARTIFACT_DIR))
+    except FileNotFoundError:
+        return
+    for entry in entries:
+        try:
+            if now - entry.stat().st_mtime >= ARTIFACT_TTL:
+                os.remove(entry.path)
+                removed += 1
+        except OSError:
+            continue
+    if removed:
+        logging.info("Removed %d expired artifacts from %s", removed, ARTIFACT_DIR)
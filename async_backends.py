@@ -0,0 +1,152 @@
+import os
+import atexit
+import asyncio
+import logging
+import threading
+import contextvars
+import concurrent.futures
+
+from metrics import CHROMIUM_BROWSERS, CHROMIUM_LAUNCHES
+
+# With ASYNC_BACKENDS=1 Gemini calls and Chromium renders run as coroutines on
+# one event loop thread per process. Request threads hand work to the loop and
+# wait on the result, so with threaded workers (see gunicorn.conf.py) a single
+# process keeps dozens of uploads and exports in flight, bounded per backend
+# by LLM_CONCURRENCY and PDF_CONCURRENCY.
+ASYNC_BACKENDS = os.getenv('ASYNC_BACKENDS', '0') == '1'
+BACKEND_LIMITS = {
+    'llm': int(os.getenv('LLM_CONCURRENCY', '16')),
+    'pdf': int(os.getenv('PDF_CONCURRENCY', '4')),
+}
+BACKEND_TIMEOUT = float(os.getenv('BACKEND_TIMEOUT', '300'))
+
+_loop = None
+_loop_lock = threading.Lock()
+_semaphores = {}
+_browser_lock = None
+_playwright = None
+_browser = None
+
+
+def get_loop():
+    global _loop
+    if _loop is None:
+        with _loop_lock:
+            if _loop is None:
+                loop = asyncio.new_event_loop()
+                threading.Thread(target=loop.run_forever, name='backend-loop', daemon=True).start()
+                _loop = loop
+                logging.info("Started backend event loop (limits: %s)", BACKEND_LIMITS)
+    return _loop
+
+
+async def _in_context(coro, context):
+    return await asyncio.get_running_loop().create_task(coro, context=context)
+
+
+def run(coro, timeout=BACKEND_TIMEOUT):
+    # The coroutine sees the caller's context variables, Flask's request context among them
+    future = asyncio.run_coroutine_threadsafe(_in_context(coro, contextvars.copy_context()), get_loop())
+    try:
+        return future.result(timeout)
+    except concurrent.futures.TimeoutError:
+        future.cancel()
+        raise TimeoutError(f"Backend call did not finish within {timeout:.0f}s")
+
+
+async def _gather(coros):
+    return await asyncio.gather(*coros)
+
+
+def run_all(coros, timeout=BACKEND_TIMEOUT):
+    return run(_gather(coros), timeout)
+
+
+def semaphore(backend):
+    # Only touched from the loop thread, so no lock needed
+    if backend not in _semaphores:
+        _semaphores[backend] = asyncio.Semaphore(BACKEND_LIMITS[backend])
+    return _semaphores[backend]
+
+
+async def generate_content(model, prompt, request_options=None, generation_config=None):
+    async with semaphore('llm'):
+        if os.getenv('GEMINI_TRANSPORT') == 'rest' or not hasattr(model, 'generate_content_async'):
+            # google-generativeai has no async client for the REST transport
+            return await asyncio.to_thread(model.generate_content, prompt, generation_config=generation_config,
+                                           request_options=request_options)
+        return await model.generate_content_async(prompt, generation_config=generation_config, request_options=request_options)
+
+
+async def get_browser():
+    global _browser_lock, _playwright, _browser
+    if _browser_lock is None:
+        _browser_lock = asyncio.Lock()
+    async with _browser_lock:
+        if _browser is not None and not _browser.is_connected():
+            logging.warning("Shared Chromium disconnected, relaunching")
+            CHROMIUM_BROWSERS.labels(state='shared').dec()
+            _browser = None
+        if _browser is None:
+            from playwright.async_api import async_playwright
+            if _playwright is None:
+                _playwright = await async_playwright().start()
+            _browser = await _playwright.chromium.launch(headless=True, timeout=120000)
+            CHROMIUM_LAUNCHES.inc()
+            CHROMIUM_BROWSERS.labels(state='shared').inc()
+            logging.info("Launched shared Chromium")
+    return _browser
+
+
+async def render_pdf(html_string, pdf_options):
+    # One browser per process, one isolated context per render; returns the PDF bytes
+    async with semaphore('pdf'):
+        browser = await get_browser()
+        context = await browser.new_context(viewport={"width": 794, "height": 1123})
+        CHROMIUM_BROWSERS.labels(state='busy').inc()
+        try:
+            page = await context.new_page()
+            await page.set_content(html_string, timeout=120000, wait_until='domcontentloaded')
+            await page.wait_for_load_state('networkidle', timeout=120000)
+            await page.emulate_media(media="print")
+            return await page.pdf(**pdf_options)
+        finally:
+            await context.close()
+            CHROMIUM_BROWSERS.labels(state='busy').dec()
+
+
+async def _close_browser():
+    global _playwright, _browser
+    if _browser is not None:
+        await _browser.close()
+        CHROMIUM_BROWSERS.labels(state='shared').dec()
+        _browser = None
+    if _playwright is not None:
+        await _playwright.stop()
+        _playwright = None
+
+
+def shutdown():
+    if _loop is None:
+        return
+    try:
+        if _browser is not None or _playwright is not None:
+            run(_close_browser(), timeout=10)
+    except Exception as e:
+        logging.warning("Failed to close shared Chromium: %s", e)
+    _loop.call_soon_threadsafe(_loop.stop)
+
+
+def _reset_after_fork():
+    # The loop thread, browser and semaphores belong to the parent
+    global _loop, _loop_lock, _semaphores, _browser_lock, _playwright, _browser
+    _loop = None
+    _loop_lock = threading.Lock()
+    _semaphores = {}
+    _browser_lock = None
+    _playwright = None
+    _browser = None
+
+
+atexit.register(shutdown)
+os.register_at_fork(after_in_child=_reset_after_fork)
@@ -0,0 +1,135 @@
+"""Benchmark response compression per route.
+
+    python benchmarks/bench_compression.py [--iterations 20] [--bandwidth-mbps 10] [--json out.json]
+
+Reports uncompressed vs compressed bytes, the server-side cost of
+compressing, and the estimated transfer time saved at the given bandwidth.
+Gemini is replaced by a stub so the numbers only reflect Flask + templates.
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import statistics
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('GEMINI_API_KEY', 'benchmark-stub')
+
+import app as profile_app
+from stubs import StubModel, load_recorded_responses, load_sample_profile
+
+
+def grammar_payload(profile):
+    return {
+        'name': profile['name'],
+        'total_experience': profile['total_experience'],
+        'professional_summary': profile['professional_summary'],
+        'roles_responsibilities': profile['roles_responsibilities'],
+        'netweb_projects[title][]': [p['title'] for p in profile['netweb_projects']],
+        'netweb_projects[description][]': [p['description'] for p in profile['netweb_projects']],
+        'past_projects[title][]': [p['title'] for p in profile['past_projects']],
+        'past_projects[description][]': [p['description'] for p in profile['past_projects']],
+        'work_experience[]': profile['work_experience'],
+        'personal_details': profile['personal_details'],
+    }
+
+
+def grammar_suggestions(profile):
+    return json.dumps([
+        {
+            'field': f"past_projects[description][{i}]",
+            'field_id': f"past_desc_{i}",
+            'original': project['description'],
+            'suggested': project['description'].replace('.', ';'),
+            'reason': 'Illustrative suggestion returned by the benchmark stub to size a realistic response.'
+        }
+        for i, project in enumerate(profile['past_projects'])
+    ])
+
+
+def build_routes(profile):
+    routes = [
+        ('GET /', 'get', '/', {}),
+        ('GET /edit_profile', 'get', '/edit_profile', {}),
+        ('POST /check_grammar', 'post', '/check_grammar', {'json': grammar_payload(profile)}),
+    ]
+    for design in ['display_profile', 'd1', 'd2', 'd3']:
+        routes.append((f"GET /display_profile [{design}]", 'get', '/display_profile', {'design': design}))
+        routes.append((f"POST /switch_design [{design}]", 'post', '/switch_design', {'data': {'design': design}}))
+    return routes
+
+
+def time_request(client, method, path, kwargs, encoding, iterations):
+    timings = []
+    size = 0
+    for _ in range(iterations):
+        start = time.perf_counter()
+        response = getattr(client, method)(path, headers={'Accept-Encoding': encoding}, **kwargs)
+        body = response.get_data()
+        timings.append((time.perf_counter() - start) * 1000)
+        size = len(body)
+        applied = response.headers.get('Content-Encoding', 'identity')
+        response.close()
+    return statistics.median(timings), size, applied
+
+
+def run(iterations, bandwidth_mbps):
+    profile = load_sample_profile()
+    responses = load_recorded_responses()
+    responses['grammar'] = grammar_suggestions(profile)
+    profile_app.model = StubModel(responses)
+    client = profile_app.app.test_client()
+    bytes_per_ms = bandwidth_mbps * 1_000_000 / 8 / 1000
+
+    results = []
+    for label, method, path, options in build_routes(profile):
+        design = options.pop('design', 'display_profile')
+        with client.session_transaction() as sess:
+            sess['profile'] = profile
+            sess['hidden_sections'] = []
+            sess['hidden_dates'] = []
+            sess['design'] = design
+        time_request(client, method, path, options, 'identity', 1)  # warm template cache
+        raw_ms, raw_bytes, _ = time_request(client, method, path, options, 'identity', iterations)
+        enc_ms, enc_bytes, applied = time_request(client, method, path, options, 'br, gzip', iterations)
+        transfer_saved_ms = (raw_bytes - enc_bytes) / bytes_per_ms
+        results.append({
+            'route': label,
+            'encoding': applied,
+            'raw_bytes': raw_bytes,
+            'compressed_bytes': enc_bytes,
+            'ratio': round(enc_bytes / raw_bytes, 3) if raw_bytes else 1.0,
+            'server_ms_identity': round(raw_ms, 2),
+            'server_ms_compressed': round(enc_ms, 2),
+            'compression_cost_ms': round(enc_ms - raw_ms, 2),
+            'transfer_saved_ms': round(transfer_saved_ms, 2),
+            'net_saved_ms': round(transfer_saved_ms - (enc_ms - raw_ms), 2),
+        })
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--iterations', type=int, default=20)
+    parser.add_argument('--bandwidth-mbps', type=float, default=10.0, help='client link speed used to estimate transfer time')
+    parser.add_argument('--json', dest='json_path', help='write results to this file')
+    args = parser.parse_args()
+
+    profile_app.logging.getLogger().setLevel(profile_app.logging.WARNING)
+    results = run(args.iterations, args.bandwidth_mbps)
+
+    header = f"{'route':38} {'enc':>8} {'raw B':>8} {'comp B':>8} {'ratio':>6} {'cost ms':>8} {'xfer ms':>8} {'net ms':>8}"
+    print(header)
+    print('-' * len(header))
+    for r in results:
+        print(f"{r['route']:38} {r['encoding']:>8} {r['raw_bytes']:>8} {r['compressed_bytes']:>8} {r['ratio']:>6} "
+              f"{r['compression_cost_ms']:>8} {r['transfer_saved_ms']:>8} {r['net_saved_ms']:>8}")
+
+    if args.json_path:
+        with open(args.json_path, 'w', encoding='utf-8') as f:
+            json.dump({'bandwidth_mbps': args.bandwidth_mbps, 'iterations': args.iterations, 'results': results}, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,93 @@
+"""DOCX export benchmark for a typical and a large profile.
+
+    python benchmarks/bench_docx.py [--iterations 30] [--scale 10] [--json docx.json] [--baseline old.json]
+
+The typical profile is benchmarks/sample_profile.json. The large one repeats
+its projects, work experience, education and skills --scale times, which is
+roughly what a senior engineer's long-form profile looks like. Each case is
+rendered into memory once to warm up and then --iterations times.
+"""
+import io
+import os
+import sys
+import json
+import time
+import argparse
+import statistics
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('GEMINI_API_KEY', 'benchmark-stub')
+
+import app as profile_app
+from stubs import load_sample_profile
+
+
+def scale_profile(profile, factor):
+    large = json.loads(json.dumps(profile))
+    for key in ('netweb_projects', 'past_projects', 'work_experience', 'education_training_certifications'):
+        large[key] = [dict(item) for _ in range(factor) for item in profile[key]]
+    large['technical_skills'] = {
+        skill_type: [f"{skill} {i}" if i else skill for i in range(factor) for skill in skills]
+        for skill_type, skills in profile['technical_skills'].items()
+    }
+    return large
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * pct / 100
+    low = int(rank)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+
+def measure(name, profile, iterations):
+    buffer = io.BytesIO()
+    profile_app.render_html_to_docx(profile, buffer)
+    timings = []
+    for _ in range(iterations):
+        buffer = io.BytesIO()
+        start = time.perf_counter()
+        profile_app.render_html_to_docx(profile, buffer)
+        timings.append((time.perf_counter() - start) * 1000)
+    return {
+        'case': name,
+        'runs': iterations,
+        'p50_ms': round(percentile(timings, 50), 2),
+        'p95_ms': round(percentile(timings, 95), 2),
+        'mean_ms': round(statistics.fmean(timings), 2),
+        'size_kb': round(len(buffer.getvalue()) / 1024, 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--iterations', type=int, default=30)
+    parser.add_argument('--scale', type=int, default=10, help='repetition factor for the large profile')
+    parser.add_argument('--json', dest='json_path', help='write results to this file')
+    parser.add_argument('--baseline', help='earlier --json output to compare p50 latency against')
+    args = parser.parse_args()
+
+    profile_app.logging.getLogger().setLevel(profile_app.logging.CRITICAL)
+    typical = profile_app.sanitize_profile_data(load_sample_profile())
+    large = scale_profile(typical, args.scale)
+    results = [measure('typical', typical, args.iterations), measure(f'large_x{args.scale}', large, args.iterations)]
+
+    baseline = {}
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            baseline = {entry['case']: entry for entry in json.load(f)['results']}
+    print(f"{'case':12} {'p50 ms':>9} {'p95 ms':>9} {'size KB':>8} {'base p50':>9} {'delta':>8}")
+    for entry in results:
+        base = baseline.get(entry['case'])
+        delta = f"{(entry['p50_ms'] - base['p50_ms']) / base['p50_ms'] * 100:+.1f}%" if base else ''
+        print(f"{entry['case']:12} {entry['p50_ms']:>9} {entry['p95_ms']:>9} {entry['size_kb']:>8} "
+              f"{base['p50_ms'] if base else '':>9} {delta:>8}")
+
+    if args.json_path:
+        with open(args.json_path, 'w', encoding='utf-8') as f:
+            json.dump({'iterations': args.iterations, 'scale': args.scale, 'results': results}, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,99 @@
+"""Hedged request benchmark: tail latency of grammar calls with and without hedging.
+
+    python benchmarks/bench_hedging.py [--calls 400] [--concurrency 32] [--latency-ms 200] [--sigma 1.0] [--json hedging.json]
+
+Sends --calls grammar checks through app.check_grammar against the in-process
+FakeGenerativeModel (benchmarks/gemini_standin.py), whose latency is
+log-normal with median --latency-ms and spread --sigma, from --concurrency
+threads. The run is repeated with hedging off and on (sync gateway, then
+the async one), printing latency percentiles and how many extra Gemini
+calls the hedges cost.
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import statistics
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('GEMINI_API_KEY', 'benchmark-stub')
+os.environ.setdefault('LLM_RATE_PER_MINUTE', '0')
+
+import app as profile_app
+import async_backends
+import llm_gateway
+import llm_routing
+from gemini_standin import FakeGenerativeModel, FaultProfile
+
+FIELDS = {'professional_summary': 'Led a team of five enginers to migrate the billing platform.'}
+
+
+class CountingModel(FakeGenerativeModel):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.calls = 0
+
+    def generate_content(self, contents, **kwargs):
+        self.calls += 1
+        return super().generate_content(contents, **kwargs)
+
+    async def generate_content_async(self, contents, **kwargs):
+        self.calls += 1
+        return await super().generate_content_async(contents, **kwargs)
+
+
+def percentile(values, fraction):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(fraction * len(values)))]
+
+
+def run(label, hedge, use_async, args):
+    llm_routing.settings('grammar').hedge = hedge
+    async_backends.ASYNC_BACKENDS = use_async
+    llm_gateway._latencies.clear()
+    llm_gateway._hedged.clear()
+    model = CountingModel(faults=FaultProfile(latency_ms=args.latency_ms, latency_sigma=args.sigma, seed=7))
+    profile_app.model = model
+
+    def one(_):
+        start = time.perf_counter()
+        profile_app.check_grammar(FIELDS)
+        return time.perf_counter() - start
+
+    with ThreadPoolExecutor(args.concurrency) as pool:
+        latencies = list(pool.map(one, range(args.calls)))
+    ms = [latency * 1000 for latency in latencies]
+    entry = {
+        'run': label, 'p50_ms': round(percentile(ms, 0.5), 1), 'p95_ms': round(percentile(ms, 0.95), 1),
+        'p99_ms': round(percentile(ms, 0.99), 1), 'max_ms': round(max(ms), 1), 'mean_ms': round(statistics.mean(ms), 1),
+        'extra_calls': round(model.calls / args.calls - 1, 3),
+    }
+    print(f"{label:14} {entry['p50_ms']:>8} {entry['p95_ms']:>8} {entry['p99_ms']:>8} {entry['max_ms']:>8} {entry['extra_calls']:>7.1%}")
+    return entry
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--calls', type=int, default=400)
+    parser.add_argument('--concurrency', type=int, default=32)
+    parser.add_argument('--latency-ms', type=float, default=200)
+    parser.add_argument('--sigma', type=float, default=1.0)
+    parser.add_argument('--json', dest='json_path', help='write results to this file')
+    args = parser.parse_args()
+    profile_app.logging.getLogger().setLevel(profile_app.logging.CRITICAL)
+
+    print(f"{'run':14} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'max ms':>8} {'extra':>7}")
+    results = [
+        run('no hedge', False, False, args),
+        run('hedge', True, False, args),
+        run('hedge async', True, True, args),
+    ]
+    if args.json_path:
+        with open(args.json_path, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
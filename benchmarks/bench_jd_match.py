@@ -0,0 +1,130 @@
+"""Job-description matching benchmark: matrix build, ranking latency and incremental saves.
+
+    python benchmarks/bench_jd_match.py [--profiles 50000] [--json match.json]
+
+Stores --profiles variants of the sample profile in a scratch profile store.
+Each variant keeps the sample's structure but draws its skills, summary and
+project text from shuffled vocabularies, so term statistics look like a real
+pool rather than 50k copies. The harness then times a cold build, ranking a
+few job descriptions (checking the top result against a dense numpy
+computation of the same cosine scores), and re-saving profiles through the
+delta matrix, including one compaction.
+"""
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ['PROFILE_STORE_PATH'] = os.path.join(tempfile.mkdtemp(prefix='bench-match-'), 'profiles.db')
+
+import numpy as np
+
+import profile_store
+import jd_match
+from stubs import load_sample_profile
+
+SKILLS = [
+    'Python', 'Java', 'Go', 'Rust', 'C++', 'C#', 'JavaScript', 'TypeScript', 'Kubernetes', 'Docker', 'Terraform',
+    'Ansible', 'Jenkins', 'GitLab CI', 'AWS', 'Azure', 'GCP', 'PostgreSQL', 'MySQL', 'MongoDB', 'Redis', 'Kafka',
+    'Spark', 'Hadoop', 'Airflow', 'React', 'Angular', 'Vue', 'Node.js', 'Spring Boot', 'Django', 'Flask', 'FastAPI',
+    'Nginx', 'Apache HTTP Server', 'Prometheus', 'Grafana', 'Slurm', 'OpenStack', 'VMware', 'Linux', 'Bash',
+] + [f'Tool{i}' for i in range(300)]
+WORDS = ('designed built migrated automated operated optimized led reviewed provisioned monitored secured scaled '
+         'cluster pipeline service platform storage network gpu hpc cloud data api billing payments analytics '
+         'dashboard latency throughput cost availability deployment release backup recovery compliance audit').split()
+JOB_DESCRIPTIONS = [
+    "We need a platform engineer with Kubernetes, Terraform and AWS experience to scale our GPU cluster.",
+    "Backend developer: Java, Spring Boot, Kafka and PostgreSQL for a payments service with strict latency targets.",
+    "Data engineer to build Airflow and Spark pipelines on GCP, with Python and strong SQL.",
+    "HPC administrator with Slurm, Linux and Ansible to operate a 512-node cluster.",
+]
+
+
+def populate(count, seed=1):
+    rng = random.Random(seed)
+    sample = load_sample_profile()
+    conn = profile_store.connection()
+    conn.execute('PRAGMA synchronous=OFF')
+    for i in range(count):
+        profile_store.save(variant(sample, rng, i), [], [], 'display_profile', 'benchmark')
+
+
+def variant(sample, rng, i):
+    def sentence():
+        return ' '.join(rng.sample(WORDS, 8) + rng.sample(SKILLS, 2))
+
+    profile = dict(sample, name=f"Candidate {i}", personal_details={'employee_id': f"M{i:06d}", 'designation': rng.choice(WORDS)})
+    profile['technical_skills'] = {'tools': rng.sample(SKILLS, rng.randint(4, 14))}
+    profile['professional_summary'] = ''.join(f"<li>{sentence()}</li>" for _ in range(3))
+    profile['netweb_projects'] = [{'title': sentence(), 'description': sentence()} for _ in range(rng.randint(1, 3))]
+    profile['past_projects'] = []
+    return profile
+
+
+def dense_best(text):
+    # Same scores computed densely, for the top result only
+    counts = jd_match.query_counts(text)
+    columns, values = jd_match.encode_row(counts, grow=False)
+    df = np.asarray(jd_match._df, dtype=np.float64)
+    idf = np.log((1 + len(jd_match._where)) / (1 + df)) + 1
+    query = np.zeros(len(idf))
+    query[columns] = 1 + np.log(values)
+    query *= idf
+    query /= np.linalg.norm(query)
+    tfidf = jd_match._base.toarray().astype(np.float64) * idf
+    scores = tfidf @ query / np.maximum(np.linalg.norm(tfidf, axis=1), 1e-12)
+    return int(jd_match._base_ids[int(np.argmax(scores))])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--profiles', type=int, default=50000)
+    parser.add_argument('--repeat', type=int, default=20)
+    parser.add_argument('--json', dest='json_path', help='write results to this file')
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    populate(args.profiles)
+    print(f"stored {args.profiles} profiles in {time.perf_counter() - start:.1f}s")
+
+    start = time.perf_counter()
+    jd_match.build()
+    build_seconds = time.perf_counter() - start
+    jd_match.REFRESH_INTERVAL = float('inf')
+    print(f"build {build_seconds:.2f}s; {len(jd_match._terms)} terms, {jd_match._base.nnz} entries")
+    results = {'profiles': args.profiles, 'build_seconds': round(build_seconds, 2), 'queries': []}
+
+    check_dense = args.profiles <= 20000
+    for text in JOB_DESCRIPTIONS:
+        start = time.perf_counter()
+        for _ in range(args.repeat):
+            ranked = jd_match.rank(text, 10)
+        elapsed_ms = (time.perf_counter() - start) * 1000 / args.repeat
+        agrees = dense_best(text) == ranked[0][0] if check_dense else None
+        results['queries'].append({'text': text, 'ms': round(elapsed_ms, 2), 'top': ranked[0][:2], 'dense_agrees': agrees})
+        print(f"{elapsed_ms:7.2f} ms  top={ranked[0][0]} score={ranked[0][1]:.3f} terms={ranked[0][2]} dense_agrees={agrees}  {text[:50]}")
+
+    rng = random.Random(2)
+    sample = load_sample_profile()
+    start = time.perf_counter()
+    for i in range(jd_match.COMPACT_ROWS):
+        jd_match.update(rng.randint(1, args.profiles), variant(sample, rng, i))
+    update_seconds = time.perf_counter() - start
+    start = time.perf_counter()
+    jd_match.rank(JOB_DESCRIPTIONS[0], 10)
+    after_ms = (time.perf_counter() - start) * 1000
+    results.update(update_ms=round(update_seconds * 1000 / jd_match.COMPACT_ROWS, 3), rank_after_updates_ms=round(after_ms, 2))
+    print(f"\n{jd_match.COMPACT_ROWS} incremental saves (one compaction): {update_seconds * 1000 / jd_match.COMPACT_ROWS:.2f} ms each; "
+          f"next rank {after_ms:.1f} ms")
+
+    if args.json_path:
+        with open(args.json_path, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,128 @@
+"""JSON salvage benchmark: how much of a damaged Gemini response survives parsing.
+
+    python benchmarks/bench_json_salvage.py [--cuts 50] [--json salvage.json]
+
+Starts from the recorded structured_data response and damages it two ways:
+
+    truncated  the response cut at --cuts evenly spaced points, as when the
+               output token limit is hit
+    defects    one common defect each: prose around the JSON, trailing
+               commas, a missing comma, raw newlines in strings, Python
+               literals, single quotes, an unescaped inner quote
+
+Each damaged text is parsed by the strict extractor the app used before
+(fenced block or bare json.loads, {} on error) and by app.extract_json. The
+score is the share of the intended leaf values recovered unchanged.
+Parse times are per call.
+"""
+import os
+import re
+import sys
+import json
+import time
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('GEMINI_API_KEY', 'benchmark-stub')
+
+import app as profile_app
+from stubs import load_recorded_responses
+
+
+def strict_extract(text):
+    try:
+        if "```json" in text:
+            match = re.findall(r"```json(.*?)```", text, re.DOTALL)
+            if match:
+                return json.loads(match[0].strip())
+        return json.loads(text)
+    except Exception:
+        return {}
+
+
+def leaves(value, path=()):
+    if isinstance(value, dict):
+        for key, item in value.items():
+            yield from leaves(item, path + (key,))
+    elif isinstance(value, list):
+        for i, item in enumerate(value):
+            yield from leaves(item, path + (i,))
+    else:
+        yield path, value
+
+
+def recovered(parsed, expected):
+    got = dict(leaves(parsed))
+    wanted = list(leaves(expected))
+    return sum(got.get(path, object()) == value for path, value in wanted) / len(wanted)
+
+
+def defects(document):
+    # (damaged text, the value it was meant to encode) per defect
+    text = json.dumps(document, indent=2)
+    quoted = json.loads(json.dumps(document).replace('Anna University', 'Anna \\"Tech\\" University'))
+    multiline = json.loads(json.dumps(document).replace('. ', '.\\n'))
+    literals = dict(document, verified=True, notes=None)
+    return {
+        'prose': (f"Sure! Here is the structured profile:\n{text}\nLet me know if you need anything else.", document),
+        'trailing_commas': (re.sub(r'(["\]}])(\n\s*[\]}])', r'\1,\2', text), document),
+        'missing_comma': (text.replace('],\n  "total_experience"', ']\n  "total_experience"', 1), document),
+        'raw_newlines': (json.dumps(multiline, indent=2).replace('\\n', '\n'), multiline),
+        'python_literals': (json.dumps(literals, indent=2).replace('true', 'True').replace('null', 'None'), literals),
+        'single_quotes': (text.replace('"total_experience"', "'total_experience'", 1), document),
+        'inner_quote': (json.dumps(quoted, indent=2).replace('\\"Tech\\"', '"Tech"'), quoted),
+    }
+
+
+def timed(function, text, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = function(text)
+    return result, (time.perf_counter() - start) * 1e6 / repeat
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--cuts', type=int, default=50)
+    parser.add_argument('--repeat', type=int, default=200)
+    parser.add_argument('--json', dest='json_path', help='write results to this file')
+    args = parser.parse_args()
+    profile_app.logging.getLogger().setLevel(profile_app.logging.CRITICAL)
+
+    response = load_recorded_responses()['structured_data']
+    expected = strict_extract(response)
+    results = {'truncated': [], 'defects': []}
+
+    strict_total = salvage_total = 0.0
+    for i in range(1, args.cuts + 1):
+        cut = response[:len(response) * i // (args.cuts + 1)]
+        strict = recovered(strict_extract(cut), expected)
+        salvaged = recovered(profile_app.extract_json(cut, 'benchmark'), expected)
+        strict_total += strict
+        salvage_total += salvaged
+        results['truncated'].append({'chars': len(cut), 'strict': round(strict, 3), 'salvage': round(salvaged, 3)})
+    print(f"truncated at {args.cuts} points: strict recovers {strict_total / args.cuts:.1%} of leaf values on average, "
+          f"salvage {salvage_total / args.cuts:.1%} (the cut keeps {sum(i / (args.cuts + 1) for i in range(1, args.cuts + 1)) / args.cuts:.1%} of the text)")
+
+    print(f"\n{'defect':18} {'strict':>7} {'salvage':>8} {'strict us':>10} {'salvage us':>11}")
+    for name, (text, intended) in defects(expected).items():
+        assert text != json.dumps(intended, indent=2), name
+        strict, strict_us = timed(strict_extract, text, args.repeat)
+        salvaged, salvage_us = timed(lambda t: profile_app.extract_json(t, 'benchmark'), text, args.repeat)
+        entry = {'defect': name, 'strict': round(recovered(strict, intended), 3), 'salvage': round(recovered(salvaged, intended), 3),
+                 'strict_us': round(strict_us, 1), 'salvage_us': round(salvage_us, 1)}
+        results['defects'].append(entry)
+        print(f"{name:18} {entry['strict']:>7} {entry['salvage']:>8} {strict_us:>10.0f} {salvage_us:>11.0f}")
+
+    _, clean_us = timed(lambda t: profile_app.extract_json(t, 'benchmark'), response, args.repeat)
+    _, reader_us = timed(profile_app.json_salvage.parse, response, args.repeat)
+    results.update(clean_us=round(clean_us, 1), salvage_reader_us=round(reader_us, 1))
+    print(f"\nclean {len(response)}-char response: extract_json {clean_us:.0f} us; tolerant reader alone {reader_us:.0f} us")
+
+    if args.json_path:
+        with open(args.json_path, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,121 @@
+"""Gemini client benchmark: connections opened and call latency, SDK clients vs the pooled client layer.
+
+    python benchmarks/bench_llm_client.py [--calls 600] [--concurrency 32] [--latency-ms 50] [--connect-ms 30] [--json client.json]
+
+Starts the REST stand-in (benchmarks/gemini_standin.py) on a local port and
+points the app at it with GEMINI_TRANSPORT=rest and GEMINI_API_ENDPOINT.
+Every new connection waits --connect-ms before its first request is read,
+standing in for the DNS lookup and TCP and TLS handshakes of a real
+endpoint. --calls bullet point requests go through app.llm_generate from
+--concurrency threads, after 2 x --concurrency warm-up calls, with:
+
+    sdk       the SDK's default clients (LLM_CLIENT_POOL=0)
+    no reuse  llm_client.py's session sending Connection: close, i.e. a
+              new connection for every call
+    pooled    llm_client.py's pooled keep-alive session
+
+The stand-in counts the connections it accepts over the whole run, warm-up
+included; latency percentiles are per measured call.
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from gemini_standin import FaultProfile, make_server
+
+
+def start_standin(latency_ms, connect_ms):
+    server = make_server(port=0, faults=FaultProfile(latency_ms=latency_ms, latency_sigma=0.3, seed=3))
+    server.connections = 0
+    server.connections_lock = threading.Lock()
+    # socketserver listens with a backlog of 5; a cold burst of --concurrency connects would be reset
+    server.socket.listen(1024)
+    finish = server.finish_request
+
+    def handshake(request, client_address):
+        # Runs on the connection's own thread, before its first request is read
+        with server.connections_lock:
+            server.connections += 1
+        time.sleep(connect_ms / 1000)
+        finish(request, client_address)
+
+    server.finish_request = handshake
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def percentile(values, fraction):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(fraction * len(values)))]
+
+
+def run(label, pooled, keep_alive, args, server, profile_app):
+    profile_app.llm_client.LLM_CLIENT_POOL = pooled
+    profile_app.llm_client._pools.clear()
+    profile_app.models.clear()
+    if pooled:
+        client = profile_app.llm_client.pick(os.environ['GEMINI_API_KEY'], False)[1]
+        if not keep_alive:
+            client._transport._session.headers['Connection'] = 'close'
+
+    def one(i):
+        start = time.perf_counter()
+        profile_app.llm_generate(f"Convert the following text into concise bullet points. Call {i}", 'bullet_points')
+        return time.perf_counter() - start
+
+    connections = server.connections
+    with ThreadPoolExecutor(args.concurrency) as pool:
+        list(pool.map(one, range(args.concurrency * 2)))
+        start = time.perf_counter()
+        ms = [seconds * 1000 for seconds in pool.map(one, range(args.calls))]
+        wall = time.perf_counter() - start
+    opened = server.connections - connections
+    entry = {
+        'run': label, 'connections': opened, 'calls_per_connection': round((args.calls + args.concurrency * 2) / max(1, opened), 1),
+        'p50_ms': round(percentile(ms, 0.5), 1), 'p95_ms': round(percentile(ms, 0.95), 1),
+        'p99_ms': round(percentile(ms, 0.99), 1), 'calls_per_second': round(args.calls / wall, 1),
+    }
+    print(f"{label:10} {opened:>11} {entry['calls_per_connection']:>10} {entry['p50_ms']:>8} {entry['p95_ms']:>8} "
+          f"{entry['p99_ms']:>8} {entry['calls_per_second']:>8}")
+    return entry
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--calls', type=int, default=600)
+    parser.add_argument('--concurrency', type=int, default=32)
+    parser.add_argument('--latency-ms', type=float, default=50)
+    parser.add_argument('--connect-ms', type=float, default=30)
+    parser.add_argument('--pool-size', type=int, default=32)
+    parser.add_argument('--json', dest='json_path', help='write results to this file')
+    args = parser.parse_args()
+
+    server = start_standin(args.latency_ms, args.connect_ms)
+    os.environ.update({
+        'GEMINI_API_KEY': 'benchmark-stub', 'GEMINI_TRANSPORT': 'rest',
+        'GEMINI_API_ENDPOINT': f"http://127.0.0.1:{server.server_address[1]}",
+        'LLM_POOL_SIZE': str(args.pool_size), 'LLM_RATE_PER_MINUTE': '0', 'LLM_USAGE': '0', 'LLM_HEDGE_BULLET_POINTS': '0',
+    })
+    import app as profile_app
+    profile_app.logging.getLogger().setLevel(profile_app.logging.CRITICAL)
+
+    print(f"{'client':10} {'connections':>11} {'calls/conn':>10} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'calls/s':>8}")
+    results = [
+        run('sdk', False, True, args, server, profile_app),
+        run('no reuse', True, False, args, server, profile_app),
+        run('pooled', True, True, args, server, profile_app),
+    ]
+    server.shutdown()
+    if args.json_path:
+        with open(args.json_path, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,183 @@
+"""PDF renderer benchmark: Chromium (Playwright) vs WeasyPrint for every design.
+
+    python benchmarks/bench_pdf.py [--iterations 5] [--renderers chromium,weasyprint] [--out pdf-out] [--json pdf.json]
+
+Each (renderer, design) pair runs in a fresh child process that renders the
+sample profile's HTML once to warm up and then --iterations times. The parent
+samples the RSS of the child and all its descendants from /proc, so Chromium's
+browser processes are counted too (Linux only).
+
+Fidelity is reported per PDF as page count plus two text checks (pdfplumber):
+  html_coverage  share of the words visible in the HTML that appear in the PDF
+  vs_reference   word-sequence similarity to the first renderer's PDF
+Text checks miss layout differences, so the PDFs are kept in --out for a look.
+"""
+import os
+import sys
+import json
+import time
+import difflib
+import argparse
+import subprocess
+
+BENCHMARKS_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_DIR = os.path.dirname(BENCHMARKS_DIR)
+sys.path.insert(0, BENCHMARKS_DIR)
+
+DESIGNS = ['display_profile', 'd1', 'd2', 'd3']
+RSS_SAMPLE_INTERVAL = 0.01
+NON_VISIBLE_TAGS = ['script', 'style', 'form', 'button', 'noscript', 'head']
+# Editor controls the designs hide under @media print
+PRINT_HIDDEN_CLASSES = ['control-panel', 'download-section', 'design-switcher', 'hide-toggle', 'dates-toggle']
+
+
+def run_worker(renderer, design, iterations, output_path):
+    sys.path.insert(0, REPO_DIR)
+    os.environ.setdefault('GEMINI_API_KEY', 'benchmark-stub')
+    import app as profile_app
+    from stubs import load_sample_profile
+
+    profile_app.logging.getLogger().setLevel(profile_app.logging.WARNING)
+    safe_profile = profile_app.sanitize_profile_data(load_sample_profile())
+    with profile_app.app.test_request_context():
+        html = profile_app.render_template(
+            f"{design}.html", profile=safe_profile, hidden_sections=[], hidden_dates=[], inline_assets=True
+        )
+    timings = []
+    try:
+        profile_app.render_html_to_pdf(html, output_path, renderer=renderer)
+        for _ in range(iterations):
+            start = time.perf_counter()
+            profile_app.render_html_to_pdf(html, output_path, renderer=renderer)
+            timings.append((time.perf_counter() - start) * 1000)
+        result = {'timings_ms': timings}
+    except Exception as e:
+        result = {'timings_ms': timings, 'error': str(e).splitlines()[0]}
+    with open(output_path + '.html', 'w', encoding='utf-8') as f:
+        f.write(html)
+    print(json.dumps(result))
+
+
+def tree_rss_bytes(root_pid):
+    parents = {}
+    for entry in os.listdir('/proc'):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f'/proc/{entry}/stat', 'r') as f:
+                parents[int(entry)] = int(f.read().rsplit(')', 1)[1].split()[1])
+        except (OSError, ValueError, IndexError):
+            continue
+    pids = {root_pid}
+    changed = True
+    while changed:
+        children = {pid for pid, ppid in parents.items() if ppid in pids} - pids
+        changed = bool(children)
+        pids |= children
+    total = 0
+    for pid in pids:
+        try:
+            with open(f'/proc/{pid}/statm', 'r') as f:
+                total += int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+        except (OSError, ValueError):
+            continue
+    return total
+
+
+def measure(renderer, design, iterations, output_path):
+    command = [sys.executable, os.path.abspath(__file__), '--worker', renderer, design, str(iterations), output_path]
+    process = subprocess.Popen(command, cwd=REPO_DIR, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True)
+    peak = 0
+    while process.poll() is None:
+        if os.path.exists('/proc'):
+            peak = max(peak, tree_rss_bytes(process.pid))
+        time.sleep(RSS_SAMPLE_INTERVAL)
+    output = process.stdout.read().strip().splitlines()
+    result = json.loads(output[-1]) if output else {'timings_ms': [], 'error': f'worker exited with {process.returncode}'}
+    result['peak_tree_rss_mb'] = round(peak / 2**20, 1) if peak else None
+    return result
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * pct / 100
+    low = int(rank)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+
+def html_words(html_path):
+    import lxml.html
+    with open(html_path, 'r', encoding='utf-8') as f:
+        root = lxml.html.fromstring(f.read())
+    hidden = [element for tag in NON_VISIBLE_TAGS for element in root.iter(tag)]
+    for class_name in PRINT_HIDDEN_CLASSES:
+        hidden += root.xpath(f'//*[contains(concat(" ", normalize-space(@class), " "), " {class_name} ")]')
+    for element in hidden:
+        if element.getparent() is not None:
+            element.drop_tree()
+    return root.text_content().split()
+
+
+def pdf_fidelity(pdf_path):
+    import pdfplumber
+    with pdfplumber.open(pdf_path) as pdf:
+        text = '\n'.join(page.extract_text() or '' for page in pdf.pages)
+        return len(pdf.pages), text.split()
+
+
+def coverage(expected, actual):
+    actual_set = set(actual)
+    return sum(1 for word in expected if word in actual_set) / len(expected) if expected else 1.0
+
+
+def main():
+    if len(sys.argv) > 1 and sys.argv[1] == '--worker':
+        run_worker(sys.argv[2], sys.argv[3], int(sys.argv[4]), sys.argv[5])
+        return
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--iterations', type=int, default=5)
+    parser.add_argument('--renderers', default='chromium,weasyprint', help='first one is the fidelity reference')
+    parser.add_argument('--designs', default=','.join(DESIGNS))
+    parser.add_argument('--out', default='pdf-bench-out', help='directory for the rendered PDFs')
+    parser.add_argument('--json', dest='json_path', help='write results to this file')
+    args = parser.parse_args()
+
+    renderers = [r.strip() for r in args.renderers.split(',') if r.strip()]
+    os.makedirs(args.out, exist_ok=True)
+    results = []
+    references = {}
+    print(f"{'design':16} {'renderer':11} {'p50 ms':>9} {'p95 ms':>9} {'peak RSS MB':>12} {'pages':>6} {'html cov':>9} {'vs ref':>7}")
+    for design in [d.strip() for d in args.designs.split(',') if d.strip()]:
+        for renderer in renderers:
+            output_path = os.path.abspath(os.path.join(args.out, f"{design}-{renderer}.pdf"))
+            entry = {'design': design, 'renderer': renderer}
+            entry.update(measure(renderer, design, args.iterations, output_path))
+            timings = entry.pop('timings_ms')
+            if timings:
+                entry['p50_ms'] = round(percentile(timings, 50), 1)
+                entry['p95_ms'] = round(percentile(timings, 95), 1)
+            if 'error' not in entry and os.path.exists(output_path):
+                pages, words = pdf_fidelity(output_path)
+                entry['pages'] = pages
+                entry['html_coverage'] = round(coverage(html_words(output_path + '.html'), words), 3)
+                if design in references:
+                    entry['vs_reference'] = round(difflib.SequenceMatcher(None, references[design], words, autojunk=False).ratio(), 3)
+                else:
+                    references[design] = words
+            results.append(entry)
+            if 'error' in entry:
+                print(f"{design:16} {renderer:11} ERROR {entry['error'][:90]}")
+            else:
+                print(f"{design:16} {renderer:11} {entry.get('p50_ms', '-'):>9} {entry.get('p95_ms', '-'):>9} "
+                      f"{entry['peak_tree_rss_mb'] or '-':>12} {entry.get('pages', '-'):>6} "
+                      f"{entry.get('html_coverage', '-'):>9} {entry.get('vs_reference', '-'):>7}")
+
+    if args.json_path:
+        with open(args.json_path, 'w', encoding='utf-8') as f:
+            json.dump({'iterations': args.iterations, 'results': results}, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
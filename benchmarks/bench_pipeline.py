@@ -0,0 +1,212 @@
+"""End-to-end pipeline benchmark over the resumes in 'test profile/'.
+
+    python benchmarks/bench_pipeline.py [--iterations 10] [--skip pdf] [--json results.json] [--baseline old.json]
+
+Gemini is replaced by StubModel replaying benchmarks/recorded_responses.json,
+so the numbers cover only local work: text extraction, cleaning, prompt
+building and parsing, sanitizing, template rendering and the exporters.
+
+For each stage the harness reports p50/p95 latency and the peak RSS seen
+while the stage ran (sampled from /proc, so Linux only; elsewhere the
+process high-water mark is reported). Chromium runs in child processes,
+so its memory shows up under children_maxrss_mb instead.
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import platform
+import resource
+import tempfile
+import threading
+import statistics
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('GEMINI_API_KEY', 'benchmark-stub')
+# The stub answers instantly; the Gemini rate limiter would only add token bucket sleeps
+os.environ.setdefault('LLM_RATE_PER_MINUTE', '0')
+
+import app as profile_app
+from stubs import StubModel, load_sample_profile, sample_files
+
+DESIGNS = ['display_profile', 'd1', 'd2', 'd3']
+RSS_SAMPLE_INTERVAL = 0.002
+
+
+def current_rss_bytes():
+    try:
+        with open('/proc/self/statm', 'r') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError):
+        return maxrss_bytes(resource.RUSAGE_SELF)
+
+
+def maxrss_bytes(who):
+    maxrss = resource.getrusage(who).ru_maxrss
+    # ru_maxrss is kilobytes on Linux and bytes on macOS
+    return maxrss if platform.system() == 'Darwin' else maxrss * 1024
+
+
+class PeakRssSampler:
+    def __init__(self):
+        self.peak = 0
+        self._stop = threading.Event()
+        self._thread = None
+
+    def __enter__(self):
+        self.peak = current_rss_bytes()
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        return self
+
+    def _run(self):
+        while not self._stop.wait(RSS_SAMPLE_INTERVAL):
+            self.peak = max(self.peak, current_rss_bytes())
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+        self.peak = max(self.peak, current_rss_bytes())
+        return False
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    if len(ordered) == 1:
+        return ordered[0]
+    rank = (len(ordered) - 1) * pct / 100
+    low = int(rank)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+
+def measure(stage, iterations, func, results):
+    timings = []
+    error = None
+    try:
+        func()  # warm-up: template compilation, lazy imports, first-touch caches
+    except Exception as e:
+        error = f"{type(e).__name__}: {str(e).splitlines()[0] if str(e) else ''}"
+    with PeakRssSampler() as sampler:
+        for _ in range(0 if error else iterations):
+            start = time.perf_counter()
+            try:
+                func()
+            except Exception as e:
+                error = f"{type(e).__name__}: {str(e).splitlines()[0] if str(e) else ''}"
+                break
+            timings.append((time.perf_counter() - start) * 1000)
+    entry = {'stage': stage, 'runs': len(timings), 'peak_rss_mb': round(sampler.peak / 2**20, 1)}
+    if timings:
+        entry.update({
+            'p50_ms': round(percentile(timings, 50), 3),
+            'p95_ms': round(percentile(timings, 95), 3),
+            'mean_ms': round(statistics.fmean(timings), 3),
+        })
+    if error:
+        entry['error'] = error
+    results.append(entry)
+    return entry
+
+
+def run(iterations, skip):
+    model = StubModel()
+    profile_app.model = model
+    results = []
+    texts = {}
+    flask_app = profile_app.app
+
+    for path, ext in sample_files():
+        name = os.path.basename(path)
+        measure(f"extract_text[{name}]", iterations, lambda: texts.__setitem__(name, profile_app.extract_text(path, ext)), results)
+
+    cleaned = {}
+    for name, text in texts.items():
+        measure(f"clean_formatting[{name}]", iterations, lambda: cleaned.__setitem__(name, profile_app.clean_formatting(text)), results)
+
+    structured = {}
+    for name, text in cleaned.items():
+        measure(f"generate_structured_data[{name}]", iterations, lambda: structured.__setitem__(name, profile_app.generate_structured_data(text)), results)
+
+    profile = load_sample_profile()
+    parsed = next(iter(structured.values()), profile)
+    measure('sanitize_profile_data[parsed]', iterations, lambda: profile_app.sanitize_profile_data(parsed), results)
+    measure('sanitize_profile_data[sample]', iterations, lambda: profile_app.sanitize_profile_data(profile), results)
+    safe_profile = profile_app.sanitize_profile_data(profile)
+
+    html_by_design = {}
+    with flask_app.test_request_context():
+        for design in DESIGNS:
+            def render(design=design):
+                html_by_design[design] = profile_app.render_template(
+                    f"{design}.html", profile=safe_profile, hidden_sections=[], hidden_dates=[], inline_assets=True
+                )
+            measure(f"render_template[{design}]", iterations, render, results)
+
+    with tempfile.TemporaryDirectory() as workdir:
+        if 'pdf' not in skip:
+            for design in DESIGNS:
+                output_path = os.path.join(workdir, f"{design}.pdf")
+                measure(f"export_pdf[{design}]", iterations, lambda: profile_app.render_html_to_pdf(html_by_design[design], output_path), results)
+        if 'docx' not in skip:
+            output_path = os.path.join(workdir, 'profile.docx')
+            measure('export_docx', iterations, lambda: profile_app.render_html_to_docx(safe_profile, output_path), results)
+        if 'xlsx' not in skip:
+            output_path = os.path.join(workdir, 'profile.xlsx')
+            measure('export_xlsx', iterations, lambda: profile_app.render_html_to_xlsx(safe_profile, output_path), results)
+
+    return results, model.calls
+
+
+def compare(results, baseline_path):
+    with open(baseline_path, 'r', encoding='utf-8') as f:
+        baseline = {entry['stage']: entry for entry in json.load(f)['results']}
+    print(f"\n{'stage':52} {'base p50':>10} {'p50':>10} {'delta':>8}")
+    for entry in results:
+        base = baseline.get(entry['stage'])
+        if not base or 'p50_ms' not in base or 'p50_ms' not in entry:
+            continue
+        delta = (entry['p50_ms'] - base['p50_ms']) / base['p50_ms'] * 100 if base['p50_ms'] else 0.0
+        print(f"{entry['stage']:52} {base['p50_ms']:>10} {entry['p50_ms']:>10} {delta:>+7.1f}%")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--iterations', type=int, default=10)
+    parser.add_argument('--skip', action='append', default=[], choices=['pdf', 'docx', 'xlsx'], help='exporter to skip (repeatable)')
+    parser.add_argument('--json', dest='json_path', help='write results to this file')
+    parser.add_argument('--baseline', help='earlier --json output to compare p50 latency against')
+    args = parser.parse_args()
+
+    profile_app.logging.getLogger().setLevel(profile_app.logging.WARNING)
+    results, llm_calls = run(args.iterations, set(args.skip))
+
+    header = f"{'stage':52} {'runs':>5} {'p50 ms':>10} {'p95 ms':>10} {'peak RSS MB':>12}"
+    print(header)
+    print('-' * len(header))
+    for entry in results:
+        if 'error' in entry:
+            print(f"{entry['stage']:52} {entry['runs']:>5} ERROR {entry['error']}")
+        else:
+            print(f"{entry['stage']:52} {entry['runs']:>5} {entry['p50_ms']:>10} {entry['p95_ms']:>10} {entry['peak_rss_mb']:>12}")
+    children_maxrss_mb = round(maxrss_bytes(resource.RUSAGE_CHILDREN) / 2**20, 1)
+    print(f"\nStub LLM calls: {llm_calls}  children_maxrss_mb: {children_maxrss_mb}")
+
+    if args.json_path:
+        with open(args.json_path, 'w', encoding='utf-8') as f:
+            json.dump({
+                'python': platform.python_version(),
+                'platform': platform.platform(),
+                'iterations': args.iterations,
+                'children_maxrss_mb': children_maxrss_mb,
+                'llm_calls': llm_calls,
+                'results': results,
+            }, f, indent=2)
+    if args.baseline:
+        compare(results, args.baseline)
+
+
+if __name__ == '__main__':
+    main()
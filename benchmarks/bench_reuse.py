@@ -0,0 +1,102 @@
+"""Near-duplicate reuse benchmark: MinHash accuracy and parse time for revised resumes.
+
+    python benchmarks/bench_reuse.py [--latency 0.5] [--json reuse.json]
+
+Every resume in 'test profile/' is parsed into a fresh index, then three
+variants are parsed again: the identical text, a revision with a new phone
+number and one with an extra bullet. For each pair the harness prints the
+MinHash estimate next to the exact shingle Jaccard similarity, which path
+parse_resume took, how many Gemini calls it made (StubModel sleeping
+--latency seconds per call) and the wall time. Cross-resume similarities
+are listed too, to show how far apart different candidates are.
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import tempfile
+import itertools
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('GEMINI_API_KEY', 'benchmark-stub')
+os.environ['RESUME_INDEX_PATH'] = os.path.join(tempfile.mkdtemp(prefix='bench-reuse-'), 'resume_index.db')
+
+import app as profile_app
+import resume_index
+from stubs import StubModel, sample_files
+
+
+def revisions(text):
+    lines = text.split('\n')
+    middle = len(lines) // 2
+    return {
+        'identical': text,
+        'new_phone': text + '\nContact Number: +91 98450 11223',
+        'extra_bullet': '\n'.join(lines[:middle] + ['- Led the migration of the build pipeline to GitHub Actions, cutting release time by 40%.'] + lines[middle:]),
+    }
+
+
+def jaccard(text_a, text_b):
+    a, b = resume_index.shingles(text_a), resume_index.shingles(text_b)
+    return len(a & b) / len(a | b) if a | b else 1.0
+
+
+def reuse_outcome(before):
+    after = {s.labels['outcome']: s.value for s in profile_app.RESUME_REUSE.collect()[0].samples if s.name.endswith('_total')}
+    return next((outcome for outcome, value in after.items() if value > before.get(outcome, 0)), '-')
+
+
+def timed_parse(model, text):
+    before = {s.labels['outcome']: s.value for s in profile_app.RESUME_REUSE.collect()[0].samples if s.name.endswith('_total')}
+    calls_before = sum(model.calls.values())
+    start = time.perf_counter()
+    profile = profile_app.parse_resume(text)
+    return {
+        'path': reuse_outcome(before),
+        'calls': sum(model.calls.values()) - calls_before,
+        'seconds': round(time.perf_counter() - start, 3),
+        'ok': bool(profile),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--latency', type=float, default=0.5, help='seconds per stubbed Gemini call')
+    parser.add_argument('--json', dest='json_path', help='write results to this file')
+    args = parser.parse_args()
+
+    profile_app.logging.getLogger().setLevel(profile_app.logging.CRITICAL)
+    model = StubModel(latency=args.latency)
+    profile_app.model = model
+    texts = {os.path.basename(path): profile_app.clean_formatting(profile_app.extract_text(path, ext)) for path, ext in sample_files()}
+
+    results = []
+    print(f"{'resume':34} {'variant':13} {'minhash':>8} {'jaccard':>8} {'path':>13} {'calls':>6} {'seconds':>8}")
+    for name, text in texts.items():
+        start = time.perf_counter()
+        resume_index.signature(text)
+        signature_ms = (time.perf_counter() - start) * 1000
+        first = timed_parse(model, text)
+        results.append(dict(first, resume=name, variant='first_parse', signature_ms=round(signature_ms, 2)))
+        print(f"{name[:34]:34} {'first_parse':13} {'':>8} {'':>8} {first['path']:>13} {first['calls']:>6} {first['seconds']:>8}")
+        for variant, revised in revisions(text).items():
+            estimate = resume_index.similarity(resume_index.signature(text), resume_index.signature(revised))
+            exact = jaccard(text, revised)
+            entry = timed_parse(model, revised)
+            entry.update(resume=name, variant=variant, minhash=round(estimate, 3), jaccard=round(exact, 3))
+            results.append(entry)
+            print(f"{name[:34]:34} {variant:13} {entry['minhash']:>8} {entry['jaccard']:>8} {entry['path']:>13} {entry['calls']:>6} {entry['seconds']:>8}")
+
+    cross = [round(jaccard(texts[a], texts[b]), 3) for a, b in itertools.combinations(texts, 2)]
+    print(f"\ncross-resume shingle Jaccard: max {max(cross) if cross else '-'}, median {sorted(cross)[len(cross) // 2] if cross else '-'}")
+    signature_times = [entry['signature_ms'] for entry in results if 'signature_ms' in entry]
+    print(f"signature time per resume: max {max(signature_times):.1f} ms")
+
+    if args.json_path:
+        with open(args.json_path, 'w', encoding='utf-8') as f:
+            json.dump({'latency': args.latency, 'results': results, 'cross_jaccard': cross}, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
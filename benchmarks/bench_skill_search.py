@@ -0,0 +1,112 @@
+"""Skill search benchmark: index build time, posting list size and query latency.
+
+    python benchmarks/bench_skill_search.py [--profiles 30000] [--json search.json]
+
+Stores --profiles copies of the sample profile in a scratch profile store,
+each with a random mix of common skills (the sample's own skills plus a few
+popular extras) and rare ones, so both dense and sparse posting lists occur.
+Then it times a cold index build, a few boolean queries against the index
+(including a brute-force check of the result count), and a single-profile
+incremental update.
+"""
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ['PROFILE_STORE_PATH'] = os.path.join(tempfile.mkdtemp(prefix='bench-search-'), 'profiles.db')
+
+import profile_store
+import skill_index
+from stubs import load_sample_profile
+
+QUERIES = [
+    'Python AND Kubernetes AND NOT Java',
+    '"Spring Boot" OR Flask',
+    'Docker AND (PostgreSQL OR MySQL) AND NOT Go',
+    'Rare17 AND Python',
+    'rare1*',
+]
+EXTRA_COMMON = ['Java', 'React', 'Angular', 'AWS', 'Azure', 'Node.js']
+RARE = [f'Rare{i}' for i in range(500)]
+
+
+def populate(count, seed=1):
+    rng = random.Random(seed)
+    sample = load_sample_profile()
+    common = sorted({skill for skills in sample['technical_skills'].values() for skill in skills} | set(EXTRA_COMMON))
+    conn = profile_store.connection()
+    conn.execute('PRAGMA synchronous=OFF')
+    for i in range(count):
+        profile = dict(sample, name=f"Candidate {i}", personal_details={'employee_id': f"B{i:06d}"})
+        profile['technical_skills'] = {'tools': rng.sample(common, rng.randint(3, 12)) + rng.sample(RARE, 2)}
+        profile_store.save(profile, [], [], 'display_profile', 'benchmark')
+
+
+def brute_force(query):
+    tree = skill_index.Parser(skill_index.tokenize(query)).parse()
+
+    def matches(node, terms):
+        kind = node[0]
+        if kind == 'and':
+            return matches(node[1], terms) and matches(node[2], terms)
+        if kind == 'or':
+            return matches(node[1], terms) or matches(node[2], terms)
+        if kind == 'not':
+            return not matches(node[1], terms)
+        term = skill_index.normalize(node[1])
+        if term.endswith('*'):
+            return any(t.startswith(term.rstrip('*')) for t in terms)
+        return term in terms
+
+    return sum(1 for _, _, skills in profile_store.technical_skills() if matches(tree, skill_index.profile_terms(skills)))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--profiles', type=int, default=30000)
+    parser.add_argument('--repeat', type=int, default=200)
+    parser.add_argument('--json', dest='json_path', help='write results to this file')
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    populate(args.profiles)
+    print(f"stored {args.profiles} profiles in {time.perf_counter() - start:.1f}s")
+
+    start = time.perf_counter()
+    skill_index.build()
+    build_seconds = time.perf_counter() - start
+    stats = skill_index.stats()
+    postings = sum(len(terms) for terms in skill_index._doc_terms.values())
+    print(f"build {build_seconds * 1000:.0f} ms; {stats['skills']} skills ({stats['dense_lists']} bitmaps), "
+          f"{postings} postings in {stats['posting_bytes']} bytes vs {postings * 4} as 32-bit ids")
+
+    results = {'profiles': args.profiles, 'build_ms': round(build_seconds * 1000, 1), 'stats': stats, 'queries': []}
+    skill_index.REFRESH_INTERVAL = float('inf')
+    print(f"\n{'query':42} {'matches':>8} {'expected':>8} {'ms':>8}")
+    for query in QUERIES:
+        start = time.perf_counter()
+        for _ in range(args.repeat):
+            total, _ = skill_index.search(query)
+        elapsed_ms = (time.perf_counter() - start) * 1000 / args.repeat
+        expected = brute_force(query)
+        results['queries'].append({'query': query, 'matches': total, 'expected': expected, 'ms': round(elapsed_ms, 3)})
+        print(f"{query:42} {total:>8} {expected:>8} {elapsed_ms:>8.3f}")
+
+    start = time.perf_counter()
+    skill_index.update(1, {'technical_skills': {'tools': ['Python', 'Rare499', 'Zig']}})
+    update_ms = (time.perf_counter() - start) * 1000
+    results['update_ms'] = round(update_ms, 3)
+    print(f"\nincremental update of one profile: {update_ms:.2f} ms")
+
+    if args.json_path:
+        with open(args.json_path, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,130 @@
+"""Skill categorization benchmark: precision, recall and speed of the local catalog.
+
+    python benchmarks/bench_skills.py [--llm-dir DIR] [--record] [--json skills.json]
+
+Every resume in 'test profile/' that has hand labels in skill_labels.json
+is scored on its (skill, bucket) pairs:
+
+    catalog   skill_catalog.categorize() on the resume text alone
+    gemini    technical_skills as Gemini returned them, read from
+              --llm-dir/<resume>.json
+    combined  Gemini's output passed through categorize(), which is what
+              the app stores
+
+--record fills --llm-dir by calling Gemini (GEMINI_API_KEY must be real)
+with the catalog switched off. Without --llm-dir only the catalog rows
+are printed, plus a check of the catalog's buckets against the recorded
+Gemini response in recorded_responses.json.
+"""
+import os
+import sys
+import json
+import time
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('GEMINI_API_KEY', 'benchmark-stub')
+
+import app as profile_app
+import skill_catalog
+from stubs import BENCHMARKS_DIR, load_recorded_responses, sample_files
+
+LABELS_PATH = os.path.join(BENCHMARKS_DIR, 'skill_labels.json')
+
+
+def pairs(buckets):
+    return {(skill.lower(), category) for category, skills in buckets.items() for skill in skills}
+
+
+def score(predicted, expected):
+    predicted, expected = pairs(predicted), pairs(expected)
+    hits = len(predicted & expected)
+    names_expected = {name for name, _ in expected}
+    return {
+        'precision': round(hits / len(predicted), 3) if predicted else None,
+        'recall': round(hits / len(expected), 3) if expected else None,
+        'name_recall': round(len({name for name, _ in predicted} & names_expected) / len(names_expected), 3) if names_expected else None,
+    }
+
+
+def record(text, path):
+    skill_catalog.SKILL_CATALOG_ENABLED = False
+    try:
+        profile = profile_app.generate_structured_data(text)
+    finally:
+        skill_catalog.SKILL_CATALOG_ENABLED = True
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(profile.get('technical_skills', {}), f, indent=2)
+
+
+def bucket_agreement(technical_skills):
+    # Gemini's bucket vs the catalog's, for the skills the catalog knows
+    known = same = 0
+    for category, skills in technical_skills.items():
+        for skill in skills:
+            entry = skill_catalog.lookup(skill)
+            if entry is not None:
+                known += 1
+                same += entry.category == category
+    return known, same
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--llm-dir', help='directory with one <resume>.json of Gemini technical_skills per resume')
+    parser.add_argument('--record', action='store_true', help='call Gemini to (re)create the --llm-dir files')
+    parser.add_argument('--repeat', type=int, default=200)
+    parser.add_argument('--json', dest='json_path', help='write results to this file')
+    args = parser.parse_args()
+    if args.record and not args.llm_dir:
+        parser.error('--record needs --llm-dir')
+
+    profile_app.logging.getLogger().setLevel(profile_app.logging.CRITICAL)
+    with open(LABELS_PATH, 'r', encoding='utf-8') as f:
+        labels = json.load(f)
+
+    results = []
+    print(f"{'resume':34} {'source':9} {'precision':>9} {'recall':>7} {'names':>6} {'us':>8}")
+    for path, ext in sample_files():
+        name = os.path.basename(path)
+        if name not in labels:
+            continue
+        text = profile_app.clean_formatting(profile_app.extract_text(path, ext))
+        start = time.perf_counter()
+        for _ in range(args.repeat):
+            local = skill_catalog.categorize({}, text)
+        micros = (time.perf_counter() - start) * 1e6 / args.repeat
+        rows = [('catalog', local, micros)]
+        if args.llm_dir:
+            llm_path = os.path.join(args.llm_dir, f"{name}.json")
+            if args.record:
+                os.makedirs(args.llm_dir, exist_ok=True)
+                record(text, llm_path)
+            if os.path.exists(llm_path):
+                with open(llm_path, 'r', encoding='utf-8') as f:
+                    gemini = json.load(f)
+                start = time.perf_counter()
+                combined = skill_catalog.categorize(gemini, text)
+                rows += [('gemini', gemini, None), ('combined', combined, (time.perf_counter() - start) * 1e6)]
+        for source, buckets, micros in rows:
+            entry = dict(score(buckets, labels[name]), resume=name, source=source, micros=round(micros, 1) if micros else None)
+            results.append(entry)
+            print(f"{name[:34]:34} {source:9} {str(entry['precision']):>9} {str(entry['recall']):>7} {str(entry['name_recall']):>6} "
+                  f"{'' if micros is None else f'{micros:.0f}':>8}")
+
+    recorded = profile_app.extract_json(load_recorded_responses()['structured_data'])['technical_skills']
+    known, same = bucket_agreement(recorded)
+    start = time.perf_counter()
+    for _ in range(args.repeat):
+        skill_catalog.categorize(recorded)
+    micros = (time.perf_counter() - start) * 1e6 / args.repeat
+    print(f"\nrecorded Gemini response: catalog knows {known} skills, same bucket for {same}; "
+          f"re-categorizing its list takes {micros:.0f} us")
+
+    if args.json_path:
+        with open(args.json_path, 'w', encoding='utf-8') as f:
+            json.dump({'results': results, 'recorded_known': known, 'recorded_same_bucket': same}, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
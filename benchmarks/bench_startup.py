@@ -0,0 +1,190 @@
+"""Startup benchmark: import time and per-worker memory under gunicorn.
+
+    python benchmarks/bench_startup.py [--runs 5] [--workers 4] [--json startup.json]
+
+Import time is measured in fresh interpreters: `import app` alone (heavy
+backends deferred) and followed by app.preload_backends() (what an eager
+import used to cost).
+
+Memory is read from /proc (Linux only) for the gunicorn master and each
+worker in three scenarios:
+  lazy       workers as booted, backends not imported yet
+  lazy-warm  every worker imports the backends itself after fork
+  preload    GUNICORN_PRELOAD=1, backends imported once in the master
+RSS counts shared pages in every process; PSS splits them between the
+processes sharing them; USS is memory private to the process. Sum PSS to
+compare scenarios.
+"""
+import os
+import sys
+import json
+import time
+import socket
+import argparse
+import tempfile
+import statistics
+import subprocess
+import urllib.request
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+IMPORT_PROBE = """
+import json, time
+t0 = time.perf_counter()
+import app
+t1 = time.perf_counter()
+app.preload_backends()
+t2 = time.perf_counter()
+print(json.dumps({'import_ms': (t1 - t0) * 1000, 'preload_ms': (t2 - t1) * 1000}))
+"""
+
+WARM_WORKER_CONF = """
+import os
+with open(os.path.join({repo!r}, 'gunicorn.conf.py'), 'r', encoding='utf-8') as f:
+    exec(compile(f.read(), 'gunicorn.conf.py', 'exec'))
+
+
+def post_worker_init(worker):
+    import app
+    app.preload_backends()
+"""
+
+
+def probe_env():
+    env = dict(os.environ)
+    env.setdefault('GEMINI_API_KEY', 'benchmark-stub')
+    env['LOG_LEVEL'] = 'WARNING'
+    return env
+
+
+def measure_imports(runs):
+    samples = []
+    for _ in range(runs):
+        output = subprocess.run([sys.executable, '-c', IMPORT_PROBE], cwd=REPO_DIR, env=probe_env(),
+                                capture_output=True, text=True, check=True).stdout
+        samples.append(json.loads(output.strip().splitlines()[-1]))
+    import_ms = [s['import_ms'] for s in samples]
+    preload_ms = [s['preload_ms'] for s in samples]
+    return {
+        'import_app_ms': round(statistics.median(import_ms), 1),
+        'preload_backends_ms': round(statistics.median(preload_ms), 1),
+        'eager_equivalent_ms': round(statistics.median(i + p for i, p in zip(import_ms, preload_ms)), 1),
+    }
+
+
+def read_memory_kb(pid):
+    memory = {}
+    with open(f'/proc/{pid}/smaps_rollup', 'r') as f:
+        for line in f:
+            parts = line.split()
+            if len(parts) >= 2 and parts[0].endswith(':') and parts[1].isdigit():
+                memory[parts[0][:-1]] = int(parts[1])
+    return {
+        'rss_mb': round(memory.get('Rss', 0) / 1024, 1),
+        'pss_mb': round(memory.get('Pss', 0) / 1024, 1),
+        'uss_mb': round((memory.get('Private_Clean', 0) + memory.get('Private_Dirty', 0)) / 1024, 1),
+    }
+
+
+def child_pids(parent_pid):
+    children = []
+    for entry in os.listdir('/proc'):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f'/proc/{entry}/stat', 'r') as f:
+                fields = f.read().rsplit(')', 1)[1].split()
+        except OSError:
+            continue
+        if int(fields[1]) == parent_pid:
+            children.append(int(entry))
+    return sorted(children)
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def wait_for_health(url, timeout=60):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            with urllib.request.urlopen(f"{url}/healthz", timeout=2) as response:
+                if response.status == 200:
+                    return True
+        except OSError:
+            time.sleep(0.2)
+    return False
+
+
+def measure_gunicorn(scenario, workers, settle):
+    port = free_port()
+    env = probe_env()
+    command = [sys.executable, '-m', 'gunicorn', 'app:app', '--bind', f'127.0.0.1:{port}', '--workers', str(workers)]
+    conf_path = None
+    if scenario == 'preload':
+        env['GUNICORN_PRELOAD'] = '1'
+    elif scenario == 'lazy-warm':
+        with tempfile.NamedTemporaryFile('w', suffix='.conf.py', delete=False) as f:
+            f.write(WARM_WORKER_CONF.format(repo=REPO_DIR))
+            conf_path = f.name
+        command += ['-c', conf_path]
+
+    started = time.perf_counter()
+    process = subprocess.Popen(command, cwd=REPO_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        if not wait_for_health(f"http://127.0.0.1:{port}"):
+            raise RuntimeError(f"gunicorn did not become healthy ({scenario})")
+        ready_s = time.perf_counter() - started
+        time.sleep(settle)
+        worker_pids = child_pids(process.pid)
+        worker_memory = [read_memory_kb(pid) for pid in worker_pids]
+        return {
+            'scenario': scenario,
+            'ready_s': round(ready_s, 2),
+            'master': read_memory_kb(process.pid),
+            'workers': worker_memory,
+            'worker_rss_mb_mean': round(statistics.fmean(w['rss_mb'] for w in worker_memory), 1),
+            'worker_uss_mb_mean': round(statistics.fmean(w['uss_mb'] for w in worker_memory), 1),
+            'total_pss_mb': round(read_memory_kb(process.pid)['pss_mb'] + sum(w['pss_mb'] for w in worker_memory), 1),
+        }
+    finally:
+        process.terminate()
+        process.wait(timeout=30)
+        if conf_path:
+            os.unlink(conf_path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--runs', type=int, default=5, help='fresh interpreters per import measurement')
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--settle', type=float, default=2.0, help='seconds to wait after boot before reading memory')
+    parser.add_argument('--scenarios', default='lazy,lazy-warm,preload')
+    parser.add_argument('--json', dest='json_path', help='write results to this file')
+    args = parser.parse_args()
+
+    imports = measure_imports(args.runs)
+    print(f"import app: {imports['import_app_ms']} ms, preload_backends: {imports['preload_backends_ms']} ms, "
+          f"eager equivalent: {imports['eager_equivalent_ms']} ms")
+
+    results = []
+    if os.path.exists('/proc/self/smaps_rollup'):
+        print(f"\n{'scenario':10} {'ready s':>8} {'master RSS':>11} {'worker RSS':>11} {'worker USS':>11} {'total PSS':>10}")
+        for scenario in args.scenarios.split(','):
+            result = measure_gunicorn(scenario, args.workers, args.settle)
+            results.append(result)
+            print(f"{scenario:10} {result['ready_s']:>8} {result['master']['rss_mb']:>11} {result['worker_rss_mb_mean']:>11} "
+                  f"{result['worker_uss_mb_mean']:>11} {result['total_pss_mb']:>10}")
+    else:
+        print("\n/proc/self/smaps_rollup not available; skipping per-worker memory")
+
+    if args.json_path:
+        with open(args.json_path, 'w', encoding='utf-8') as f:
+            json.dump({'workers': args.workers, 'imports': imports, 'gunicorn': results}, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
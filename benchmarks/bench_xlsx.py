@@ -0,0 +1,100 @@
+"""XLSX export benchmark: full and skills-only exports for a typical and a large profile.
+
+    python benchmarks/bench_xlsx.py [--iterations 30] [--scale 10] [--json xlsx.json] [--baseline old.json]
+
+Exports go through POST /download_xlsx with the Flask test client, so both
+variants are measured the same way. The large profile is the sample repeated
+--scale times (see bench_docx.scale_profile). Besides render latency the
+harness reports file size, the number of cell formats in styles.xml and how
+long openpyxl takes to load the result, as a stand-in for Excel's open time.
+"""
+import io
+import os
+import sys
+import json
+import time
+import zipfile
+import argparse
+import statistics
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('GEMINI_API_KEY', 'benchmark-stub')
+
+import app as profile_app
+from stubs import load_sample_profile
+from bench_docx import scale_profile, percentile
+
+
+def cell_format_count(data):
+    with zipfile.ZipFile(io.BytesIO(data)) as package:
+        styles = package.read('xl/styles.xml').decode('utf-8')
+    start = styles.find('<cellXfs')
+    return styles[start:styles.find('</cellXfs>', start)].count('<xf ') if start != -1 else 0
+
+
+def measure(client, name, profile, skills_only, iterations):
+    from openpyxl import load_workbook
+    with client.session_transaction() as session:
+        session['profile'] = profile
+    form = {'hidden_sections': '[]', 'hidden_dates': '[]'}
+    if skills_only:
+        form['skills_only'] = 'true'
+    body = client.post('/download_xlsx', data=form).get_data()
+    timings = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        response = client.post('/download_xlsx', data=form)
+        body = response.get_data()
+        timings.append((time.perf_counter() - start) * 1000)
+        response.close()
+    start = time.perf_counter()
+    workbook = load_workbook(io.BytesIO(body))
+    load_ms = (time.perf_counter() - start) * 1000
+    return {
+        'case': name,
+        'runs': iterations,
+        'p50_ms': round(percentile(timings, 50), 2),
+        'p95_ms': round(percentile(timings, 95), 2),
+        'mean_ms': round(statistics.fmean(timings), 2),
+        'size_kb': round(len(body) / 1024, 1),
+        'cell_formats': cell_format_count(body),
+        'rows': workbook.active.max_row,
+        'load_ms': round(load_ms, 2),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--iterations', type=int, default=30)
+    parser.add_argument('--scale', type=int, default=10, help='repetition factor for the large profile')
+    parser.add_argument('--json', dest='json_path', help='write results to this file')
+    parser.add_argument('--baseline', help='earlier --json output to compare p50 latency against')
+    args = parser.parse_args()
+
+    profile_app.logging.getLogger().setLevel(profile_app.logging.CRITICAL)
+    typical = load_sample_profile()
+    large = scale_profile(typical, args.scale)
+    client = profile_app.app.test_client()
+    results = []
+    for name, profile in (('typical', typical), (f'large_x{args.scale}', large)):
+        results.append(measure(client, name, profile, False, args.iterations))
+        results.append(measure(client, f'{name}_skills', profile, True, args.iterations))
+
+    baseline = {}
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            baseline = {entry['case']: entry for entry in json.load(f)['results']}
+    print(f"{'case':20} {'p50 ms':>8} {'p95 ms':>8} {'size KB':>8} {'formats':>8} {'rows':>6} {'load ms':>8} {'base p50':>9} {'delta':>8}")
+    for entry in results:
+        base = baseline.get(entry['case'])
+        delta = f"{(entry['p50_ms'] - base['p50_ms']) / base['p50_ms'] * 100:+.1f}%" if base else ''
+        print(f"{entry['case']:20} {entry['p50_ms']:>8} {entry['p95_ms']:>8} {entry['size_kb']:>8} {entry['cell_formats']:>8} "
+              f"{entry['rows']:>6} {entry['load_ms']:>8} {base['p50_ms'] if base else '':>9} {delta:>8}")
+
+    if args.json_path:
+        with open(args.json_path, 'w', encoding='utf-8') as f:
+            json.dump({'iterations': args.iterations, 'scale': args.scale, 'results': results}, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
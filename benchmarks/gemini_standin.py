@@ -0,0 +1,218 @@
+"""Local Gemini stand-in for load tests.
+
+Two ways to take the real API out of the loop:
+
+* In-process: FakeGenerativeModel has the same generate_content() and
+  generate_content_async() surface as genai.GenerativeModel and raises the same google.api_core exceptions.
+  benchmarks/gunicorn_loadtest.conf.py installs it into every worker.
+
+* Over HTTP: run this module as a server speaking the generateContent REST
+  shape, and point the app at it:
+
+      python benchmarks/gemini_standin.py --port 8089 --latency-ms 1200 --rate-limit-rate 0.05
+      GEMINI_TRANSPORT=rest GEMINI_API_ENDPOINT=http://127.0.0.1:8089 gunicorn app:app ...
+
+Both replay benchmarks/recorded_responses.json and draw latency from a
+log-normal distribution (median --latency-ms, spread --latency-sigma), with
+--error-rate answered as HTTP 500 and --rate-limit-rate as HTTP 429.
+"""
+import os
+import sys
+import json
+import math
+import time
+import random
+import argparse
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from stubs import classify_prompt, load_recorded_responses
+
+
+class FaultProfile:
+    def __init__(self, latency_ms=800.0, latency_sigma=0.5, error_rate=0.0, rate_limit_rate=0.0, seed=None):
+        self.latency_ms = latency_ms
+        self.latency_sigma = latency_sigma
+        self.error_rate = error_rate
+        self.rate_limit_rate = rate_limit_rate
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls, prefix='GEMINI_STANDIN_'):
+        return cls(
+            latency_ms=float(os.getenv(f'{prefix}LATENCY_MS', '800')),
+            latency_sigma=float(os.getenv(f'{prefix}LATENCY_SIGMA', '0.5')),
+            error_rate=float(os.getenv(f'{prefix}ERROR_RATE', '0')),
+            rate_limit_rate=float(os.getenv(f'{prefix}RATE_LIMIT_RATE', '0')),
+        )
+
+    def draw(self):
+        # Returns (delay_seconds, outcome) where outcome is 'ok', 'error' or 'rate_limited'
+        with self._lock:
+            delay = self._random.lognormvariate(math.log(max(self.latency_ms, 0.001) / 1000), self.latency_sigma) if self.latency_ms else 0.0
+            roll = self._random.random()
+        if roll < self.rate_limit_rate:
+            return delay * 0.1, 'rate_limited'
+        if roll < self.rate_limit_rate + self.error_rate:
+            return delay, 'error'
+        return delay, 'ok'
+
+
+def usage_metadata(prompt, text):
+    # Rough 4-characters-per-token estimate, good enough for sizing tests
+    prompt_tokens = max(1, len(prompt) // 4)
+    candidate_tokens = max(1, len(text) // 4)
+    return {
+        'promptTokenCount': prompt_tokens,
+        'candidatesTokenCount': candidate_tokens,
+        'totalTokenCount': prompt_tokens + candidate_tokens,
+    }
+
+
+class FakeResponse:
+    def __init__(self, text, prompt=''):
+        self.text = text
+        self.usage_metadata = usage_metadata(prompt, text)
+
+
+class FakeGenerativeModel:
+    def __init__(self, model_name='gemini-1.5-flash', faults=None, responses=None):
+        self.model_name = model_name
+        self.faults = faults or FaultProfile.from_env()
+        self.responses = responses if responses is not None else load_recorded_responses()
+
+    def generate_content(self, contents, **kwargs):
+        from google.api_core import exceptions
+        prompt = contents if isinstance(contents, str) else json.dumps(contents, default=str)
+        delay, outcome = self.faults.draw()
+        time.sleep(delay)
+        if outcome == 'rate_limited':
+            raise exceptions.ResourceExhausted('429 Resource has been exhausted (e.g. check quota).')
+        if outcome == 'error':
+            raise exceptions.InternalServerError('500 An internal error has occurred.')
+        return FakeResponse(self.responses.get(classify_prompt(prompt), ''), prompt)
+
+    async def generate_content_async(self, contents, **kwargs):
+        import asyncio
+        from google.api_core import exceptions
+        prompt = contents if isinstance(contents, str) else json.dumps(contents, default=str)
+        delay, outcome = self.faults.draw()
+        await asyncio.sleep(delay)
+        if outcome == 'rate_limited':
+            raise exceptions.ResourceExhausted('429 Resource has been exhausted (e.g. check quota).')
+        if outcome == 'error':
+            raise exceptions.InternalServerError('500 An internal error has occurred.')
+        return FakeResponse(self.responses.get(classify_prompt(prompt), ''), prompt)
+
+
+def prompt_from_request(body):
+    parts = []
+    for content in body.get('contents', []):
+        for part in content.get('parts', []):
+            parts.append(part.get('text', ''))
+    return '\n'.join(parts)
+
+
+class StandinHandler(BaseHTTPRequestHandler):
+    server_version = 'GeminiStandin/1.0'
+    protocol_version = 'HTTP/1.1'
+    # Headers and body go out in separate writes; with Nagle on, a reused
+    # connection stalls on the client's delayed ACK (~40 ms) before the body
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+    def send_json(self, status, payload):
+        body = json.dumps(payload).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=UTF-8')
+        self.send_header('Content-Length', str(len(body)))
+        if self.close_connection:
+            # The client sent Connection: close; say so, so it does not try to reuse the socket
+            self.send_header('Connection', 'close')
+        self.end_headers()
+        self.wfile.write(body)
+
+    def send_error_json(self, status, message, reason):
+        self.send_json(status, {'error': {'code': status, 'message': message, 'status': reason}})
+
+    def do_POST(self):
+        path = self.path.split('?', 1)[0]
+        length = int(self.headers.get('Content-Length') or 0)
+        raw = self.rfile.read(length) if length else b'{}'
+        if not (path.endswith(':generateContent') or path.endswith(':streamGenerateContent')):
+            self.send_error_json(404, f'Unknown method {path}', 'NOT_FOUND')
+            return
+        try:
+            body = json.loads(raw or b'{}')
+        except ValueError:
+            self.send_error_json(400, 'Invalid JSON payload', 'INVALID_ARGUMENT')
+            return
+
+        prompt = prompt_from_request(body)
+        delay, outcome = self.server.faults.draw()
+        time.sleep(delay)
+        with self.server.stats_lock:
+            self.server.stats[outcome] = self.server.stats.get(outcome, 0) + 1
+        if outcome == 'rate_limited':
+            self.send_error_json(429, 'Resource has been exhausted (e.g. check quota).', 'RESOURCE_EXHAUSTED')
+            return
+        if outcome == 'error':
+            self.send_error_json(500, 'An internal error has occurred.', 'INTERNAL')
+            return
+
+        text = self.server.responses.get(classify_prompt(prompt), '')
+        self.send_json(200, {
+            'candidates': [{
+                'content': {'parts': [{'text': text}], 'role': 'model'},
+                'finishReason': 'STOP',
+                'index': 0,
+            }],
+            'usageMetadata': usage_metadata(prompt, text),
+        })
+
+
+def make_server(host='127.0.0.1', port=8089, faults=None, responses=None, verbose=False):
+    server = ThreadingHTTPServer((host, port), StandinHandler)
+    server.daemon_threads = True
+    server.faults = faults or FaultProfile()
+    server.responses = responses if responses is not None else load_recorded_responses()
+    server.stats = {}
+    server.stats_lock = threading.Lock()
+    server.verbose = verbose
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8089)
+    parser.add_argument('--latency-ms', type=float, default=800.0, help='median response latency')
+    parser.add_argument('--latency-sigma', type=float, default=0.5, help='log-normal spread; 0 for a fixed delay')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='fraction of calls answered with HTTP 500')
+    parser.add_argument('--rate-limit-rate', type=float, default=0.0, help='fraction of calls answered with HTTP 429')
+    parser.add_argument('--responses', default=None, help='recorded responses JSON (defaults to benchmarks/recorded_responses.json)')
+    parser.add_argument('--seed', type=int, default=None)
+    parser.add_argument('--verbose', action='store_true')
+    args = parser.parse_args()
+
+    faults = FaultProfile(args.latency_ms, args.latency_sigma, args.error_rate, args.rate_limit_rate, args.seed)
+    responses = load_recorded_responses(args.responses) if args.responses else None
+    server = make_server(args.host, args.port, faults, responses, args.verbose)
+    print(f"Gemini stand-in listening on http://{args.host}:{args.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        print(f"Served: {server.stats}")
+        server.server_close()
+
+
+if __name__ == '__main__':
+    main()
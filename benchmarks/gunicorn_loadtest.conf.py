@@ -0,0 +1,33 @@
+"""gunicorn config for load tests with the in-process Gemini stand-in.
+
+    GEMINI_API_KEY=loadtest GEMINI_STANDIN_LATENCY_MS=1200 GEMINI_STANDIN_RATE_LIMIT_RATE=0.05 \\
+        gunicorn app:app -c benchmarks/gunicorn_loadtest.conf.py --bind 127.0.0.1:8000 --workers 4
+
+Inherits the production hooks from gunicorn.conf.py and swaps app.model for
+FakeGenerativeModel in every worker. Latency and fault rates come from the
+GEMINI_STANDIN_* environment variables (see gemini_standin.FaultProfile).
+
+Every flow uploads one of the same few resumes, so reuse of earlier parses
+is switched off here (RESUME_REUSE_THRESHOLD=0, COALESCE_RESULT_TTL=0) and
+each upload goes to the stand-in. Set either in the environment to measure
+with reuse on.
+"""
+import os
+import sys
+
+BENCHMARKS_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, BENCHMARKS_DIR)
+
+with open(os.path.join(os.path.dirname(BENCHMARKS_DIR), 'gunicorn.conf.py'), 'r', encoding='utf-8') as f:
+    exec(compile(f.read(), 'gunicorn.conf.py', 'exec'))
+
+# Read by the app when workers import it
+os.environ.setdefault('RESUME_REUSE_THRESHOLD', '0')
+os.environ.setdefault('COALESCE_RESULT_TTL', '0')
+
+
+def post_worker_init(worker):
+    import app
+    from gemini_standin import FakeGenerativeModel
+    app.model = FakeGenerativeModel()
+    worker.log.info("Worker %s using in-process Gemini stand-in", worker.pid)
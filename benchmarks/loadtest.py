@@ -0,0 +1,261 @@
+"""Load test: drive realistic upload -> edit -> save -> switch_design -> download flows.
+
+    # 1. start the app against a Gemini stand-in, e.g. in-process:
+    GEMINI_API_KEY=loadtest GEMINI_STANDIN_LATENCY_MS=1500 \\
+        gunicorn app:app -c benchmarks/gunicorn_loadtest.conf.py --bind 127.0.0.1:8000 --workers 4
+    # 2. step through arrival rates and find where it falls over:
+    python benchmarks/loadtest.py --url http://127.0.0.1:8000 --rps 0.5,1,2,4 --duration 60 --workers 4
+    # compare against the async backend path (threaded workers, shared event loop):
+    ASYNC_BACKENDS=1 GEMINI_API_KEY=loadtest ... gunicorn app:app -c benchmarks/gunicorn_loadtest.conf.py ...
+    # the Gemini gateway's rate limit applies too; LLM_RATE_PER_MINUTE=0 takes it out of the picture
+
+Flows upload the resumes in 'test profile/' in turn. gunicorn_loadtest.conf.py
+turns off resume reuse and the cross-worker result cache (RESUME_REUSE_THRESHOLD=0,
+COALESCE_RESULT_TTL=0), so every upload is parsed by the Gemini stand-in rather
+than served from an earlier parse. Identical uploads that overlap in one
+worker still share a call, as duplicate submissions would in production.
+
+Flows arrive open-loop at the target rate, so a saturated server shows up as
+growing latency instead of a slower client. Flow latency is measured from
+the scheduled start, which avoids coordinated omission. Worker saturation is
+the share of worker time spent in requests, taken from the request latency
+histogram on /metrics before and after each step. The capacity estimate is
+the highest rate the server keeps up with (>= 90% of offered flows/s) while
+flow p95 stays under --slo-ms and the error rate under --max-error-rate.
+"""
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from stubs import load_sample_profile, sample_files
+
+DESIGNS = ['display_profile', 'd1', 'd2', 'd3']
+DOWNLOAD_ROUTES = {'pdf': '/download', 'docx': '/download_docx', 'xlsx': '/download_xlsx'}
+
+
+def percentile(values, pct):
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * pct / 100
+    low = int(rank)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+
+def update_form(profile):
+    form = [
+        ('action', 'save'),
+        ('hidden_sections', '[]'),
+        ('hidden_dates', '[]'),
+        ('name', profile['name']),
+        ('total_experience', profile['total_experience']),
+        ('professional_summary', profile['professional_summary']),
+        ('roles_responsibilities', profile['roles_responsibilities']),
+    ]
+    for item in profile['education_training_certifications']:
+        form += [('education_training_certifications[]', item['title']),
+                 ('education_start_date[]', item['start_date']),
+                 ('education_end_date[]', item['end_date'])]
+    for key in ('netweb_projects', 'past_projects'):
+        for project in profile[key]:
+            form += [(f'{key}[title][]', project['title']), (f'{key}[description][]', project['description'])]
+    for skill_type, skills in profile['technical_skills'].items():
+        form += [(f'technical_skills[{skill_type}][]', skill) for skill in skills]
+    form += [(f'personal_details[{k}]', v) for k, v in profile['personal_details'].items()]
+    for exp in profile['work_experience']:
+        form += [('work_experience[company_name][]', exp['company_name']),
+                 ('work_experience[start_date_converted][]', exp['start_date']),
+                 ('work_experience[end_date_converted][]', exp['end_date']),
+                 ('work_experience[role][]', exp['role']),
+                 ('work_experience[responsibilities][]', exp['responsibilities'])]
+    return form
+
+
+class Recorder:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.steps = {}
+        self.errors = {}
+        self.flows = []
+        self.flow_errors = 0
+        self.requests = 0
+
+    def step(self, name, elapsed_ms, ok):
+        with self.lock:
+            self.requests += 1
+            self.steps.setdefault(name, []).append(elapsed_ms)
+            if not ok:
+                self.errors[name] = self.errors.get(name, 0) + 1
+
+    def flow(self, elapsed_ms, ok):
+        with self.lock:
+            self.flows.append(elapsed_ms)
+            if not ok:
+                self.flow_errors += 1
+
+
+def scrape_busy_seconds(session, base_url):
+    # Sum of request time across all workers, from the request latency histogram.
+    # Scraping the in-flight gauge instead under-reads: with sync workers the
+    # scrape itself queues until a worker is free.
+    try:
+        text = session.get(f"{base_url}/metrics", timeout=30).text
+    except requests.RequestException:
+        return None
+    busy = 0.0
+    for line in text.splitlines():
+        if line.startswith('profile_request_duration_seconds_sum') and 'endpoint="metrics"' not in line:
+            busy += float(line.rsplit(' ', 1)[1])
+    return busy
+
+
+class FlowRunner:
+    def __init__(self, base_url, samples, profile, formats, recorder, timeout):
+        self.base_url = base_url
+        self.samples = samples
+        self.profile = profile
+        self.form = update_form(profile)
+        self.formats = formats
+        self.recorder = recorder
+        self.timeout = timeout
+
+    def timed(self, name, session, method, path, expect_html=True, **kwargs):
+        start = time.perf_counter()
+        try:
+            response = session.request(method, f"{self.base_url}{path}", allow_redirects=False, timeout=self.timeout, **kwargs)
+            content_type = response.headers.get('Content-Type', '')
+            # Failures in this app redirect back to '/' with a flash message
+            ok = response.status_code == 200 and (expect_html or 'text/html' not in content_type)
+        except requests.RequestException:
+            ok = False
+        self.recorder.step(name, (time.perf_counter() - start) * 1000, ok)
+        return ok
+
+    def run(self, scheduled_at):
+        session = requests.Session()
+        path, ext = random.choice(self.samples)
+        with open(path, 'rb') as f:
+            upload = f.read()
+        fmt = random.choice(self.formats)
+        ok = (
+            self.timed('upload', session, 'POST', '/', files={'file_input': (os.path.basename(path), upload)})
+            and self.timed('edit', session, 'GET', '/edit_profile')
+            and self.timed('save', session, 'POST', '/update_profile', data=self.form)
+            and self.timed('switch_design', session, 'POST', '/switch_design', data={'design': random.choice(DESIGNS)})
+            and self.timed(f'download_{fmt}', session, 'POST', DOWNLOAD_ROUTES[fmt], expect_html=False,
+                           data={'hidden_sections': '[]', 'hidden_dates': '[]'})
+        )
+        self.recorder.flow((time.perf_counter() - scheduled_at) * 1000, ok)
+
+
+def run_stage(runner_factory, base_url, rps, duration, max_concurrency):
+    recorder = Recorder()
+    runner = runner_factory(recorder)
+    metrics_session = requests.Session()
+    busy_before = scrape_busy_seconds(metrics_session, base_url)
+    started = time.perf_counter()
+    total = max(1, int(rps * duration))
+    with ThreadPoolExecutor(max_workers=max_concurrency) as pool:
+        for i in range(total):
+            scheduled_at = started + i / rps
+            delay = scheduled_at - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            pool.submit(runner.run, scheduled_at)
+    elapsed = time.perf_counter() - started
+    busy_after = scrape_busy_seconds(metrics_session, base_url)
+    busy = busy_after - busy_before if busy_before is not None and busy_after is not None else None
+    return recorder, busy, elapsed
+
+
+def summarize(rps, recorder, busy_seconds, elapsed, workers):
+    completed = len(recorder.flows)
+    summary = {
+        'offered_rps': rps,
+        'elapsed_s': round(elapsed, 1),
+        'flows_completed': completed,
+        'flows_per_s': round(completed / elapsed, 3),
+        'requests_per_s': round(recorder.requests / elapsed, 3),
+        'flow_error_rate': round(recorder.flow_errors / completed, 4) if completed else 1.0,
+        'flow_p50_ms': round(percentile(recorder.flows, 50) or 0, 1),
+        'flow_p95_ms': round(percentile(recorder.flows, 95) or 0, 1),
+        'flow_p99_ms': round(percentile(recorder.flows, 99) or 0, 1),
+        'steps': {
+            name: {
+                'count': len(values),
+                'errors': recorder.errors.get(name, 0),
+                'p50_ms': round(percentile(values, 50), 1),
+                'p95_ms': round(percentile(values, 95), 1),
+                'p99_ms': round(percentile(values, 99), 1),
+            }
+            for name, values in recorder.steps.items()
+        },
+    }
+    if busy_seconds is not None:
+        # Fraction of total worker time spent handling requests during the stage
+        summary['worker_busy_seconds'] = round(busy_seconds, 1)
+        summary['worker_saturation'] = round(min(1.0, busy_seconds / (elapsed * workers)), 3)
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--url', default='http://127.0.0.1:8000')
+    parser.add_argument('--rps', default='0.5,1,2', help='comma-separated flow arrival rates to step through')
+    parser.add_argument('--duration', type=float, default=30.0, help='seconds per rate step')
+    parser.add_argument('--workers', type=int, default=4, help='gunicorn worker count, used for saturation')
+    parser.add_argument('--formats', default='docx,xlsx', help='download formats to pick from (pdf needs Chromium)')
+    parser.add_argument('--max-concurrency', type=int, default=256, help='client-side cap on in-flight flows')
+    parser.add_argument('--timeout', type=float, default=180.0, help='per-request timeout in seconds')
+    parser.add_argument('--slo-ms', type=float, default=30000.0, help='flow p95 latency target')
+    parser.add_argument('--max-error-rate', type=float, default=0.01)
+    parser.add_argument('--seed', type=int, default=None)
+    parser.add_argument('--json', dest='json_path', help='write results to this file')
+    args = parser.parse_args()
+
+    random.seed(args.seed)
+    base_url = args.url.rstrip('/')
+    formats = [f.strip() for f in args.formats.split(',') if f.strip() in DOWNLOAD_ROUTES]
+    samples = sample_files()
+    profile = load_sample_profile()
+
+    def runner_factory(recorder):
+        return FlowRunner(base_url, samples, profile, formats, recorder, args.timeout)
+
+    stages = []
+    capacity = None
+    for rps in [float(r) for r in args.rps.split(',')]:
+        print(f"== {rps} flows/s for {args.duration:.0f}s")
+        recorder, busy_seconds, elapsed = run_stage(runner_factory, base_url, rps, args.duration, args.max_concurrency)
+        summary = summarize(rps, recorder, busy_seconds, elapsed, args.workers)
+        stages.append(summary)
+        print(f"   {summary['flows_per_s']} flows/s, {summary['requests_per_s']} req/s, "
+              f"errors {summary['flow_error_rate']:.1%}, flow p50/p95/p99 "
+              f"{summary['flow_p50_ms']}/{summary['flow_p95_ms']}/{summary['flow_p99_ms']} ms, "
+              f"worker saturation {summary.get('worker_saturation', 'n/a')}")
+        for name, step in summary['steps'].items():
+            print(f"   {name:16} n={step['count']:<5} err={step['errors']:<4} p50={step['p50_ms']:>9} p95={step['p95_ms']:>9} p99={step['p99_ms']:>9}")
+        keeping_up = summary['flows_per_s'] >= 0.9 * rps
+        if keeping_up and summary['flow_p95_ms'] <= args.slo_ms and summary['flow_error_rate'] <= args.max_error_rate:
+            capacity = rps
+
+    print(f"\nEstimated capacity: {capacity if capacity is not None else '< lowest rate tested'} flows/s "
+          f"with {args.workers} workers (p95 <= {args.slo_ms:.0f} ms, errors <= {args.max_error_rate:.1%})")
+    if args.json_path:
+        with open(args.json_path, 'w', encoding='utf-8') as f:
+            json.dump({'url': base_url, 'workers': args.workers, 'formats': formats,
+                       'capacity_flows_per_s': capacity, 'stages': stages}, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,64 @@
+"""Offline stand-ins for the Gemini model used by the benchmark scripts."""
+import os
+import json
+import time
+
+BENCHMARKS_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_DIR = os.path.dirname(BENCHMARKS_DIR)
+SAMPLE_PROFILE_PATH = os.path.join(BENCHMARKS_DIR, 'sample_profile.json')
+RECORDED_RESPONSES_PATH = os.path.join(BENCHMARKS_DIR, 'recorded_responses.json')
+TEST_PROFILES_DIR = os.path.join(REPO_DIR, 'test profile')
+
+
+def load_sample_profile():
+    with open(SAMPLE_PROFILE_PATH, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def load_recorded_responses(path=RECORDED_RESPONSES_PATH):
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def classify_prompt(prompt):
+    if 'revised resume' in prompt:
+        return 'structured_patch'
+    if 'resume parser' in prompt:
+        return 'structured_data'
+    if 'bullet points' in prompt:
+        return 'bullet_points'
+    if 'technical skills from a resume' in prompt:
+        return 'skill_buckets'
+    if 'grammar' in prompt:
+        return 'grammar'
+    return 'unknown'
+
+
+class StubResponse:
+    def __init__(self, text):
+        self.text = text
+
+
+class StubModel:
+    """Replays recorded responses by task, optionally sleeping to mimic the API."""
+
+    def __init__(self, responses=None, latency=0.0):
+        self.responses = responses if responses is not None else load_recorded_responses()
+        self.latency = latency
+        self.calls = {}
+
+    def generate_content(self, prompt, **kwargs):
+        task = classify_prompt(prompt)
+        self.calls[task] = self.calls.get(task, 0) + 1
+        if self.latency:
+            time.sleep(self.latency)
+        return StubResponse(self.responses.get(task, ''))
+
+
+def sample_files():
+    files = []
+    for name in sorted(os.listdir(TEST_PROFILES_DIR)):
+        ext = name.rsplit('.', 1)[-1].lower()
+        if ext in ('pdf', 'docx', 'txt'):
+            files.append((os.path.join(TEST_PROFILES_DIR, name), ext))
+    return files
@@ -0,0 +1,133 @@
+"""Static asset build step.
+
+    python build_assets.py extract   # move inline <style>/<script> blocks out of templates
+    python build_assets.py           # fingerprint + precompress static/ into static/dist/
+
+The build writes static/dist/manifest.json, which app.py uses to resolve
+logical names (e.g. 'css/d1.css') to fingerprinted ones.
+"""
+import os
+import re
+import sys
+import json
+import gzip
+import shutil
+import hashlib
+import logging
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+TEMPLATES_DIR = os.path.join(BASE_DIR, 'templates')
+STATIC_DIR = os.path.join(BASE_DIR, 'static')
+DIST_DIR = os.path.join(STATIC_DIR, 'dist')
+MANIFEST_PATH = os.path.join(DIST_DIR, 'manifest.json')
+
+# Text assets worth precompressing; images are already compressed
+COMPRESSIBLE_EXTENSIONS = {'.css', '.js', '.svg', '.json', '.txt', '.html'}
+MIN_COMPRESS_SIZE = 512
+
+INLINE_BLOCK_RE = re.compile(r'(?P<indent>[ \t]*)<(?P<tag>style|script)(?P<attrs>[^>]*)>(?P<body>.*?)</(?P=tag)>', re.DOTALL)
+
+
+def is_extractable(tag, attrs, body):
+    # Leave external scripts, JSON data islands and anything templated in place
+    if 'src=' in attrs or 'type=' in attrs:
+        return False
+    if '{{' in body or '{%' in body or '{#' in body:
+        return False
+    return bool(body.strip())
+
+
+def extract_inline_assets():
+    for template_name in sorted(os.listdir(TEMPLATES_DIR)):
+        if not template_name.endswith('.html'):
+            continue
+        template_path = os.path.join(TEMPLATES_DIR, template_name)
+        with open(template_path, 'r', encoding='utf-8') as f:
+            source = f.read()
+
+        stem = template_name[:-len('.html')]
+        counters = {'style': 0, 'script': 0}
+
+        def replace_block(match):
+            tag, attrs, body = match.group('tag'), match.group('attrs'), match.group('body')
+            if not is_extractable(tag, attrs, body):
+                return match.group(0)
+            counters[tag] += 1
+            suffix = '' if counters[tag] == 1 else f"-{counters[tag]}"
+            if tag == 'style':
+                logical_name = f"css/{stem}{suffix}.css"
+            else:
+                logical_name = f"js/{stem}{suffix}.js"
+            asset_path = os.path.join(STATIC_DIR, logical_name)
+            os.makedirs(os.path.dirname(asset_path), exist_ok=True)
+            with open(asset_path, 'w', encoding='utf-8') as out:
+                out.write(body.strip('\n') + '\n')
+            logging.info(f"Extracted inline {tag} from {template_name} into static/{logical_name}")
+            return f"{match.group('indent')}{{{{ asset_tag('{logical_name}') }}}}"
+
+        rewritten = INLINE_BLOCK_RE.sub(replace_block, source)
+        if rewritten != source:
+            with open(template_path, 'w', encoding='utf-8') as f:
+                f.write(rewritten)
+
+
+def fingerprint_name(relative_path, content):
+    digest = hashlib.sha256(content).hexdigest()[:12]
+    root, ext = os.path.splitext(relative_path)
+    return f"{root}.{digest}{ext}"
+
+
+def precompress(path, content):
+    ext = os.path.splitext(path)[1].lower()
+    if ext not in COMPRESSIBLE_EXTENSIONS or len(content) < MIN_COMPRESS_SIZE:
+        return
+    with open(path + '.gz', 'wb') as f:
+        # mtime=0 keeps the output byte-identical between builds
+        f.write(gzip.compress(content, compresslevel=9, mtime=0))
+    if brotli is not None:
+        with open(path + '.br', 'wb') as f:
+            f.write(brotli.compress(content, quality=11))
+
+
+def build_assets():
+    if os.path.isdir(DIST_DIR):
+        shutil.rmtree(DIST_DIR)
+    os.makedirs(DIST_DIR, exist_ok=True)
+
+    manifest = {}
+    for root, dirs, files in os.walk(STATIC_DIR):
+        dirs[:] = sorted(d for d in dirs if os.path.join(root, d) != DIST_DIR)
+        for name in sorted(files):
+            source_path = os.path.join(root, name)
+            relative_path = os.path.relpath(source_path, STATIC_DIR).replace(os.sep, '/')
+            with open(source_path, 'rb') as f:
+                content = f.read()
+            hashed_name = fingerprint_name(relative_path, content)
+            target_path = os.path.join(DIST_DIR, hashed_name)
+            os.makedirs(os.path.dirname(target_path), exist_ok=True)
+            with open(target_path, 'wb') as f:
+                f.write(content)
+            precompress(target_path, content)
+            manifest[relative_path] = f"dist/{hashed_name}"
+
+    with open(MANIFEST_PATH, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    logging.info(f"Built {len(manifest)} assets into {DIST_DIR} (brotli {'enabled' if brotli else 'unavailable'})")
+    return manifest
+
+
+if __name__ == '__main__':
+    command = sys.argv[1] if len(sys.argv) > 1 else 'build'
+    if command == 'extract':
+        extract_inline_assets()
+    elif command == 'build':
+        build_assets()
+    else:
+        sys.exit(f"Unknown command: {command}. Use 'extract' or 'build'.")
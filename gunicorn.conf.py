@@ -0,0 +1,35 @@
+import os
+import shutil
+import tempfile
+
+# Loaded automatically by gunicorn from the working directory; command-line
+# flags in the Procfile still take precedence over anything set here.
+
+# Metrics from every worker are written here and merged by /metrics. The
+# directory is reset here rather than in on_starting because a preloaded app
+# is imported (and opens its metric files) before that hook runs.
+os.environ.setdefault('PROMETHEUS_MULTIPROC_DIR', os.path.join(tempfile.gettempdir(), 'profile-maker-metrics'))
+shutil.rmtree(os.environ['PROMETHEUS_MULTIPROC_DIR'], ignore_errors=True)
+os.makedirs(os.environ['PROMETHEUS_MULTIPROC_DIR'], exist_ok=True)
+
+# GUNICORN_PRELOAD=1 loads the app and its heavy backends once in the master;
+# forked workers then share those pages copy-on-write.
+preload_app = os.getenv('GUNICORN_PRELOAD', '0') == '1'
+
+# ASYNC_BACKENDS=1 runs Gemini calls and PDF renders on a per-process event
+# loop (async_backends.py); threaded workers let one process hand it many
+# requests at once instead of one per worker.
+if os.getenv('ASYNC_BACKENDS', '0') == '1':
+    worker_class = os.getenv('GUNICORN_WORKER_CLASS', 'gthread')
+    threads = int(os.getenv('GUNICORN_THREADS', '32'))
+
+
+def child_exit(server, worker):
+    from prometheus_client import multiprocess
+    multiprocess.mark_process_dead(worker.pid)
+
+
+def when_ready(server):
+    if preload_app:
+        import app
+        app.preload_backends()
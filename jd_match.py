@@ -0,0 +1,333 @@
+import os
+import re
+import time
+import logging
+import threading
+from collections import Counter
+
+import profile_store
+from skill_index import normalize as normalize_skill
+
+# Ranks stored profiles against a job description with TF-IDF cosine
+# similarity, no LLM involved. Each profile becomes a bag of words from its
+# skills, summary, designation, roles, work experience, projects and
+# certifications, plus one "skill:<name>" term per listed skill so that a
+# multi-word skill named in the JD ("Spring Boot") counts as a match of its
+# own. Term frequencies are sublinear (1 + log tf), applied when rows are
+# packed into a matrix.
+#
+# The matrix holds raw term frequencies only. IDF weights and row norms are
+# applied at query time as vectors, so a save never has to reweight other
+# rows:
+#   score = (tf @ (idf * q)) / sqrt(tf^2 @ idf^2)
+# New and re-saved profiles go into a small delta matrix, and the rows they
+# replace are masked out of the base one. Once the delta reaches
+# COMPACT_ROWS the two are merged. Profiles saved by other workers are read
+# back at the next match, as in skill_index.py.
+#
+# The first build reads every stored profile, which takes seconds for tens
+# of thousands, so the first match of a worker starts it on a background
+# thread (start_build()) instead of running it; until it finishes rank()
+# raises NotReady and /match answers 503. Workers that never match never
+# import numpy and scipy or build the matrix.
+#
+# numpy and scipy are imported on first use so the app boots without them.
+COMPACT_ROWS = 1000
+REFRESH_INTERVAL = float(os.getenv('JD_MATCH_REFRESH_INTERVAL', '1'))
+REFRESH_OVERLAP = 5.0
+MAX_RESULTS = 100
+MAX_SKILL_WORDS = 4
+
+WORD_RE = re.compile(r'[a-z0-9][a-z0-9+#]*(?:\.[a-z0-9]+)*')
+TAG_RE = re.compile(r'<[^>]+>')
+STOP_WORDS = frozenset("""
+a about above after all also an and any are as at be been being both but by can could did do does doing done
+during each either etc for from had has have having he her here him his how i if in into is it its just me
+more most my no nor not of on once only or other our out over own per same she should so some such than that
+the their them then there these they this those through to too under until up us very via was we were what
+when where which while who whom why will with within would you your years year experience work worked working
+""".split())
+
+_lock = threading.Lock()
+_builder_lock = threading.Lock()
+_builder = None
+_vocabulary = {}
+_terms = []
+_df = []
+_base = None
+_base_sq = None
+_base_ids = None
+_live = None
+_delta = []
+_delta_matrix = None
+_where = {}
+_doc_updated = {}
+_last_seen = None
+_last_refresh = 0.0
+
+
+class NotReady(Exception):
+    """The match matrix is still being built."""
+
+
+def words(text):
+    return [word for word in WORD_RE.findall(TAG_RE.sub(' ', text or '').lower()) if word not in STOP_WORDS]
+
+
+def profile_text(profile):
+    details = profile.get('personal_details') or {}
+    parts = [details.get('designation'), profile.get('professional_summary'), profile.get('roles_responsibilities')]
+    for key in ('netweb_projects', 'past_projects'):
+        parts += [f"{item.get('title', '')} {item.get('description', '')}" for item in profile.get(key) or [] if isinstance(item, dict)]
+    parts += [f"{item.get('role', '')} {item.get('responsibilities', '')}" for item in profile.get('work_experience') or [] if isinstance(item, dict)]
+    parts += [item.get('title', '') for item in profile.get('education_training_certifications') or [] if isinstance(item, dict)]
+    return ' '.join(part for part in parts if isinstance(part, str))
+
+
+def profile_skills(profile):
+    skills = profile.get('technical_skills')
+    if not isinstance(skills, dict):
+        return []
+    return [skill for values in skills.values() if isinstance(values, list) for skill in values if isinstance(skill, str)]
+
+
+def profile_counts(profile):
+    skills = profile_skills(profile)
+    counts = Counter(words(' '.join(skills)))
+    counts.update(words(profile_text(profile)))
+    counts.update(f"skill:{normalize_skill(skill)}" for skill in skills)
+    return counts
+
+
+def query_counts(text):
+    # Words of the JD, plus skill terms for every run of up to MAX_SKILL_WORDS words that names a known skill
+    counts = Counter(words(text))
+    plain = TAG_RE.sub(' ', text).lower().split()
+    for size in range(1, MAX_SKILL_WORDS + 1):
+        for start in range(len(plain) - size + 1):
+            term = f"skill:{normalize_skill(' '.join(plain[start:start + size]))}"
+            if term in _vocabulary:
+                counts[term] += 1
+    return counts
+
+
+def encode_row(counts, grow):
+    # Column ids and raw counts for one document; grow adds unseen terms to the vocabulary
+    if grow:
+        for term in counts:
+            if term not in _vocabulary:
+                _vocabulary[term] = len(_terms)
+                _terms.append(term)
+                _df.append(0)
+    else:
+        counts = {term: count for term, count in counts.items() if term in _vocabulary}
+    return [_vocabulary[term] for term in counts], list(counts.values())
+
+
+def rows_matrix(rows, width):
+    import numpy as np
+    from scipy import sparse
+    indptr = np.zeros(len(rows) + 1, dtype=np.int64)
+    indptr[1:] = np.cumsum([len(columns) for columns, _ in rows])
+    indices = np.fromiter((c for columns, _ in rows for c in columns), dtype=np.int32, count=indptr[-1])
+    data = np.fromiter((v for _, values in rows for v in values), dtype=np.float32, count=indptr[-1])
+    data = 1 + np.log(data)
+    return sparse.csr_matrix((data, indices, indptr), shape=(len(rows), width))
+
+
+def set_base(matrix, profile_ids):
+    import numpy as np
+    global _base, _base_sq, _base_ids, _live, _delta, _delta_matrix
+    _base = matrix
+    _base_sq = matrix.multiply(matrix).tocsr()
+    _base_ids = np.asarray(profile_ids, dtype=np.int64)
+    _live = np.ones(len(profile_ids), dtype=bool)
+    _delta, _delta_matrix = [], None
+    _where.clear()
+    _where.update((profile_id, ('base', i)) for i, profile_id in enumerate(profile_ids))
+
+
+def row_columns(profile_id):
+    place = _where.get(profile_id)
+    if place is None:
+        return None
+    segment, i = place
+    if segment == 'base':
+        return _base.indices[_base.indptr[i]:_base.indptr[i + 1]]
+    return _delta[i][1]
+
+
+def index_profile(profile_id, profile, updated=None):
+    global _delta_matrix
+    old_columns = row_columns(profile_id)
+    if old_columns is not None:
+        for column in old_columns:
+            _df[column] -= 1
+        segment, i = _where[profile_id]
+        if segment == 'base':
+            _live[i] = False
+        else:
+            _delta[i] = (None, [], [])
+    columns, values = encode_row(profile_counts(profile), grow=True)
+    for column in columns:
+        _df[column] += 1
+    _where[profile_id] = ('delta', len(_delta))
+    _delta.append((profile_id, columns, values))
+    _delta_matrix = None
+    if updated is not None:
+        _doc_updated[profile_id] = updated
+    if len(_delta) >= COMPACT_ROWS:
+        compact()
+
+
+def compact():
+    from scipy import sparse
+    live = [i for i, entry in enumerate(_delta) if entry[0] is not None]
+    keep = _live.nonzero()[0]
+    width = len(_terms)
+    base = _base[keep]
+    base.resize((base.shape[0], width))
+    matrix = sparse.vstack([base, rows_matrix([_delta[i][1:] for i in live], width)], format='csr')
+    set_base(matrix, list(_base_ids[keep]) + [_delta[i][0] for i in live])
+
+
+def build():
+    global _last_seen
+    rows, profile_ids = [], []
+    _vocabulary.clear()
+    _terms.clear()
+    _df.clear()
+    _doc_updated.clear()
+    for profile_id, updated, profile in profile_store.current_data():
+        columns, values = encode_row(profile_counts(profile), grow=True)
+        for column in columns:
+            _df[column] += 1
+        rows.append((columns, values))
+        profile_ids.append(profile_id)
+        _doc_updated[profile_id] = updated
+    set_base(rows_matrix(rows, len(_terms)), profile_ids)
+    _last_seen = max(_doc_updated.values(), default=0.0)
+    logging.info("Built JD match matrix: %d profiles, %d terms, %d entries", len(profile_ids), len(_terms), _base.nnz)
+
+
+def start_build():
+    # Builds the matrix on a background thread unless it is built or being built
+    global _builder
+    with _builder_lock:
+        if _builder is None and _last_seen is None:
+            _builder = threading.Thread(target=background_build, name='jd-match-build', daemon=True)
+            _builder.start()
+
+
+def background_build():
+    global _builder, _last_refresh
+    start = time.perf_counter()
+    try:
+        with _lock:
+            if _last_seen is None:
+                build()
+                _last_refresh = time.monotonic()
+        logging.info("JD match matrix ready in %.2fs", time.perf_counter() - start)
+    except Exception as e:
+        logging.error("Failed to build JD match matrix: %s", e, exc_info=True)
+    finally:
+        with _builder_lock:
+            _builder = None
+
+
+def refresh():
+    global _last_seen, _last_refresh
+    now = time.monotonic()
+    if _last_seen is None:
+        build()
+        _last_refresh = now
+        return
+    if now - _last_refresh < REFRESH_INTERVAL:
+        return
+    _last_refresh = now
+    changed = [profile_id for profile_id, updated in profile_store.updated_since(_last_seen - REFRESH_OVERLAP)
+               if _doc_updated.get(profile_id) != updated]
+    if len(changed) > max(COMPACT_ROWS, len(_where) // 10):
+        build()
+        return
+    for start in range(0, len(changed), 500):
+        for profile_id, updated, profile in profile_store.current_data(changed[start:start + 500]):
+            index_profile(profile_id, profile, updated)
+            _last_seen = max(_last_seen, updated)
+
+
+def update(profile_id, profile):
+    # Called after this worker saves a profile; other workers catch up in refresh(),
+    # and so does this one when the save lands while the matrix is being built
+    if _last_seen is None:
+        return
+    with _lock:
+        index_profile(profile_id, profile)
+
+
+def segment_scores(matrix, matrix_sq, weighted_query, idf_sq):
+    import numpy as np
+    norms = np.sqrt(matrix_sq @ idf_sq)
+    norms[norms == 0] = 1.0
+    return (matrix @ weighted_query) / norms
+
+
+def top_terms(profile_id, weights, count=5):
+    columns = row_columns(profile_id)
+    matched = []
+    for _, term in sorted(((weights[c], _terms[c]) for c in columns if weights[c] > 0), reverse=True):
+        term = term.replace('skill:', '', 1)
+        if term not in matched:
+            matched.append(term)
+    return matched[:count]
+
+
+def rank(text, limit=10):
+    # Returns [(profile_id, score, matched_terms)] best first
+    import numpy as np
+    global _delta_matrix
+    if _last_seen is None:
+        start_build()
+        raise NotReady("Profile matching is starting up, try again shortly")
+    with _lock:
+        refresh()
+        counts = query_counts(text)
+        columns, values = encode_row(counts, grow=False)
+        if not columns or not _where:
+            return []
+        width = len(_terms)
+        df = np.asarray(_df, dtype=np.float32)
+        idf = (np.log((1 + len(_where)) / (1 + df)) + 1).astype(np.float32)
+        query = np.zeros(width, dtype=np.float32)
+        query[columns] = 1 + np.log(np.asarray(values, dtype=np.float32))
+        query *= idf
+        query /= np.linalg.norm(query) or 1.0
+        weighted_query = query * idf
+        idf_sq = idf * idf
+        base_width = _base.shape[1]
+        scores = segment_scores(_base, _base_sq, weighted_query[:base_width], idf_sq[:base_width])
+        scores[~_live] = -1.0
+        ids = _base_ids
+        if _delta:
+            if _delta_matrix is None:
+                matrix = rows_matrix([entry[1:] for entry in _delta], width)
+                _delta_matrix = (matrix, matrix.multiply(matrix).tocsr())
+            delta_scores = segment_scores(_delta_matrix[0], _delta_matrix[1], weighted_query, idf_sq)
+            delta_ids = np.array([entry[0] if entry[0] is not None else -1 for entry in _delta], dtype=np.int64)
+            delta_scores[delta_ids < 0] = -1.0
+            scores = np.concatenate([scores, delta_scores])
+            ids = np.concatenate([ids, delta_ids])
+        limit = min(limit, MAX_RESULTS, len(scores))
+        best = np.argpartition(-scores, limit - 1)[:limit]
+        best = best[np.argsort(-scores[best])]
+        return [(int(ids[i]), float(scores[i]), top_terms(int(ids[i]), weighted_query)) for i in best if scores[i] > 0]
+
+
+def _reset_after_fork():
+    global _lock, _builder_lock, _builder
+    _lock = threading.Lock()
+    _builder_lock = threading.Lock()
+    _builder = None
+
+
+os.register_at_fork(after_in_child=_reset_after_fork)
@@ -0,0 +1,273 @@
+import re
+import json
+
+# Tolerant reader for JSON written by a model. It makes one pass over the
+# text and repairs what Gemini gets wrong most often:
+#   - prose or code fences around the document, and text after it
+#   - trailing or doubled commas, missing commas between members
+#   - raw newlines and tabs inside strings, unescaped inner quotes
+#   - single-quoted strings, unquoted keys, Python's True/False/None
+#   - // and /* */ comments
+# Output cut off mid-document (a token limit) keeps every member that was
+# complete: the cut member is dropped, except an object member holding an
+# object or array, which is kept with whatever it had completed, and the
+# open containers are closed. Result.cut_keys names the top-level members
+# kept that way, for callers that need each member whole.
+FENCE_RE = re.compile(r'```(?:json|JSON)?[ \t]*\n?(.*?)(?:```|$)', re.DOTALL)
+NUMBER_RE = re.compile(r'-?(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?')
+LITERALS = {'true': True, 'false': False, 'null': None, 'True': True, 'False': False, 'None': None}
+BARE_END = ',:}]\n'
+PLAIN_RUN = {quote: re.compile(r'[^\\\n\r\t%s]+' % quote) for quote in '"\''}
+SPACE_RE = re.compile(r'[ \t\r\n\ufeff]+')
+AFTER_STRING = ',:}]"\''
+
+
+class _Truncated(Exception):
+    def __init__(self, partial=None):
+        self.partial = partial
+
+
+class Result:
+    def __init__(self, value, repairs, truncated, cut_keys):
+        self.value = value
+        self.repairs = repairs
+        self.truncated = truncated
+        self.cut_keys = cut_keys
+
+
+class _Reader:
+    def __init__(self, text):
+        self.text = text
+        self.pos = 0
+        self.depth = 0
+        self.repairs = set()
+        self.cut_keys = []
+
+    def skip(self):
+        text = self.text
+        while self.pos < len(text):
+            ch = text[self.pos]
+            if ch in ' \t\r\n\ufeff':
+                self.pos = SPACE_RE.match(text, self.pos).end()
+            elif text.startswith('//', self.pos):
+                end = text.find('\n', self.pos)
+                self.pos = len(text) if end < 0 else end
+                self.repairs.add('comment')
+            elif text.startswith('/*', self.pos):
+                end = text.find('*/', self.pos + 2)
+                self.pos = len(text) if end < 0 else end + 2
+                self.repairs.add('comment')
+            else:
+                return
+
+    def peek(self):
+        self.skip()
+        return self.text[self.pos] if self.pos < len(self.text) else None
+
+    def value(self):
+        ch = self.peek()
+        if ch is None:
+            raise _Truncated()
+        if ch == '{':
+            return self.object()
+        if ch == '[':
+            return self.array()
+        if ch in '"\'':
+            return self.string()
+        match = NUMBER_RE.match(self.text, self.pos)
+        if match:
+            self.pos = match.end()
+            if self.pos >= len(self.text):
+                raise _Truncated()
+            number = match.group()
+            return float(number) if any(c in number for c in '.eE') else int(number)
+        return self.bare()
+
+    def bare(self):
+        start = self.pos
+        while self.pos < len(self.text) and self.text[self.pos] not in BARE_END:
+            self.pos += 1
+        if self.pos >= len(self.text):
+            raise _Truncated()
+        word = self.text[start:self.pos].strip()
+        if word in LITERALS:
+            if word not in ('true', 'false', 'null'):
+                self.repairs.add('python_literal')
+            return LITERALS[word]
+        if not word:
+            raise ValueError(f"Unexpected {self.text[self.pos]!r} at {self.pos}")
+        self.repairs.add('unquoted')
+        return word
+
+    def string(self):
+        text = self.text
+        quote = text[self.pos]
+        if quote == "'":
+            self.repairs.add('single_quotes')
+        self.pos += 1
+        plain = PLAIN_RUN[quote]
+        out = []
+        while True:
+            run = plain.match(text, self.pos)
+            if run:
+                out.append(run.group())
+                self.pos = run.end()
+            if self.pos >= len(text):
+                raise _Truncated()
+            ch = text[self.pos]
+            if ch == '\\':
+                if self.pos + 1 >= len(text):
+                    raise _Truncated()
+                escape = text[self.pos:self.pos + 2]
+                if escape[1] == 'u':
+                    if self.pos + 6 > len(text):
+                        raise _Truncated()
+                    escape = text[self.pos:self.pos + 6]
+                try:
+                    out.append(json.loads(f'"{escape}"'))
+                except ValueError:
+                    out.append(escape[1])
+                    self.repairs.add('bad_escape')
+                self.pos += len(escape)
+                continue
+            if ch == quote:
+                # A quote followed by a word rather than a delimiter or another string is part of the string
+                rest = text[self.pos + 1:self.pos + 200].lstrip(' \t\r\n')
+                if rest and rest[0] not in AFTER_STRING and not rest.startswith(('//', '/*', '```')):
+                    self.repairs.add('inner_quote')
+                    out.append(ch)
+                    self.pos += 1
+                    continue
+                self.pos += 1
+                return ''.join(out)
+            if ch in '\n\r\t':
+                self.repairs.add('control_char')
+            out.append(ch)
+            self.pos += 1
+
+    def key(self):
+        if self.peek() in '"\'':
+            return self.string()
+        start = self.pos
+        while self.pos < len(self.text) and self.text[self.pos] not in ':,}\n':
+            self.pos += 1
+        if self.pos >= len(self.text):
+            raise _Truncated()
+        self.repairs.add('unquoted')
+        return self.text[start:self.pos].strip()
+
+    def object(self):
+        self.depth += 1
+        try:
+            return self.members()
+        finally:
+            self.depth -= 1
+
+    def members(self):
+        self.pos += 1
+        result = {}
+        expect_member = True
+        while True:
+            ch = self.peek()
+            if ch is None:
+                raise _Truncated(result)
+            if ch == '}':
+                if expect_member and result:
+                    self.repairs.add('trailing_comma')
+                self.pos += 1
+                return result
+            if ch == ',':
+                if expect_member:
+                    self.repairs.add('extra_comma')
+                self.pos += 1
+                expect_member = True
+                continue
+            if ch == ']':
+                self.repairs.add('mismatched_bracket')
+                self.pos += 1
+                return result
+            if not expect_member:
+                self.repairs.add('missing_comma')
+            try:
+                key = self.key()
+            except _Truncated:
+                raise _Truncated(result)
+            if self.peek() == ':':
+                self.pos += 1
+            elif self.peek() is None:
+                raise _Truncated(result)
+            else:
+                self.repairs.add('missing_colon')
+            try:
+                result[key] = self.value()
+            except _Truncated as e:
+                if isinstance(e.partial, (dict, list)):
+                    result[key] = e.partial
+                    if self.depth == 1:
+                        self.cut_keys.append(key)
+                raise _Truncated(result)
+            expect_member = False
+
+    def array(self):
+        self.depth += 1
+        try:
+            return self.items()
+        finally:
+            self.depth -= 1
+
+    def items(self):
+        self.pos += 1
+        result = []
+        expect_item = True
+        while True:
+            ch = self.peek()
+            if ch is None:
+                raise _Truncated(result)
+            if ch == ']':
+                if expect_item and result:
+                    self.repairs.add('trailing_comma')
+                self.pos += 1
+                return result
+            if ch == ',':
+                if expect_item:
+                    self.repairs.add('extra_comma')
+                self.pos += 1
+                expect_item = True
+                continue
+            if ch == '}':
+                self.repairs.add('mismatched_bracket')
+                self.pos += 1
+                return result
+            if not expect_item:
+                self.repairs.add('missing_comma')
+            try:
+                result.append(self.value())
+            except _Truncated:
+                raise _Truncated(result)
+            expect_item = False
+
+
+def document_text(text):
+    # The first fenced block if there is one, otherwise everything from the first { or [
+    match = FENCE_RE.search(text)
+    if match and re.search(r'[\[{]', match.group(1)):
+        text = match.group(1)
+    starts = [i for i in (text.find('{'), text.find('[')) if i >= 0]
+    if not starts:
+        raise ValueError("No JSON object or array in the text")
+    return text[min(starts):]
+
+
+def parse(text):
+    # Returns a Result; raises ValueError when not even a partial document can be read
+    reader = _Reader(document_text(text))
+    truncated = False
+    try:
+        value = reader.value()
+    except _Truncated as e:
+        if e.partial is None:
+            raise ValueError("Output ends before any complete JSON value")
+        value, truncated = e.partial, True
+    if reader.peek() is not None:
+        reader.repairs.add('trailing_text')
+    return Result(value, sorted(reader.repairs), truncated, reader.cut_keys)
@@ -0,0 +1,216 @@
+import os
+import time
+import socket
+import logging
+import itertools
+import threading
+
+from metrics import LLM_CONNECTIONS_OPENED, LLM_CONNECT_SECONDS, LLM_CONNECTION_REQUEST_SECONDS
+
+# Gemini client layer. get_model() attaches these clients to every
+# GenerativeModel in place of the SDK's per-process defaults, whose REST
+# session keeps at most 10 idle connections and whose gRPC channel is shared
+# by everything in the process.
+#   rest  one session per process with up to LLM_POOL_SIZE pooled keep-alive
+#         connections (TCP keepalive after LLM_KEEPALIVE_SECONDS idle), so
+#         the DNS lookup and TLS handshake happen once per connection rather
+#         than per call. Calls beyond the pool use short-lived connections.
+#   grpc  LLM_GRPC_CHANNELS channels used round robin, each with its own
+#         HTTP/2 connection and keepalive pings every LLM_KEEPALIVE_SECONDS.
+#         The async client opens its own channels on the backend loop.
+# GEMINI_TRANSPORT picks the transport (grpc by default, as in the SDK);
+# GEMINI_API_ENDPOINT overrides the host, e.g. http://127.0.0.1:8089 for the
+# REST stand-in in benchmarks/gemini_standin.py. Connections opened, connect
+# time (DNS, TCP and TLS) and request latency per connection (new or reused
+# for REST, the channel for gRPC) are exported as metrics.
+# LLM_CLIENT_POOL=0 leaves the SDK's own clients in place.
+LLM_CLIENT_POOL = os.getenv('LLM_CLIENT_POOL', '1') == '1'
+LLM_TRANSPORT = 'rest' if os.getenv('GEMINI_TRANSPORT') == 'rest' else 'grpc'
+GEMINI_API_ENDPOINT = os.getenv('GEMINI_API_ENDPOINT', '')
+LLM_POOL_SIZE = int(os.getenv('LLM_POOL_SIZE', '16'))
+LLM_GRPC_CHANNELS = int(os.getenv('LLM_GRPC_CHANNELS', '2'))
+LLM_KEEPALIVE_SECONDS = int(os.getenv('LLM_KEEPALIVE_SECONDS', '30'))
+
+_lock = threading.Lock()
+_pools = {}
+_connect = threading.local()
+_adapter_class = None
+
+
+def client_options(api_key):
+    options = {'api_key': api_key}
+    if GEMINI_API_ENDPOINT:
+        options['api_endpoint'] = GEMINI_API_ENDPOINT
+    return options
+
+
+def keepalive_socket_options():
+    options = [(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)]
+    if hasattr(socket, 'TCP_KEEPIDLE'):
+        options += [(socket.IPPROTO_TCP, socket.TCP_KEEPIDLE, LLM_KEEPALIVE_SECONDS),
+                    (socket.IPPROTO_TCP, socket.TCP_KEEPINTVL, LLM_KEEPALIVE_SECONDS)]
+    return options
+
+
+def pooled_adapter():
+    # requests/urllib3 are only imported once a REST client is built
+    global _adapter_class
+    if _adapter_class is None:
+        from requests.adapters import HTTPAdapter
+        from urllib3.connection import HTTPConnection, HTTPSConnection
+        from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+        def timed_connect(connection_class):
+            class TimedConnection(connection_class):
+                def connect(self):
+                    start = time.perf_counter()
+                    super().connect()
+                    LLM_CONNECT_SECONDS.labels(transport='rest').observe(time.perf_counter() - start)
+                    LLM_CONNECTIONS_OPENED.labels(transport='rest').inc()
+                    _connect.opened = True
+            return TimedConnection
+
+        class TimedHTTPConnectionPool(HTTPConnectionPool):
+            ConnectionCls = timed_connect(HTTPConnection)
+
+        class TimedHTTPSConnectionPool(HTTPSConnectionPool):
+            ConnectionCls = timed_connect(HTTPSConnection)
+
+        class PooledAdapter(HTTPAdapter):
+            def init_poolmanager(self, *args, **kwargs):
+                kwargs['socket_options'] = HTTPConnection.default_socket_options + keepalive_socket_options()
+                super().init_poolmanager(*args, **kwargs)
+                self.poolmanager.pool_classes_by_scheme = {'http': TimedHTTPConnectionPool, 'https': TimedHTTPSConnectionPool}
+
+            def send(self, request, **kwargs):
+                _connect.opened = False
+                start = time.perf_counter()
+                try:
+                    return super().send(request, **kwargs)
+                finally:
+                    LLM_CONNECTION_REQUEST_SECONDS.labels(
+                        transport='rest', connection='new' if _connect.opened else 'reused').observe(time.perf_counter() - start)
+
+        _adapter_class = PooledAdapter
+    return _adapter_class(pool_connections=1, pool_maxsize=LLM_POOL_SIZE, max_retries=0)
+
+
+def rest_transport(**kwargs):
+    from google.ai.generativelanguage_v1beta.services.generative_service.transports import GenerativeServiceRestTransport
+    transport = GenerativeServiceRestTransport(**kwargs)
+    adapter = pooled_adapter()
+    transport._session.mount('https://', adapter)
+    transport._session.mount('http://', adapter)
+    return transport
+
+
+def grpc_options():
+    return [
+        ('grpc.keepalive_time_ms', LLM_KEEPALIVE_SECONDS * 1000),
+        ('grpc.keepalive_timeout_ms', 10000),
+        ('grpc.keepalive_permit_without_calls', 1),
+        ('grpc.http2.max_pings_without_data', 0),
+        # Each channel gets its own connection instead of sharing the process-wide one
+        ('grpc.use_local_subchannel_pool', 1),
+    ]
+
+
+def grpc_transport(asynchronous):
+    from google.ai.generativelanguage_v1beta.services.generative_service import transports
+    transport_class = transports.GenerativeServiceGrpcAsyncIOTransport if asynchronous else transports.GenerativeServiceGrpcTransport
+
+    def create_channel(host, **kwargs):
+        kwargs['options'] = list(kwargs.get('options') or []) + grpc_options()
+        channel = transport_class.create_channel(host, **kwargs)
+        if not asynchronous:
+            channel.subscribe(channel_state_changed)
+        return channel
+
+    return lambda **kwargs: transport_class(channel=create_channel, **kwargs)
+
+
+def channel_state_changed(state):
+    if state.name == 'READY':
+        LLM_CONNECTIONS_OPENED.labels(transport='grpc').inc()
+
+
+def build_pool(api_key, asynchronous):
+    import google.generativeai as genai
+    import google.ai.generativelanguage as glm
+    from google.api_core import gapic_v1
+    client_class = glm.GenerativeServiceAsyncClient if asynchronous else glm.GenerativeServiceClient
+    client_info = gapic_v1.client_info.ClientInfo(user_agent=f"genai-py/{genai.__version__}")
+    if LLM_TRANSPORT == 'rest':
+        clients = [client_class(client_options=client_options(api_key), client_info=client_info, transport=rest_transport)]
+    else:
+        clients = [client_class(client_options=client_options(api_key), client_info=client_info, transport=grpc_transport(asynchronous))
+                   for _ in range(max(1, LLM_GRPC_CHANNELS))]
+    logging.info("Built %s Gemini %s client pool: %d client(s), REST pool size %d", 'async' if asynchronous else 'sync',
+                 LLM_TRANSPORT, len(clients), LLM_POOL_SIZE)
+    return clients, itertools.count()
+
+
+def pick(api_key, asynchronous):
+    # (connection label, client) for the next call
+    pool = _pools.get(asynchronous)
+    if pool is None:
+        with _lock:
+            pool = _pools.get(asynchronous)
+            if pool is None:
+                pool = _pools[asynchronous] = build_pool(api_key, asynchronous)
+    clients, counter = pool
+    index = next(counter) % len(clients)
+    return f"channel-{index}", clients[index]
+
+
+class ClientPool:
+    # Takes the place of GenerativeModel._client (google-generativeai 0.7.2)
+    def __init__(self, api_key):
+        self.api_key = api_key
+
+    def generate_content(self, request, **kwargs):
+        label, client = pick(self.api_key, False)
+        if LLM_TRANSPORT == 'rest':
+            return client.generate_content(request, **kwargs)
+        start = time.perf_counter()
+        try:
+            return client.generate_content(request, **kwargs)
+        finally:
+            LLM_CONNECTION_REQUEST_SECONDS.labels(transport='grpc', connection=label).observe(time.perf_counter() - start)
+
+    def __getattr__(self, name):
+        return getattr(pick(self.api_key, False)[1], name)
+
+
+class AsyncClientPool:
+    # Takes the place of GenerativeModel._async_client; built on first use, on the loop that awaits it
+    def __init__(self, api_key):
+        self.api_key = api_key
+
+    async def generate_content(self, request, **kwargs):
+        label, client = pick(self.api_key, True)
+        start = time.perf_counter()
+        try:
+            return await client.generate_content(request, **kwargs)
+        finally:
+            LLM_CONNECTION_REQUEST_SECONDS.labels(transport='grpc', connection=label).observe(time.perf_counter() - start)
+
+    def __getattr__(self, name):
+        return getattr(pick(self.api_key, True)[1], name)
+
+
+def attach(model, api_key):
+    model._client = ClientPool(api_key)
+    if LLM_TRANSPORT != 'rest':
+        # Without an async REST client async_backends runs REST calls in threads instead
+        model._async_client = AsyncClientPool(api_key)
+    return model
+
+
+def _reset_after_fork():
+    global _lock
+    _lock = threading.Lock()
+    _pools.clear()
+
+
+os.register_at_fork(after_in_child=_reset_after_fork)
@@ -0,0 +1,332 @@
+import os
+import time
+import fcntl
+import random
+import asyncio
+import logging
+import tempfile
+import threading
+from collections import deque
+from concurrent import futures
+
+from metrics import LLM_CALLS, LLM_RETRIES, LLM_QUEUED, LLM_QUEUE_WAIT, LLM_BREAKER_OPEN, LLM_HEDGES
+
+# Every Gemini call goes through call() or call_async(), which add:
+#   admission  a token bucket shared by all workers on the host (a small
+#              file under flock), refilled at LLM_RATE_PER_MINUTE up to
+#              LLM_BURST. A call that would have to wait past its deadline
+#              is rejected instead of queued.
+#   deadline   LLM_DEADLINE seconds per call, covering queueing, every
+#              attempt and the backoff between them.
+#   retries    up to LLM_MAX_RETRIES for 429, 5xx, timeouts and connection
+#              errors, with full-jitter exponential backoff.
+#   breaker    after LLM_BREAKER_FAILURES consecutive upstream failures the
+#              worker fails fast for LLM_BREAKER_COOLDOWN seconds, then lets
+#              a single probe through.
+#   hedging    for tasks called with hedge=True, an attempt that has not
+#              answered after the task's recent LLM_HEDGE_QUANTILE latency
+#              is sent a second time and the first answer wins. The
+#              duplicate needs a rate limit token without queueing, and at
+#              most LLM_HEDGE_BUDGET of the task's recent calls are hedged.
+#              Until LLM_HEDGE_MIN_SAMPLES latencies are known the delay is
+#              LLM_HEDGE_DELAY. Sync hedged calls run both attempts on a
+#              pool of LLM_HEDGE_THREADS, two per request thread
+#              (GUNICORN_THREADS) by default: time queued for that pool
+#              would count as latency and set off more hedges.
+LLM_RATE_PER_MINUTE = float(os.getenv('LLM_RATE_PER_MINUTE', '300'))
+LLM_BURST = float(os.getenv('LLM_BURST', '30'))
+LLM_BUCKET_PATH = os.getenv('LLM_BUCKET_PATH', os.path.join(tempfile.gettempdir(), 'profile-maker-llm-bucket'))
+LLM_DEADLINE = float(os.getenv('LLM_DEADLINE', '60'))
+LLM_MAX_RETRIES = int(os.getenv('LLM_MAX_RETRIES', '3'))
+LLM_BACKOFF_BASE = float(os.getenv('LLM_BACKOFF_BASE', '0.5'))
+LLM_BACKOFF_MAX = float(os.getenv('LLM_BACKOFF_MAX', '8'))
+LLM_BREAKER_FAILURES = int(os.getenv('LLM_BREAKER_FAILURES', '5'))
+LLM_BREAKER_COOLDOWN = float(os.getenv('LLM_BREAKER_COOLDOWN', '30'))
+LLM_HEDGE_QUANTILE = float(os.getenv('LLM_HEDGE_QUANTILE', '0.95'))
+LLM_HEDGE_DELAY = float(os.getenv('LLM_HEDGE_DELAY', '3'))
+LLM_HEDGE_MIN_DELAY = float(os.getenv('LLM_HEDGE_MIN_DELAY', '0.25'))
+LLM_HEDGE_MIN_SAMPLES = int(os.getenv('LLM_HEDGE_MIN_SAMPLES', '20'))
+LLM_HEDGE_BUDGET = float(os.getenv('LLM_HEDGE_BUDGET', '0.1'))
+LLM_HEDGE_THREADS = int(os.getenv('LLM_HEDGE_THREADS', str(2 * int(os.getenv('GUNICORN_THREADS', '32')))))
+LATENCY_WINDOW = 200
+
+RETRYABLE_STATUS_CODES = {408, 429, 500, 502, 503, 504}
+RETRYABLE_ERROR_NAMES = {
+    'ResourceExhausted', 'TooManyRequests', 'ServiceUnavailable', 'InternalServerError',
+    'DeadlineExceeded', 'GatewayTimeout', 'BadGateway', 'RetryError',
+}
+
+_breaker_lock = threading.Lock()
+_breaker = {'failures': 0, 'opened_at': None, 'probing': False}
+_stats_lock = threading.Lock()
+_latencies = {}
+_hedged = {}
+_hedge_executor = None
+
+
+class LLMUnavailable(Exception):
+    """Raised without calling Gemini: the breaker is open or the deadline would pass in the queue."""
+
+
+def failure_reason(error):
+    # Returns a retry reason for transient upstream failures, None otherwise
+    code = getattr(error, 'code', None)
+    code = getattr(code, 'value', code)
+    if code == 429 or type(error).__name__ in ('ResourceExhausted', 'TooManyRequests'):
+        return 'rate_limited'
+    if isinstance(error, (TimeoutError, asyncio.TimeoutError)) or type(error).__name__ == 'DeadlineExceeded':
+        return 'timeout'
+    if isinstance(error, ConnectionError) or code in RETRYABLE_STATUS_CODES or type(error).__name__ in RETRYABLE_ERROR_NAMES:
+        return 'unavailable'
+    return None
+
+
+def reserve_token(max_wait):
+    # Takes a token, possibly on credit, and returns how long to wait for it;
+    # None when the wait would exceed max_wait (nothing is taken then)
+    if LLM_RATE_PER_MINUTE <= 0:
+        return 0.0
+    rate = LLM_RATE_PER_MINUTE / 60
+    with open(LLM_BUCKET_PATH, 'a+') as f:
+        fcntl.flock(f, fcntl.LOCK_EX)
+        try:
+            now = time.time()
+            f.seek(0)
+            try:
+                tokens, stamp = (float(value) for value in f.read().split())
+            except ValueError:
+                tokens, stamp = LLM_BURST, now
+            tokens = min(LLM_BURST, tokens + max(0.0, now - stamp) * rate)
+            wait = max(0.0, (1 - tokens) / rate)
+            if wait > max_wait:
+                return None
+            f.seek(0)
+            f.truncate()
+            f.write(f"{tokens - 1:.6f} {now:.6f}")
+            f.flush()
+            return wait
+        finally:
+            fcntl.flock(f, fcntl.LOCK_UN)
+
+
+def breaker_allows():
+    with _breaker_lock:
+        if _breaker['opened_at'] is None:
+            return True
+        if _breaker['probing'] or time.monotonic() - _breaker['opened_at'] < LLM_BREAKER_COOLDOWN:
+            return False
+        _breaker['probing'] = True
+        logging.info("LLM circuit half-open, sending a probe call")
+        return True
+
+
+def record_outcome(healthy):
+    with _breaker_lock:
+        if healthy:
+            if _breaker['opened_at'] is not None:
+                logging.info("LLM circuit closed")
+            _breaker.update(failures=0, opened_at=None, probing=False)
+            LLM_BREAKER_OPEN.set(0)
+            return
+        _breaker['failures'] += 1
+        if _breaker['probing'] or (_breaker['opened_at'] is None and _breaker['failures'] >= LLM_BREAKER_FAILURES):
+            logging.warning("LLM circuit open for %.0fs after %d consecutive failures", LLM_BREAKER_COOLDOWN, _breaker['failures'])
+            _breaker.update(opened_at=time.monotonic(), probing=False)
+            LLM_BREAKER_OPEN.set(1)
+
+
+def backoff_delay(attempt):
+    return random.uniform(0, min(LLM_BACKOFF_MAX, LLM_BACKOFF_BASE * 2 ** attempt))
+
+
+def admit(task, deadline):
+    # Returns the queue wait for this call, or raises LLMUnavailable
+    if not breaker_allows():
+        LLM_CALLS.labels(task=task, outcome='rejected_breaker').inc()
+        raise LLMUnavailable("Gemini is failing, not calling it for now")
+    wait = reserve_token(deadline - time.monotonic())
+    if wait is None:
+        with _breaker_lock:
+            _breaker['probing'] = False
+        LLM_CALLS.labels(task=task, outcome='rejected_queue').inc()
+        raise LLMUnavailable("Gemini rate limit queue is full")
+    return wait
+
+
+def next_delay(task, error, attempt, deadline):
+    # Returns the backoff before the next attempt, or None when the error should propagate
+    reason = failure_reason(error)
+    # Anything else (bad request, blocked prompt) still means Gemini answered
+    record_outcome(reason is None)
+    if reason is None or attempt >= LLM_MAX_RETRIES:
+        LLM_CALLS.labels(task=task, outcome='error').inc()
+        return None
+    delay = backoff_delay(attempt)
+    if time.monotonic() + delay >= deadline or not breaker_allows():
+        LLM_CALLS.labels(task=task, outcome='error').inc()
+        return None
+    LLM_RETRIES.labels(task=task, reason=reason).inc()
+    logging.warning("Gemini %s call failed (%s: %s), retry %d in %.2fs", task, reason, error, attempt + 1, delay)
+    return delay
+
+
+def record_latency(task, seconds, hedged):
+    with _stats_lock:
+        _latencies.setdefault(task, deque(maxlen=LATENCY_WINDOW)).append(seconds)
+        _hedged.setdefault(task, deque(maxlen=LATENCY_WINDOW)).append(hedged)
+
+
+def hedge_delay(task):
+    with _stats_lock:
+        latencies = sorted(_latencies.get(task, ()))
+    if len(latencies) < LLM_HEDGE_MIN_SAMPLES:
+        return LLM_HEDGE_DELAY
+    return max(LLM_HEDGE_MIN_DELAY, latencies[int(LLM_HEDGE_QUANTILE * (len(latencies) - 1))])
+
+
+def hedge_allowed(task):
+    with _stats_lock:
+        hedged = _hedged.get(task, ())
+        over_budget = bool(hedged) and sum(hedged) >= LLM_HEDGE_BUDGET * len(hedged)
+    if over_budget:
+        LLM_HEDGES.labels(task=task, outcome='skipped_budget').inc()
+        return False
+    if not breaker_allows() or reserve_token(0.0) is None:
+        LLM_HEDGES.labels(task=task, outcome='skipped_queue').inc()
+        return False
+    LLM_HEDGES.labels(task=task, outcome='sent').inc()
+    return True
+
+
+def hedge_executor():
+    global _hedge_executor
+    if _hedge_executor is None:
+        with _stats_lock:
+            if _hedge_executor is None:
+                _hedge_executor = futures.ThreadPoolExecutor(LLM_HEDGE_THREADS, thread_name_prefix='llm-hedge')
+    return _hedge_executor
+
+
+def hedged_attempt(task, request, deadline):
+    # One attempt, duplicated if it is slower than usual; returns the first answer
+    start = time.monotonic()
+    pending = {hedge_executor().submit(request, max(0.1, deadline - start))}
+    done, _ = futures.wait(pending, timeout=hedge_delay(task))
+    hedge = None
+    if not done and time.monotonic() < deadline and hedge_allowed(task):
+        hedge = hedge_executor().submit(request, max(0.1, deadline - time.monotonic()))
+        pending.add(hedge)
+    error = None
+    while pending:
+        done, pending = futures.wait(pending, return_when=futures.FIRST_COMPLETED)
+        for future in done:
+            if future.exception() is None:
+                record_latency(task, time.monotonic() - start, hedge is not None)
+                if future is hedge:
+                    LLM_HEDGES.labels(task=task, outcome='won').inc()
+                return future.result()
+            error = error or future.exception()
+    raise error
+
+
+async def hedged_attempt_async(task, request, deadline):
+    start = time.monotonic()
+    first = asyncio.ensure_future(asyncio.wait_for(request(max(0.1, deadline - start)), max(0.1, deadline - start)))
+    pending = {first}
+    done, _ = await asyncio.wait(pending, timeout=hedge_delay(task))
+    hedge = None
+    if not done and time.monotonic() < deadline and await asyncio.to_thread(hedge_allowed, task):
+        remaining = max(0.1, deadline - time.monotonic())
+        hedge = asyncio.ensure_future(asyncio.wait_for(request(remaining), remaining))
+        pending.add(hedge)
+    error = None
+    try:
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task_future in done:
+                if task_future.exception() is None:
+                    record_latency(task, time.monotonic() - start, hedge is not None)
+                    if task_future is hedge:
+                        LLM_HEDGES.labels(task=task, outcome='won').inc()
+                    return task_future.result()
+                error = error or task_future.exception()
+        raise error
+    finally:
+        for task_future in pending:
+            task_future.cancel()
+
+
+def call(task, request, deadline_seconds=None, hedge=False):
+    # request(timeout) performs one attempt with the given per-attempt timeout
+    deadline = time.monotonic() + (deadline_seconds or LLM_DEADLINE)
+    attempt = 0
+    while True:
+        wait = admit(task, deadline)
+        if wait:
+            LLM_QUEUED.inc()
+            try:
+                time.sleep(wait)
+            finally:
+                LLM_QUEUED.dec()
+        LLM_QUEUE_WAIT.labels(task=task).observe(wait)
+        try:
+            if hedge:
+                response = hedged_attempt(task, request, deadline)
+            else:
+                start = time.monotonic()
+                response = request(max(0.1, deadline - start))
+                record_latency(task, time.monotonic() - start, False)
+        except Exception as e:
+            delay = next_delay(task, e, attempt, deadline)
+            if delay is None:
+                raise
+            time.sleep(delay)
+            attempt += 1
+            continue
+        record_outcome(True)
+        LLM_CALLS.labels(task=task, outcome='ok').inc()
+        return response
+
+
+async def call_async(task, request, deadline_seconds=None, hedge=False):
+    # request(timeout) returns a coroutine for one attempt
+    deadline = time.monotonic() + (deadline_seconds or LLM_DEADLINE)
+    attempt = 0
+    while True:
+        # The bucket flock blocks, so it is taken off the shared loop thread
+        wait = await asyncio.to_thread(admit, task, deadline)
+        if wait:
+            LLM_QUEUED.inc()
+            try:
+                await asyncio.sleep(wait)
+            finally:
+                LLM_QUEUED.dec()
+        LLM_QUEUE_WAIT.labels(task=task).observe(wait)
+        start = time.monotonic()
+        remaining = max(0.1, deadline - start)
+        try:
+            if hedge:
+                response = await hedged_attempt_async(task, request, deadline)
+            else:
+                response = await asyncio.wait_for(request(remaining), remaining)
+                record_latency(task, time.monotonic() - start, False)
+        except Exception as e:
+            delay = next_delay(task, e, attempt, deadline)
+            if delay is None:
+                raise
+            await asyncio.sleep(delay)
+            attempt += 1
+            continue
+        record_outcome(True)
+        LLM_CALLS.labels(task=task, outcome='ok').inc()
+        return response
+
+
+def _reset_after_fork():
+    global _breaker_lock, _stats_lock, _hedge_executor
+    _breaker_lock = threading.Lock()
+    _stats_lock = threading.Lock()
+    _hedge_executor = None
+
+
+os.register_at_fork(after_in_child=_reset_after_fork)
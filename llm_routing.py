@@ -0,0 +1,79 @@
+import os
+import logging
+
+import llm_gateway
+
+# Per-task Gemini settings. Every call names its task and gets that task's
+# model, output token cap, temperature, deadline and hedging switch (see
+# llm_gateway.py). LLM_MODEL is the model for every task that does not set
+# its own; LLM_<SETTING>_<TASK> overrides one setting for one task, e.g.
+#   LLM_MODEL_BULLET_POINTS=gemini-1.5-flash-8b
+#   LLM_MAX_OUTPUT_TOKENS_GRAMMAR=2048
+#   LLM_HEDGE_GRAMMAR=1
+# A temperature or output token cap of 'default' leaves the model's own;
+# for the other settings 'default' means LLM_MODEL or the task's default.
+LLM_MODEL = os.getenv('LLM_MODEL', 'gemini-1.5-flash')
+
+TASK_DEFAULTS = {
+    'structured_data': {'max_output_tokens': 8192, 'temperature': 0.0, 'deadline': llm_gateway.LLM_DEADLINE, 'hedge': False},
+    'structured_patch': {'max_output_tokens': 8192, 'temperature': 0.0, 'deadline': 30.0, 'hedge': False},
+    'bullet_points': {'max_output_tokens': 1024, 'temperature': 0.3, 'deadline': 20.0, 'hedge': False},
+    'grammar': {'max_output_tokens': 4096, 'temperature': 0.0, 'deadline': 20.0, 'hedge': False},
+    'skill_buckets': {'max_output_tokens': 1024, 'temperature': 0.0, 'deadline': 20.0, 'hedge': False},
+}
+FALLBACK = {'max_output_tokens': None, 'temperature': None, 'deadline': llm_gateway.LLM_DEADLINE, 'hedge': False}
+
+
+class TaskSettings:
+    def __init__(self, model, max_output_tokens, temperature, deadline, hedge):
+        self.model = model
+        self.max_output_tokens = max_output_tokens
+        self.temperature = temperature
+        self.deadline = deadline
+        self.hedge = hedge
+
+
+def env_setting(name, task, default, parse, unset_ok=False):
+    value = os.getenv(f"LLM_{name.upper()}_{task.upper()}")
+    if value is None or not value.strip():
+        return default
+    if value.strip().lower() == 'default':
+        # Only the sampling settings can be left out of the request; a model name is always needed
+        return None if unset_ok else default
+    try:
+        return parse(value.strip())
+    except ValueError:
+        logging.warning("Ignoring LLM_%s_%s=%r", name.upper(), task.upper(), value)
+        return default
+
+
+def load(task):
+    defaults = TASK_DEFAULTS.get(task, FALLBACK)
+    return TaskSettings(
+        model=env_setting('model', task, LLM_MODEL, str),
+        max_output_tokens=env_setting('max_output_tokens', task, defaults['max_output_tokens'], int, unset_ok=True),
+        temperature=env_setting('temperature', task, defaults['temperature'], float, unset_ok=True),
+        deadline=env_setting('deadline', task, defaults['deadline'], float),
+        hedge=env_setting('hedge', task, defaults['hedge'], lambda value: value == '1'),
+    )
+
+
+SETTINGS = {task: load(task) for task in TASK_DEFAULTS}
+
+
+def settings(task):
+    if task not in SETTINGS:
+        SETTINGS[task] = load(task)
+    return SETTINGS[task]
+
+
+def generation_config(task, extra=None):
+    # The task's sampling settings merged under extra (response format and the like)
+    task_settings = settings(task)
+    config = {}
+    if task_settings.max_output_tokens:
+        config['max_output_tokens'] = task_settings.max_output_tokens
+    if task_settings.temperature is not None:
+        config['temperature'] = task_settings.temperature
+    config.update(extra or {})
+    return config or None
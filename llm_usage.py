@@ -0,0 +1,194 @@
+import os
+import sqlite3
+import logging
+import hashlib
+import threading
+from datetime import datetime, timedelta, timezone
+
+import llm_gateway
+from metrics import LLM_TOKENS, LLM_COST, LLM_BUDGET_REJECTIONS
+
+# Token and cost accounting for Gemini calls. The usage metadata of every
+# response (hedged duplicates included) is counted in Prometheus by task and
+# route, and added to a per-day table in SQLite, shared by all workers and
+# keyed by UTC day, client, route and task. The client is a hash of the
+# Flask session id, since the app has no accounts; calls made outside a
+# request count under route 'background'. Responses without usage metadata
+# are estimated at CHARS_PER_TOKEN.
+#
+# LLM_DAILY_TOKEN_BUDGET and LLM_DAILY_COST_BUDGET (USD) cap one client's
+# day; 0 leaves a cap off. check() runs before each call with the prompt
+# estimated the same way and raises BudgetExceeded once a cap would be
+# passed. summary() (and /usage) reports a day by route, task and client;
+# the first call of each day logs the previous day's summary.
+LLM_USAGE_ENABLED = os.getenv('LLM_USAGE', '1') == '1'
+# Relative paths are taken from the app's root (app.root_path, where this module sits), not the working directory
+LLM_USAGE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.getenv('LLM_USAGE_PATH', os.path.join('instance', 'llm_usage.db')))
+LLM_DAILY_TOKEN_BUDGET = int(os.getenv('LLM_DAILY_TOKEN_BUDGET', '0'))
+LLM_DAILY_COST_BUDGET = float(os.getenv('LLM_DAILY_COST_BUDGET', '0'))
+LLM_USAGE_RETENTION_DAYS = int(os.getenv('LLM_USAGE_RETENTION_DAYS', '90'))
+CHARS_PER_TOKEN = 4
+SUMMARY_TOP_CLIENTS = 20
+
+# USD per million tokens (prompt, output) for prompts up to 128k tokens
+PRICES = {
+    'gemini-1.5-flash': (0.075, 0.30),
+    'gemini-1.5-flash-8b': (0.0375, 0.15),
+    'gemini-1.5-pro': (1.25, 5.00),
+}
+DEFAULT_PRICE = PRICES['gemini-1.5-flash']
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS llm_usage (
+    day TEXT NOT NULL,
+    client TEXT NOT NULL,
+    route TEXT NOT NULL,
+    task TEXT NOT NULL,
+    calls INTEGER NOT NULL,
+    prompt_tokens INTEGER NOT NULL,
+    output_tokens INTEGER NOT NULL,
+    cost REAL NOT NULL,
+    PRIMARY KEY (day, client, route, task)
+);
+CREATE TABLE IF NOT EXISTS llm_usage_reports (
+    day TEXT PRIMARY KEY
+);
+"""
+
+_local = threading.local()
+_reported_day = None
+
+
+class BudgetExceeded(llm_gateway.LLMUnavailable):
+    """Raised without calling Gemini: the client has used its daily allowance."""
+
+
+def connection():
+    conn = getattr(_local, 'conn', None)
+    if conn is None:
+        os.makedirs(os.path.dirname(LLM_USAGE_PATH) or '.', exist_ok=True)
+        conn = sqlite3.connect(LLM_USAGE_PATH, timeout=10)
+        conn.row_factory = sqlite3.Row
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.executescript(SCHEMA)
+        _local.conn = conn
+    return conn
+
+
+def today():
+    return datetime.now(timezone.utc).strftime('%Y-%m-%d')
+
+
+def client_key(session_id):
+    return hashlib.sha256(session_id.encode('utf-8')).hexdigest()[:16] if session_id else ''
+
+
+def price(model_name):
+    return PRICES.get((model_name or '').removeprefix('models/'), DEFAULT_PRICE)
+
+
+def usage_counts(response, prompt):
+    # (prompt_tokens, output_tokens) from the SDK's usage_metadata or the stand-in's dict
+    usage = getattr(response, 'usage_metadata', None)
+    if isinstance(usage, dict):
+        prompt_tokens, output_tokens = usage.get('promptTokenCount'), usage.get('candidatesTokenCount')
+    else:
+        prompt_tokens = getattr(usage, 'prompt_token_count', None)
+        output_tokens = getattr(usage, 'candidates_token_count', None)
+    if not prompt_tokens:
+        prompt_tokens = len(prompt) // CHARS_PER_TOKEN
+        try:
+            output_tokens = len(response.text) // CHARS_PER_TOKEN
+        except Exception:
+            output_tokens = 0
+    return int(prompt_tokens), int(output_tokens or 0)
+
+
+def check(scope, prompt, model_name):
+    # Raises BudgetExceeded when this prompt would take the client past a daily cap
+    route, client = scope
+    if not LLM_USAGE_ENABLED or not client or not (LLM_DAILY_TOKEN_BUDGET or LLM_DAILY_COST_BUDGET):
+        return
+    used_tokens, used_cost = connection().execute(
+        'SELECT COALESCE(SUM(prompt_tokens + output_tokens), 0), COALESCE(SUM(cost), 0) FROM llm_usage WHERE day = ? AND client = ?',
+        (today(), client)).fetchone()
+    estimate = len(prompt) // CHARS_PER_TOKEN
+    over_tokens = LLM_DAILY_TOKEN_BUDGET and used_tokens + estimate > LLM_DAILY_TOKEN_BUDGET
+    over_cost = LLM_DAILY_COST_BUDGET and used_cost + estimate * price(model_name)[0] / 1e6 > LLM_DAILY_COST_BUDGET
+    if over_tokens or over_cost:
+        LLM_BUDGET_REJECTIONS.labels(route=route, budget='tokens' if over_tokens else 'cost').inc()
+        logging.warning("Client %s over its daily Gemini budget (%d tokens, $%.4f used)", client, used_tokens, used_cost)
+        raise BudgetExceeded("Daily AI usage limit reached")
+
+
+def record(task, model_name, scope, prompt, response):
+    if not LLM_USAGE_ENABLED:
+        return
+    route, client = scope
+    prompt_tokens, output_tokens = usage_counts(response, prompt)
+    prompt_price, output_price = price(model_name)
+    cost = (prompt_tokens * prompt_price + output_tokens * output_price) / 1e6
+    LLM_TOKENS.labels(task=task, route=route, kind='prompt').inc(prompt_tokens)
+    LLM_TOKENS.labels(task=task, route=route, kind='output').inc(output_tokens)
+    LLM_COST.labels(task=task, route=route).inc(cost)
+    day = today()
+    try:
+        with connection() as conn:
+            conn.execute(
+                'INSERT INTO llm_usage (day, client, route, task, calls, prompt_tokens, output_tokens, cost) '
+                'VALUES (?, ?, ?, ?, 1, ?, ?, ?) '
+                'ON CONFLICT (day, client, route, task) DO UPDATE SET calls = calls + 1, '
+                'prompt_tokens = prompt_tokens + excluded.prompt_tokens, '
+                'output_tokens = output_tokens + excluded.output_tokens, cost = cost + excluded.cost',
+                (day, client, route, task, prompt_tokens, output_tokens, cost))
+        if day != _reported_day:
+            report_previous_day(day)
+    except sqlite3.Error as e:
+        logging.error("Failed to record Gemini usage: %s", e)
+
+
+def report_previous_day(day):
+    # One worker per day wins the insert, logs yesterday's summary and prunes old rows
+    global _reported_day
+    _reported_day = day
+    with connection() as conn:
+        if conn.execute('INSERT OR IGNORE INTO llm_usage_reports (day) VALUES (?)', (day,)).rowcount == 0:
+            return
+        cutoff = (datetime.strptime(day, '%Y-%m-%d') - timedelta(days=LLM_USAGE_RETENTION_DAYS)).strftime('%Y-%m-%d')
+        conn.execute('DELETE FROM llm_usage WHERE day < ?', (cutoff,))
+        conn.execute('DELETE FROM llm_usage_reports WHERE day < ?', (cutoff,))
+    previous = (datetime.strptime(day, '%Y-%m-%d') - timedelta(days=1)).strftime('%Y-%m-%d')
+    report = summary(previous)
+    if report['total']['calls']:
+        logging.info("Gemini usage for %s: %d calls, %d prompt + %d output tokens, $%.4f; by task: %s",
+                     previous, report['total']['calls'], report['total']['prompt_tokens'], report['total']['output_tokens'],
+                     report['total']['cost'], {row['task']: row['cost'] for row in report['by_task']})
+
+
+def totals(day, column):
+    select = f"{column}, " if column else ''
+    group = f"GROUP BY {column} ORDER BY cost DESC" if column else ''
+    rows = connection().execute(
+        f'SELECT {select}COALESCE(SUM(calls), 0) AS calls, COALESCE(SUM(prompt_tokens), 0) AS prompt_tokens, '
+        f'COALESCE(SUM(output_tokens), 0) AS output_tokens, COALESCE(SUM(cost), 0) AS cost '
+        f'FROM llm_usage WHERE day = ? {group}', (day,)).fetchall()
+    return [dict(row, cost=round(row['cost'], 6)) for row in rows]
+
+
+def summary(day=None):
+    day = day or today()
+    return {
+        'day': day,
+        'total': totals(day, None)[0],
+        'by_route': totals(day, 'route'),
+        'by_task': totals(day, 'task'),
+        'top_clients': totals(day, 'client')[:SUMMARY_TOP_CLIENTS],
+    }
+
+
+def _reset_after_fork():
+    global _local
+    _local = threading.local()
+
+
+os.register_at_fork(after_in_child=_reset_after_fork)
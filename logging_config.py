@@ -0,0 +1,136 @@
+import os
+import copy
+import json
+import queue
+import atexit
+import random
+import logging
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+
+LOG_LEVEL = os.getenv('LOG_LEVEL', 'INFO').upper()
+LOG_FORMAT = os.getenv('LOG_FORMAT', 'text').lower()
+LOG_FILE = os.getenv('LOG_FILE', '')
+# Fraction of eligible payload dumps (profiles, AI responses, form data) that get logged.
+# Payloads contain candidate PII, so this is off unless explicitly enabled.
+LOG_PAYLOAD_SAMPLE_RATE = float(os.getenv('LOG_PAYLOAD_SAMPLE_RATE', '0'))
+LOG_PAYLOAD_MAX_CHARS = int(os.getenv('LOG_PAYLOAD_MAX_CHARS', '500'))
+
+TEXT_FORMAT = '%(asctime)s - %(levelname)s - %(message)s'
+
+_listener = None
+
+
+class JsonLogFormatter(logging.Formatter):
+    def format(self, record):
+        entry = {
+            'timestamp': datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+            'module': record.module,
+            'line': record.lineno,
+            'process': record.process,
+            'thread': record.threadName,
+        }
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry['exception'] = record.exc_text
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class DeferredQueueHandler(QueueHandler):
+    # The stock QueueHandler runs the whole formatter on the calling thread. Here only
+    # the message is formatted there (msg % args, so live objects are rendered as they
+    # were when logged, and args are then dropped); timestamps and layout are left to
+    # the listener.
+    def prepare(self, record):
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+def build_handlers():
+    formatter = JsonLogFormatter() if LOG_FORMAT == 'json' else logging.Formatter(TEXT_FORMAT)
+    handlers = [logging.StreamHandler()]
+    if LOG_FILE:
+        handlers.append(logging.FileHandler(LOG_FILE, encoding='utf-8'))
+    for handler in handlers:
+        handler.setFormatter(formatter)
+    return handlers
+
+
+def configure_logging():
+    global _listener
+    if _listener is not None:
+        return
+    log_queue = queue.SimpleQueue()
+    _listener = QueueListener(log_queue, *build_handlers(), respect_handler_level=True)
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    root.addHandler(DeferredQueueHandler(log_queue))
+    root.setLevel(getattr(logging, LOG_LEVEL, logging.INFO))
+    _listener.start()
+
+
+def stop_logging():
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+def _restart_after_fork():
+    # The listener thread does not survive fork (gunicorn --preload), so each
+    # worker needs its own queue and listener.
+    global _listener
+    if _listener is not None:
+        _listener = None
+        configure_logging()
+
+
+atexit.register(stop_logging)
+os.register_at_fork(after_in_child=_restart_after_fork)
+
+
+def truncate_payload(payload, max_chars=None):
+    max_chars = LOG_PAYLOAD_MAX_CHARS if max_chars is None else max_chars
+    text = payload if isinstance(payload, str) else json.dumps(payload, ensure_ascii=False, default=str)
+    if len(text) > max_chars:
+        return f"{text[:max_chars]}... [truncated, {len(text)} chars]"
+    return text
+
+
+def log_payload(label, payload, level=logging.DEBUG):
+    if LOG_PAYLOAD_SAMPLE_RATE <= 0 or not logging.getLogger().isEnabledFor(level):
+        return
+    if random.random() >= LOG_PAYLOAD_SAMPLE_RATE:
+        return
+    logging.log(level, "%s: %s", label, truncate_payload(payload), stacklevel=2)
+
+
+class ProfileSummary:
+    # Only rendered if the record is actually emitted
+    __slots__ = ('profile',)
+
+    def __init__(self, profile):
+        self.profile = profile
+
+    def __str__(self):
+        if not isinstance(self.profile, dict):
+            return type(self.profile).__name__
+        parts = []
+        for key, value in self.profile.items():
+            if isinstance(value, list):
+                parts.append(f"{key}[{len(value)}]")
+            elif isinstance(value, dict):
+                parts.append(f"{key}{{{sum(1 for v in value.values() if v)}}}")
+            else:
+                parts.append(f"{key}={'set' if value else 'empty'}")
+        return ', '.join(parts)
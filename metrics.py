@@ -0,0 +1,190 @@
+import os
+import time
+import logging
+from contextlib import contextmanager
+
+from prometheus_client import (
+    CollectorRegistry, Counter, Gauge, Histogram, CONTENT_TYPE_LATEST, generate_latest, REGISTRY
+)
+from prometheus_client import multiprocess
+
+# Under gunicorn each worker writes its samples to PROMETHEUS_MULTIPROC_DIR
+# (set up by gunicorn.conf.py) and /metrics merges them at scrape time.
+MULTIPROC_DIR = os.getenv('PROMETHEUS_MULTIPROC_DIR', '')
+
+STAGE_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 20, 40, 80, 120)
+
+STAGE_DURATION = Histogram(
+    'profile_stage_duration_seconds',
+    'Time spent in each pipeline stage',
+    ['stage', 'variant'],
+    buckets=STAGE_BUCKETS,
+)
+STAGE_TOTAL = Counter(
+    'profile_stage_total',
+    'Pipeline stage executions by outcome',
+    ['stage', 'variant', 'outcome'],
+)
+REQUEST_DURATION = Histogram(
+    'profile_request_duration_seconds',
+    'HTTP request latency by endpoint',
+    ['endpoint', 'method'],
+    buckets=STAGE_BUCKETS,
+)
+REQUESTS_IN_FLIGHT = Gauge(
+    'profile_requests_in_flight',
+    'Requests currently being handled, summed across workers',
+    multiprocess_mode='livesum',
+)
+CHROMIUM_BROWSERS = Gauge(
+    'profile_chromium_browsers',
+    'Chromium browsers by state',
+    ['state'],
+    multiprocess_mode='livesum',
+)
+CHROMIUM_LAUNCHES = Counter(
+    'profile_chromium_launches_total',
+    'Chromium browser launches',
+)
+CACHE_REQUESTS = Counter(
+    'profile_cache_requests_total',
+    'Cache lookups by cache and result',
+    ['cache', 'result'],
+)
+CACHE_HIT_RATIO = Gauge(
+    'profile_cache_hit_ratio',
+    'Hit ratio of each cache since worker start',
+    ['cache'],
+    multiprocess_mode='liveall',
+)
+
+LLM_CALLS = Counter(
+    'profile_llm_calls_total',
+    'Gemini calls through the gateway by final outcome',
+    ['task', 'outcome'],
+)
+LLM_RETRIES = Counter(
+    'profile_llm_retries_total',
+    'Gemini call retries by reason',
+    ['task', 'reason'],
+)
+LLM_QUEUED = Gauge(
+    'profile_llm_queued',
+    'Gemini calls waiting for a rate limit token, summed across workers',
+    multiprocess_mode='livesum',
+)
+LLM_QUEUE_WAIT = Histogram(
+    'profile_llm_queue_wait_seconds',
+    'Time Gemini calls spent waiting for a rate limit token',
+    ['task'],
+    buckets=STAGE_BUCKETS,
+)
+LLM_BREAKER_OPEN = Gauge(
+    'profile_llm_breaker_open',
+    'Whether the Gemini circuit breaker is open in each worker',
+    multiprocess_mode='liveall',
+)
+LLM_HEDGES = Counter(
+    'profile_llm_hedges_total',
+    'Hedged Gemini attempts: duplicates sent, duplicates that answered first, and hedges skipped',
+    ['task', 'outcome'],
+)
+LLM_TOKENS = Counter(
+    'profile_llm_tokens_total',
+    'Gemini tokens by task, route and kind (prompt or output)',
+    ['task', 'route', 'kind'],
+)
+LLM_COST = Counter(
+    'profile_llm_cost_usd_total',
+    'Estimated Gemini spend in USD by task and route',
+    ['task', 'route'],
+)
+LLM_BUDGET_REJECTIONS = Counter(
+    'profile_llm_budget_rejections_total',
+    'Gemini calls refused because the client was over a daily budget',
+    ['route', 'budget'],
+)
+LLM_CONNECTIONS_OPENED = Counter(
+    'profile_llm_connections_opened_total',
+    'Connections opened to the Gemini API by transport',
+    ['transport'],
+)
+LLM_CONNECT_SECONDS = Histogram(
+    'profile_llm_connect_seconds',
+    'Time to open a Gemini API connection (DNS, TCP and TLS)',
+    ['transport'],
+    buckets=STAGE_BUCKETS,
+)
+LLM_CONNECTION_REQUEST_SECONDS = Histogram(
+    'profile_llm_connection_request_seconds',
+    'Gemini API request latency per connection: new or reused for REST, the channel for gRPC',
+    ['transport', 'connection'],
+    buckets=STAGE_BUCKETS,
+)
+COALESCED_REQUESTS = Counter(
+    'profile_coalesced_requests_total',
+    'Duplicate in-flight requests that shared another request\'s result',
+    ['scope'],
+)
+RESUME_REUSE = Counter(
+    'profile_resume_reuse_total',
+    'Resume parses by how much of an earlier parse was reused',
+    ['outcome'],
+)
+RESUME_SIMILARITY = Histogram(
+    'profile_resume_similarity',
+    'Estimated Jaccard similarity of uploads to the closest earlier resume',
+    buckets=(0.1, 0.2, 0.3, 0.4, 0.5, 0.6, 0.7, 0.8, 0.85, 0.9, 0.95, 0.99, 1.0),
+)
+PARSE_SECONDS_SAVED = Counter(
+    'profile_parse_seconds_saved_total',
+    'Estimated parse time saved by reusing earlier parses',
+)
+SKILLS_CATEGORIZED = Counter(
+    'profile_skills_categorized_total',
+    'Parsed technical skills by who placed them: the local catalog, Gemini (unknown to the catalog), a text scan or nobody (put in tools)',
+    ['outcome'],
+)
+LLM_JSON_PARSES = Counter(
+    'profile_llm_json_parses_total',
+    'JSON responses from Gemini by how they parsed: clean, repaired, truncated (salvaged) or failed',
+    ['task', 'outcome'],
+)
+
+_cache_counts = {}
+
+
+@contextmanager
+def observe_stage(stage, variant=''):
+    start = time.perf_counter()
+    outcome = 'error'
+    try:
+        yield
+        outcome = 'ok'
+    finally:
+        elapsed = time.perf_counter() - start
+        observe_duration(stage, variant, elapsed, outcome)
+        logging.debug("Stage %s[%s] finished in %.1f ms (%s)", stage, variant, elapsed * 1000, outcome)
+
+
+def observe_duration(stage, variant, seconds, outcome='ok'):
+    STAGE_DURATION.labels(stage=stage, variant=variant).observe(seconds)
+    STAGE_TOTAL.labels(stage=stage, variant=variant, outcome=outcome).inc()
+
+
+def record_cache(cache, hit):
+    CACHE_REQUESTS.labels(cache=cache, result='hit' if hit else 'miss').inc()
+    hits, total = _cache_counts.get(cache, (0, 0))
+    hits, total = hits + (1 if hit else 0), total + 1
+    _cache_counts[cache] = (hits, total)
+    CACHE_HIT_RATIO.labels(cache=cache).set(hits / total)
+
+
+def metrics_payload():
+    if MULTIPROC_DIR:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return generate_latest(registry), CONTENT_TYPE_LATEST
+
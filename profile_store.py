@@ -0,0 +1,190 @@
+import os
+import json
+import time
+import sqlite3
+import logging
+import threading
+
+# Durable profile repository (SQLite, shared by every worker). Each save adds
+# a row to profile_versions; profiles holds one row per person with the
+# fields people look profiles up by, copied from the latest version and
+# indexed. Opening a stored profile is a primary-key read of one version.
+# Relative paths are taken from the app's root, not the working directory
+PROFILE_STORE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.getenv('PROFILE_STORE_PATH', os.path.join('instance', 'profiles.db')))
+PROFILE_STORE_ENABLED = os.getenv('PROFILE_STORE', '1') == '1'
+PROFILE_MAX_VERSIONS = int(os.getenv('PROFILE_MAX_VERSIONS', '20'))
+LIST_PAGE_SIZE = 50
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS profiles (
+    id INTEGER PRIMARY KEY,
+    employee_id TEXT NOT NULL DEFAULT '',
+    name TEXT NOT NULL DEFAULT '' COLLATE NOCASE,
+    designation TEXT NOT NULL DEFAULT '' COLLATE NOCASE,
+    current_version INTEGER NOT NULL,
+    created REAL NOT NULL,
+    updated REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS profiles_employee_id ON profiles (employee_id);
+CREATE INDEX IF NOT EXISTS profiles_name ON profiles (name);
+CREATE INDEX IF NOT EXISTS profiles_designation ON profiles (designation);
+CREATE INDEX IF NOT EXISTS profiles_updated ON profiles (updated);
+CREATE TABLE IF NOT EXISTS profile_versions (
+    profile_id INTEGER NOT NULL REFERENCES profiles(id) ON DELETE CASCADE,
+    version INTEGER NOT NULL,
+    data TEXT NOT NULL,
+    hidden_sections TEXT NOT NULL,
+    hidden_dates TEXT NOT NULL,
+    design TEXT NOT NULL,
+    source TEXT NOT NULL,
+    created REAL NOT NULL,
+    PRIMARY KEY (profile_id, version)
+);
+"""
+
+_local = threading.local()
+
+
+def connection():
+    conn = getattr(_local, 'conn', None)
+    if conn is None:
+        os.makedirs(os.path.dirname(PROFILE_STORE_PATH) or '.', exist_ok=True)
+        conn = sqlite3.connect(PROFILE_STORE_PATH, timeout=10)
+        conn.row_factory = sqlite3.Row
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute('PRAGMA foreign_keys=ON')
+        conn.executescript(SCHEMA)
+        _local.conn = conn
+    return conn
+
+
+def lookup_fields(profile):
+    details = profile.get('personal_details') or {}
+    return (
+        (details.get('employee_id') or '').strip(),
+        (profile.get('name') or '').strip(),
+        (details.get('designation') or '').strip(),
+    )
+
+
+def save(profile, hidden_sections, hidden_dates, design, source, profile_id=None):
+    # Adds a version to profile_id, or to the profile with the same employee_id,
+    # or creates a new profile; returns (profile_id, version)
+    employee_id, name, designation = lookup_fields(profile)
+    now = time.time()
+    conn = connection()
+    with conn:
+        row = None
+        if profile_id is not None:
+            row = conn.execute('SELECT id, current_version FROM profiles WHERE id = ?', (profile_id,)).fetchone()
+        if row is None and employee_id:
+            row = conn.execute('SELECT id, current_version FROM profiles WHERE employee_id = ? ORDER BY updated DESC LIMIT 1',
+                               (employee_id,)).fetchone()
+        if row is None:
+            profile_id = conn.execute(
+                'INSERT INTO profiles (employee_id, name, designation, current_version, created, updated) VALUES (?, ?, ?, 1, ?, ?)',
+                (employee_id, name, designation, now, now)).lastrowid
+            version = 1
+        else:
+            profile_id, version = row['id'], row['current_version'] + 1
+            conn.execute('UPDATE profiles SET employee_id = ?, name = ?, designation = ?, current_version = ?, updated = ? WHERE id = ?',
+                         (employee_id, name, designation, version, now, profile_id))
+        conn.execute(
+            'INSERT INTO profile_versions (profile_id, version, data, hidden_sections, hidden_dates, design, source, created) '
+            'VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+            (profile_id, version, json.dumps(profile, ensure_ascii=False), json.dumps(hidden_sections or []),
+             json.dumps(hidden_dates or []), design or 'display_profile', source, now))
+        conn.execute('DELETE FROM profile_versions WHERE profile_id = ? AND version <= ?', (profile_id, version - PROFILE_MAX_VERSIONS))
+    logging.info("Stored profile %s version %s (%s)", profile_id, version, source)
+    return profile_id, version
+
+
+def load(profile_id, version=None):
+    # Returns the stored version as a dict, or None
+    conn = connection()
+    if version is None:
+        row = conn.execute(
+            'SELECT v.* FROM profiles p JOIN profile_versions v ON v.profile_id = p.id AND v.version = p.current_version WHERE p.id = ?',
+            (profile_id,)).fetchone()
+    else:
+        row = conn.execute('SELECT * FROM profile_versions WHERE profile_id = ? AND version = ?', (profile_id, version)).fetchone()
+    if row is None:
+        return None
+    return {
+        'profile_id': row['profile_id'],
+        'version': row['version'],
+        'profile': json.loads(row['data']),
+        'hidden_sections': json.loads(row['hidden_sections']),
+        'hidden_dates': json.loads(row['hidden_dates']),
+        'design': row['design'],
+        'source': row['source'],
+        'created': row['created'],
+    }
+
+
+def versions(profile_id):
+    return [dict(row) for row in connection().execute(
+        'SELECT version, source, design, created FROM profile_versions WHERE profile_id = ? ORDER BY version DESC', (profile_id,))]
+
+
+def list_profiles(query='', limit=LIST_PAGE_SIZE, offset=0):
+    # Exact employee_id match or case-insensitive name/designation prefix, newest first
+    conn = connection()
+    columns = 'id, employee_id, name, designation, current_version, updated'
+    if not query:
+        rows = conn.execute(f'SELECT {columns} FROM profiles ORDER BY updated DESC LIMIT ? OFFSET ?', (limit, offset))
+    else:
+        pattern = query.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_') + '%'
+        rows = conn.execute(
+            f'SELECT {columns} FROM profiles WHERE employee_id = ? '
+            f"UNION SELECT {columns} FROM profiles WHERE name LIKE ? ESCAPE '\\' "
+            f"UNION SELECT {columns} FROM profiles WHERE designation LIKE ? ESCAPE '\\' "
+            'ORDER BY updated DESC LIMIT ? OFFSET ?',
+            (query, pattern, pattern, limit, offset))
+    return [dict(row) for row in rows]
+
+
+def summaries(profile_ids):
+    # Listing columns for the given ids, in the order given
+    if not profile_ids:
+        return []
+    placeholders = ', '.join('?' * len(profile_ids))
+    rows = {row['id']: dict(row) for row in connection().execute(
+        f'SELECT id, employee_id, name, designation, current_version, updated FROM profiles WHERE id IN ({placeholders})',
+        list(profile_ids))}
+    return [rows[profile_id] for profile_id in profile_ids if profile_id in rows]
+
+
+def updated_since(since):
+    return connection().execute('SELECT id, updated FROM profiles WHERE updated >= ?', (since,)).fetchall()
+
+
+def technical_skills(profile_ids=None):
+    # (id, updated, technical_skills) from the current version of the given profiles, or of all of them
+    query = ("SELECT p.id, p.updated, CASE json_type(v.data, '$.technical_skills') "
+             "WHEN 'object' THEN json_extract(v.data, '$.technical_skills') END FROM profiles p "
+             'JOIN profile_versions v ON v.profile_id = p.id AND v.version = p.current_version')
+    if profile_ids is None:
+        rows = connection().execute(f'{query} ORDER BY p.id')
+    else:
+        rows = connection().execute(f"{query} WHERE p.id IN ({', '.join('?' * len(profile_ids))}) ORDER BY p.id", list(profile_ids))
+    return [(row[0], row[1], json.loads(row[2]) if row[2] else {}) for row in rows]
+
+
+def current_data(profile_ids=None):
+    # (id, updated, profile) for the current version of the given profiles, or of all of them
+    query = ('SELECT p.id, p.updated, v.data FROM profiles p '
+             'JOIN profile_versions v ON v.profile_id = p.id AND v.version = p.current_version')
+    if profile_ids is None:
+        rows = connection().execute(f'{query} ORDER BY p.id')
+    else:
+        rows = connection().execute(f"{query} WHERE p.id IN ({', '.join('?' * len(profile_ids))}) ORDER BY p.id", list(profile_ids))
+    return [(row[0], row[1], json.loads(row[2])) for row in rows]
+
+
+def _reset_after_fork():
+    global _local
+    _local = threading.local()
+
+
+os.register_at_fork(after_in_child=_reset_after_fork)
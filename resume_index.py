@@ -0,0 +1,150 @@
+import os
+import json
+import time
+import array
+import random
+import sqlite3
+import hashlib
+import logging
+import threading
+
+# MinHash/LSH index over previously parsed resumes, kept in SQLite so every
+# worker shares it. Texts are shingled into overlapping word 5-grams, each
+# resume gets a RESUME_NUM_PERM-value MinHash signature, and the signature is
+# cut into RESUME_LSH_BANDS bands whose hashes are the lookup keys. Two
+# resumes with Jaccard similarity s share at least one band with probability
+# 1 - (1 - s^rows)^bands, about 0.99 at s=0.8 and 0.07 at s=0.4 with the
+# defaults (16 bands of 8 rows). Candidates are then ranked by the fraction of
+# matching signature values.
+# Relative paths are taken from the app's root, not the working directory
+RESUME_INDEX_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.getenv('RESUME_INDEX_PATH', os.path.join('instance', 'resume_index.db')))
+RESUME_REUSE_THRESHOLD = float(os.getenv('RESUME_REUSE_THRESHOLD', '0.8'))
+RESUME_INDEX_MAX_ENTRIES = int(os.getenv('RESUME_INDEX_MAX_ENTRIES', '5000'))
+RESUME_NUM_PERM = 128
+RESUME_LSH_BANDS = 16
+SHINGLE_SIZE = 5
+
+MERSENNE_PRIME = (1 << 61) - 1
+MAX_HASH = (1 << 32) - 1
+_permutation_random = random.Random(1)
+PERMUTATIONS = [(_permutation_random.randrange(1, MERSENNE_PRIME), _permutation_random.randrange(0, MERSENNE_PRIME))
+                for _ in range(RESUME_NUM_PERM)]
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS resumes (
+    id INTEGER PRIMARY KEY,
+    text_hash TEXT UNIQUE NOT NULL,
+    text TEXT NOT NULL,
+    signature BLOB NOT NULL,
+    profile TEXT NOT NULL,
+    parse_seconds REAL NOT NULL,
+    created REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS resume_bands (
+    band INTEGER NOT NULL,
+    bucket INTEGER NOT NULL,
+    resume_id INTEGER NOT NULL REFERENCES resumes(id) ON DELETE CASCADE
+);
+CREATE INDEX IF NOT EXISTS resume_bands_lookup ON resume_bands (band, bucket);
+CREATE INDEX IF NOT EXISTS resume_bands_resume ON resume_bands (resume_id);
+"""
+
+_local = threading.local()
+
+
+def enabled():
+    return RESUME_REUSE_THRESHOLD > 0
+
+
+def connection():
+    conn = getattr(_local, 'conn', None)
+    if conn is None:
+        os.makedirs(os.path.dirname(RESUME_INDEX_PATH) or '.', exist_ok=True)
+        conn = sqlite3.connect(RESUME_INDEX_PATH, timeout=10)
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute('PRAGMA foreign_keys=ON')
+        conn.executescript(SCHEMA)
+        _local.conn = conn
+    return conn
+
+
+def text_hash(text):
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+def shingles(text):
+    words = text.lower().split()
+    if len(words) < SHINGLE_SIZE:
+        words = words + [''] * (SHINGLE_SIZE - len(words))
+    return {
+        int.from_bytes(hashlib.blake2b(' '.join(words[i:i + SHINGLE_SIZE]).encode('utf-8'), digest_size=4).digest(), 'big')
+        for i in range(len(words) - SHINGLE_SIZE + 1)
+    }
+
+
+def signature(text):
+    hashes = shingles(text)
+    return array.array('Q', [min([(a * h + b) % MERSENNE_PRIME for h in hashes]) & MAX_HASH for a, b in PERMUTATIONS])
+
+
+def band_buckets(sig):
+    rows = RESUME_NUM_PERM // RESUME_LSH_BANDS
+    return [
+        (band, int.from_bytes(hashlib.blake2b(sig[band * rows:(band + 1) * rows].tobytes(), digest_size=8).digest(), 'big', signed=True))
+        for band in range(RESUME_LSH_BANDS)
+    ]
+
+
+def similarity(sig_a, sig_b):
+    return sum(1 for a, b in zip(sig_a, sig_b) if a == b) / len(sig_a)
+
+
+def find_similar(text):
+    # Returns (similarity, entry) for the closest indexed resume, or None if nothing shares a band
+    conn = connection()
+    row = conn.execute('SELECT id, text, profile, parse_seconds FROM resumes WHERE text_hash = ?', (text_hash(text),)).fetchone()
+    if row is not None:
+        return 1.0, {'id': row[0], 'text': row[1], 'profile': json.loads(row[2]), 'parse_seconds': row[3]}
+    sig = signature(text)
+    buckets = band_buckets(sig)
+    clause = ' OR '.join(['(band = ? AND bucket = ?)'] * len(buckets))
+    candidate_ids = [r[0] for r in conn.execute(
+        f'SELECT DISTINCT resume_id FROM resume_bands WHERE {clause}', [value for pair in buckets for value in pair])]
+    best = None
+    for candidate_id in candidate_ids:
+        candidate_sig = array.array('Q')
+        candidate_sig.frombytes(conn.execute('SELECT signature FROM resumes WHERE id = ?', (candidate_id,)).fetchone()[0])
+        score = similarity(sig, candidate_sig)
+        if best is None or score > best[0]:
+            best = (score, candidate_id)
+    if best is None:
+        return None
+    row = conn.execute('SELECT text, profile, parse_seconds FROM resumes WHERE id = ?', (best[1],)).fetchone()
+    return best[0], {'id': best[1], 'text': row[0], 'profile': json.loads(row[1]), 'parse_seconds': row[2]}
+
+
+def add(text, profile, parse_seconds):
+    sig = signature(text)
+    conn = connection()
+    with conn:
+        cursor = conn.execute(
+            'INSERT OR IGNORE INTO resumes (text_hash, text, signature, profile, parse_seconds, created) VALUES (?, ?, ?, ?, ?, ?)',
+            (text_hash(text), text, sig.tobytes(), json.dumps(profile, ensure_ascii=False), parse_seconds, time.time()))
+        if cursor.rowcount == 0:
+            return
+        conn.executemany('INSERT INTO resume_bands (band, bucket, resume_id) VALUES (?, ?, ?)',
+                         [(band, bucket, cursor.lastrowid) for band, bucket in band_buckets(sig)])
+        if cursor.lastrowid % 100 == 0:
+            removed = conn.execute(
+                'DELETE FROM resumes WHERE id NOT IN (SELECT id FROM resumes ORDER BY id DESC LIMIT ?)',
+                (RESUME_INDEX_MAX_ENTRIES,)).rowcount
+            if removed:
+                logging.info("Pruned %d old entries from the resume index", removed)
+
+
+def _reset_after_fork():
+    global _local
+    _local = threading.local()
+
+
+os.register_at_fork(after_in_child=_reset_after_fork)
@@ -0,0 +1,153 @@
+import os
+import json
+import time
+import fcntl
+import hashlib
+import logging
+import tempfile
+import threading
+import unicodedata
+
+from metrics import COALESCED_REQUESTS
+
+# Collapses identical work that is in flight at the same time. Within a
+# worker, duplicates wait on the leader's Event and share its result (or
+# its exception). Across workers on the host, the leader holds an flock on
+# COALESCE_DIR/<key>.lock while it works and leaves the JSON result next to
+# it for COALESCE_RESULT_TTL seconds; a worker that had to wait for the lock
+# picks that result up instead of repeating the work. Results are only
+# shared when the work returned something truthy, so a failed run is retried
+# by the next caller rather than handed out.
+COALESCE_DIR = os.getenv('COALESCE_DIR', os.path.join(tempfile.gettempdir(), 'profile-maker-inflight'))
+COALESCE_RESULT_TTL = float(os.getenv('COALESCE_RESULT_TTL', '60'))
+COALESCE_WAIT = float(os.getenv('COALESCE_WAIT', '300'))
+LOCK_POLL_INTERVAL = 0.05
+STALE_LOCK_AGE = 2 * COALESCE_WAIT
+
+_calls = {}
+_calls_lock = threading.Lock()
+_last_purge = 0.0
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.payload = None
+        self.error = None
+
+
+def content_key(namespace, text):
+    normalized = ' '.join(unicodedata.normalize('NFC', text).split())
+    return hashlib.sha256(f"{namespace}\0{normalized}".encode('utf-8')).hexdigest()
+
+
+def run(key, work):
+    # work() must return something JSON-serializable; every caller gets its own copy
+    with _calls_lock:
+        call = _calls.get(key)
+        leader = call is None
+        if leader:
+            call = _calls[key] = _Call()
+    if not leader:
+        COALESCED_REQUESTS.labels(scope='thread').inc()
+        logging.info("Waiting on in-flight request %s", key[:12])
+        if call.done.wait(COALESCE_WAIT):
+            if call.error is not None:
+                raise call.error
+            return json.loads(call.payload)
+        logging.warning("In-flight request %s did not finish within %.0fs, running it again", key[:12], COALESCE_WAIT)
+        return work()
+    try:
+        call.payload = run_locked(key, work)
+        return json.loads(call.payload)
+    except Exception as e:
+        call.error = e
+        raise
+    finally:
+        with _calls_lock:
+            _calls.pop(key, None)
+        call.done.set()
+
+
+def run_locked(key, work):
+    os.makedirs(COALESCE_DIR, mode=0o700, exist_ok=True)
+    with open(os.path.join(COALESCE_DIR, f"{key}.lock"), 'a') as lock_file:
+        locked = acquire(lock_file)
+        try:
+            if locked:
+                os.utime(lock_file.fileno())
+                payload = read_result(key)
+                if payload is not None:
+                    COALESCED_REQUESTS.labels(scope='worker').inc()
+                    logging.info("Reusing result of request %s from another worker", key[:12])
+                    return payload
+            else:
+                logging.warning("Lock for request %s still held after %.0fs, running without it", key[:12], COALESCE_WAIT)
+            result = work()
+            payload = json.dumps(result)
+            if result:
+                write_result(key, payload)
+            return payload
+        finally:
+            if locked:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def acquire(lock_file):
+    give_up = time.monotonic() + COALESCE_WAIT
+    while True:
+        try:
+            fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            return True
+        except BlockingIOError:
+            if time.monotonic() >= give_up:
+                return False
+            time.sleep(LOCK_POLL_INTERVAL)
+
+
+def read_result(key):
+    path = os.path.join(COALESCE_DIR, f"{key}.json")
+    try:
+        if time.time() - os.path.getmtime(path) >= COALESCE_RESULT_TTL:
+            return None
+        with open(path, 'r', encoding='utf-8') as f:
+            return f.read()
+    except OSError:
+        return None
+
+
+def write_result(key, payload):
+    fd, temp_path = tempfile.mkstemp(dir=COALESCE_DIR, suffix='.part')
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            f.write(payload)
+        os.replace(temp_path, os.path.join(COALESCE_DIR, f"{key}.json"))
+    except Exception:
+        os.unlink(temp_path)
+        raise
+    purge()
+
+
+def purge():
+    # Results expire quickly; lock files only once nobody can still be waiting on them
+    global _last_purge
+    now = time.time()
+    if now - _last_purge < COALESCE_RESULT_TTL:
+        return
+    _last_purge = now
+    for entry in os.scandir(COALESCE_DIR):
+        max_age = STALE_LOCK_AGE if entry.name.endswith('.lock') else COALESCE_RESULT_TTL
+        try:
+            if now - entry.stat().st_mtime >= max_age:
+                os.remove(entry.path)
+        except OSError:
+            continue
+
+
+def _reset_after_fork():
+    global _calls, _calls_lock
+    _calls = {}
+    _calls_lock = threading.Lock()
+
+
+os.register_at_fork(after_in_child=_reset_after_fork)
@@ -0,0 +1,253 @@
+import os
+import re
+from collections import deque
+
+from metrics import SKILLS_CATEGORIZED
+
+# Local canonicalization and categorization of technical skills. CATALOG
+# lists every known skill once, as "Canonical|alias|alias", under the
+# technical_skills bucket it belongs in. Aliases starting with '=' only
+# match with that exact case, for names that are also ordinary words
+# ("Go", "Room", "Spring").
+#
+# Gemini lists the resume's skills flat and categorize() buckets them:
+# every skill the catalog knows goes into the catalog's bucket under its
+# canonical name, and only the names it does not know are passed to the
+# caller's assign() (app.py asks Gemini for just those); anything left
+# unassigned goes to tools. Bucketed input (stored profiles, SKILL_CATALOG=0
+# responses) keeps its bucket for unknown names. With SKILL_TEXT_SCAN on it
+# also adds catalog skills named in the resume's skills section that
+# Gemini left out. The section is scanned with an Aho-Corasick automaton
+# over all aliases, a single pass whatever the size of the catalog.
+# SKILL_CATALOG=0 has Gemini bucket every skill and leaves its buckets as they are.
+SKILL_CATALOG_ENABLED = os.getenv('SKILL_CATALOG', '1') == '1'
+SKILL_TEXT_SCAN = os.getenv('SKILL_TEXT_SCAN', '1') == '1'
+SECTION_MAX_LINES = 40
+
+CATEGORIES = ['web_technologies', 'scripting_languages', 'frameworks', 'databases', 'web_servers', 'tools']
+
+CATALOG = {
+    'web_technologies': [
+        'HTML|HTML5', 'CSS|CSS3', 'REST|RESTful APIs|RESTful API|REST APIs|REST API|=RESTful', 'GraphQL', 'SOAP',
+        'JSON', 'XML', 'AJAX', 'JSP', 'Servlets|Servlet|Java Servlets', 'J2EE|Java EE|JEE', 'WebSockets|WebSocket',
+        'gRPC', 'OAuth|OAuth2|OAuth 2.0', 'JWT', 'SASS|SCSS', 'Bootstrap', 'Tailwind CSS|Tailwind', 'ASP.NET',
+        'Microservices|Microservice', 'PWA|Progressive Web Apps', 'WebAssembly|Wasm', 'Material Design',
+    ],
+    'scripting_languages': [
+        'Python|Python3|Python 3', 'Java|Core Java', 'JavaScript|=JS|ECMAScript|ES6', 'TypeScript', 'Kotlin',
+        '=Go|Golang', 'Rust', 'C++|CPP', '=C', 'C#|C Sharp', 'PHP|Core PHP', 'Ruby', 'Perl', 'Bash|Shell Scripting',
+        'PowerShell', 'Dart', 'Swift', 'Objective-C', 'Scala', '=R', 'MATLAB', 'Groovy', 'Lua', 'VB.NET|Visual Basic',
+        'SQL', 'PL/SQL|PLSQL', 'T-SQL', 'jQuery', 'Node.js|NodeJS',
+    ],
+    'frameworks': [
+        'Spring Boot|SpringBoot', '=Spring|Spring Framework', 'Spring MVC', 'Hibernate', 'Struts', 'Django', 'Flask',
+        'FastAPI', 'Express.js|=Express|ExpressJS', 'React|ReactJS|React.js', 'Angular|AngularJS', 'Vue.js|Vue|VueJS',
+        'Next.js|NextJS', '.NET|.NET Core|.NET Framework', 'Laravel', 'CodeIgniter', 'Ruby on Rails|Rails', 'Flutter',
+        'React Native', 'Jetpack Compose', 'Jetpack|Android Jetpack|Jetpack Components', 'Android SDK',
+        'Retrofit', 'Dagger', 'Hilt', 'RxJava', 'Kotlin Coroutines|Coroutines', 'LiveData|Live Data',
+        'WorkManager|Work Manager', 'JUnit', 'Espresso', 'Mockito', 'TestNG', 'Selenium', 'pytest', 'Jest',
+        'Pandas', 'NumPy', 'TensorFlow', 'PyTorch', 'scikit-learn', 'Spark|Apache Spark', 'Hadoop|Apache Hadoop',
+        'Axon|Axon Framework',
+    ],
+    'databases': [
+        'MySQL', 'PostgreSQL|Postgres|Postgres Database', 'Oracle|Oracle Database|Oracle DB', 'SQLite',
+        'Microsoft SQL Server|MS SQL Server|MSSQL|SQL Server', 'MongoDB|Mongo', 'Redis', 'Cassandra|Apache Cassandra',
+        'MariaDB', 'DynamoDB', 'Elasticsearch|Elastic Search', 'Neo4j', 'CouchDB', 'Couchbase',
+        'Firebase Realtime Database', 'Firestore|Cloud Firestore', '=Room|Room Database', 'DB2|IBM DB2',
+        'Snowflake', 'BigQuery', 'InfluxDB', 'Memcached', 'HBase',
+    ],
+    'web_servers': [
+        'Apache Tomcat|Tomcat', 'Apache HTTP Server|Apache HTTPD|httpd', 'Nginx', 'IIS|Microsoft IIS', 'HAProxy',
+        'Jetty', 'WildFly|JBoss', 'WebLogic|Oracle WebLogic', 'WebSphere|IBM WebSphere', 'Gunicorn', 'uWSGI',
+        'Caddy', 'Lighttpd', 'XAMPP', 'WAMP',
+    ],
+    'tools': [
+        'Git', 'GitHub', 'GitLab', 'Bitbucket', 'SVN|Subversion', 'GitHub Actions', 'GitLab CI', 'Jenkins',
+        'Docker', 'Kubernetes|K8s', 'OpenShift', 'Helm', 'Terraform', 'Ansible', 'Puppet', '=Chef',
+        'Prometheus', 'Grafana', 'Nagios', 'Zabbix', 'Splunk', 'ELK Stack|ELK', 'Kibana', 'Logstash',
+        'Kafka|Apache Kafka', 'RabbitMQ', 'Airflow|Apache Airflow', 'Maven', 'Gradle', '=Ant|Apache Ant',
+        'Eclipse', 'IntelliJ IDEA|IntelliJ', 'Android Studio', 'Visual Studio Code|VS Code|VSCode', 'Visual Studio',
+        'NetBeans|Net Bean|Net Beans', 'Postman', 'Swagger', 'Jira', 'Confluence', 'SonarQube', 'Firebase',
+        'AWS|Amazon Web Services', 'Azure|Microsoft Azure', 'GCP|Google Cloud|Google Cloud Platform',
+        'Pivotal Cloud Foundry|PCF|Cloud Foundry', 'Linux', 'Slurm', 'OpenStack', 'VMware', 'Vagrant',
+        'ServiceNow', 'SSRS', 'Tableau', 'Power BI', 'Excel|MS Excel', 'Figma', 'Adobe Dreamweaver|Dreamweaver',
+        'Akamai', 'Bartender', 'Webpack', 'npm', 'Yarn',
+    ],
+}
+
+# Section headers are compared with spaces and punctuation removed, since PDF
+# extraction often splits headings ("SK ILLS", "PR OJ ECT D ETAI LS")
+SECTION_HEADERS = ('technicalskill', 'skill', 'keyskill', 'corecompetenc', 'technologies')
+NEXT_SECTION_HEADERS = (
+    'professionalexperience', 'workexperience', 'experience', 'employment', 'education', 'personaldetails',
+    'project', 'certification', 'achievement', 'summary', 'objective', 'roles', 'declaration', 'languagesknown',
+)
+HEADER_MAX_LENGTH = 60
+NOTE_RE = re.compile(r'\s*\([^)]*\)\s*$|\s+v?\d+(\.\d+)*\s*$')
+
+_aliases = {}
+_exact_aliases = {}
+_goto = [{}]
+_fail = [0]
+_output = [[]]
+
+
+class Entry:
+    def __init__(self, canonical, category):
+        self.canonical = canonical
+        self.category = category
+
+
+def add_alias(alias, entry):
+    exact = alias.startswith('=')
+    alias = alias.lstrip('=')
+    if exact:
+        _exact_aliases[alias] = entry
+    else:
+        _aliases[alias.lower()] = entry
+    node = 0
+    for ch in alias.lower():
+        if ch not in _goto[node]:
+            _goto.append({})
+            _fail.append(0)
+            _output.append([])
+            _goto[node][ch] = len(_goto) - 1
+        node = _goto[node][ch]
+    _output[node].append((len(alias), entry, alias if exact else None))
+
+
+def build_automaton():
+    for category, lines in CATALOG.items():
+        for line in lines:
+            names = line.split('|')
+            entry = Entry(names[0].lstrip('='), category)
+            for alias in names:
+                add_alias(alias, entry)
+    # Breadth-first failure links; each node also reports the outputs of its failure chain
+    queue = deque(_goto[0].values())
+    while queue:
+        node = queue.popleft()
+        for ch, child in _goto[node].items():
+            fallback = _fail[node]
+            while fallback and ch not in _goto[fallback]:
+                fallback = _fail[fallback]
+            _fail[child] = _goto[fallback].get(ch, 0)
+            _output[child] = _output[child] + _output[_fail[child]]
+            queue.append(child)
+
+
+def is_word_char(ch):
+    return ch.isalnum() or ch in '+#'
+
+
+def scan(text):
+    # Canonical entries named in text, leftmost-longest, whole words only
+    lowered = text.lower()
+    if len(lowered) != len(text):
+        lowered = ''.join(ch.lower() if len(ch.lower()) == 1 else ch for ch in text)
+    found = []
+    node = 0
+    for end, ch in enumerate(lowered, 1):
+        while node and ch not in _goto[node]:
+            node = _fail[node]
+        node = _goto[node].get(ch, 0)
+        for length, entry, exact in _output[node]:
+            start = end - length
+            if exact is not None and text[start:end] != exact:
+                continue
+            if start > 0 and text[start - 1].isalnum() and text[start].isalnum():
+                continue
+            if end < len(text) and is_word_char(text[end]) and (is_word_char(text[end - 1]) or text[end] in '+#'):
+                continue
+            found.append((start, -length, entry))
+    found.sort(key=lambda match: (match[0], match[1]))
+    matches, covered = [], 0
+    for start, negative_length, entry in found:
+        if start >= covered:
+            matches.append(entry)
+            covered = start - negative_length
+    return matches
+
+
+def lookup(skill):
+    name = NOTE_RE.sub('', skill.strip()).strip()
+    return _exact_aliases.get(name) or _aliases.get(name.lower())
+
+
+def header_key(line):
+    return re.sub(r'[\W_]+', '', line).lower() if len(line) < HEADER_MAX_LENGTH else ''
+
+
+def skills_section(text):
+    # Lines from the first skills header to the next section header, at most SECTION_MAX_LINES
+    lines = text.splitlines()
+    for i, line in enumerate(lines):
+        if header_key(line).startswith(SECTION_HEADERS):
+            section = [line]
+            for following in lines[i + 1:i + 1 + SECTION_MAX_LINES]:
+                if header_key(following).startswith(NEXT_SECTION_HEADERS):
+                    break
+                section.append(following)
+            return '\n'.join(section)
+    return ''
+
+
+def flatten(technical_skills):
+    # Skill names from a flat list or from buckets, in order
+    if isinstance(technical_skills, dict):
+        return [skill for skills in technical_skills.values() if isinstance(skills, list) for skill in skills]
+    return list(technical_skills) if isinstance(technical_skills, list) else []
+
+
+def categorize(technical_skills, text=None, assign=None):
+    # Returns the six buckets for a flat list of names or for existing buckets.
+    # assign(names) returns {name: category} for names the catalog does not know.
+    buckets = {category: [] for category in CATEGORIES}
+    seen = set()
+    unknown = {}
+
+    def add(category, name, outcome):
+        if name.lower() not in seen:
+            seen.add(name.lower())
+            buckets[category].append(name)
+            SKILLS_CATEGORIZED.labels(outcome=outcome).inc()
+
+    if isinstance(technical_skills, dict):
+        listed = [(category, skill) for category, skills in technical_skills.items()
+                  for skill in (skills if isinstance(skills, list) else [])]
+    else:
+        listed = [(None, skill) for skill in flatten(technical_skills)]
+    for category, skill in listed:
+        if not isinstance(skill, str) or not skill.strip():
+            continue
+        entry = lookup(skill)
+        if entry is not None:
+            add(entry.category, entry.canonical, 'catalog')
+            continue
+        # "Dagger/Hilt" or "Java, Kotlin": split only if every part is known
+        parts = [part for part in re.split(r'\s*[/,;&]\s*', skill) if part]
+        known = [lookup(part) for part in parts]
+        if len(parts) > 1 and all(known):
+            for entry in known:
+                add(entry.category, entry.canonical, 'catalog')
+            continue
+        if category is None:
+            unknown.setdefault(skill.strip().lower(), skill.strip())
+        else:
+            add(category if category in buckets else 'tools', skill.strip(), 'llm')
+    if text and SKILL_TEXT_SCAN:
+        for entry in scan(skills_section(text)):
+            add(entry.category, entry.canonical, 'text')
+    unknown = [name for name in unknown.values() if name.lower() not in seen]
+    if unknown:
+        assigned = assign(unknown) if assign else {}
+        for name in unknown:
+            category = assigned.get(name)
+            if category in buckets:
+                add(category, name, 'llm')
+            else:
+                add('tools', name, 'unassigned')
+    return buckets
+
+
+build_automaton()
@@ -0,0 +1,353 @@
+import os
+import re
+import bisect
+import functools
+import time
+import logging
+import threading
+
+import profile_store
+
+# In-process inverted index over the technical_skills of stored profiles:
+# normalized skill -> posting list of profile ids. A posting list is kept in
+# whichever form is smaller for it:
+#   sparse  sorted ids as varint-encoded gaps (bytes), one or two bytes per
+#           id for typical id ranges
+#   dense   a bitmap (int) with bit i set for profile i, once a skill is
+#           common enough that the bitmap is cheaper
+# Queries turn every posting list into a bitmap and combine them with
+# integer &, | and ~, so AND/OR/NOT cost a few machine words per 64 profiles.
+#
+# Saves in this worker update the index directly (update()); saves in other
+# workers are picked up by the first search after REFRESH_INTERVAL seconds,
+# which re-reads profiles whose updated stamp is at or after the last one
+# seen, minus REFRESH_OVERLAP seconds for saves that committed out of order.
+REFRESH_INTERVAL = float(os.getenv('SKILL_INDEX_REFRESH_INTERVAL', '1'))
+REFRESH_OVERLAP = 5.0
+MAX_RESULTS = 200
+# Parsing and evaluation recurse per NOT, '(' and operator
+MAX_QUERY_LENGTH = 500
+MAX_QUERY_TOKENS = 100
+MAX_QUERY_DEPTH = 20
+
+TOKEN_RE = re.compile(r'\(|\)|"[^"]*"|[^\s()"]+')
+OPERATORS = {'AND', 'OR', 'NOT'}
+
+_lock = threading.Lock()
+_postings = {}
+_terms = []
+_doc_terms = {}
+_doc_updated = {}
+_universe = 0
+_last_seen = None
+_last_refresh = 0.0
+
+
+class QueryError(ValueError):
+    """The search query could not be parsed."""
+
+
+@functools.lru_cache(maxsize=65536)
+def normalize(skill):
+    return ' '.join(skill.casefold().split()).strip('.,;:')
+
+
+def profile_terms(technical_skills):
+    if not isinstance(technical_skills, dict):
+        return frozenset()
+    return frozenset(
+        term for skills in technical_skills.values() if isinstance(skills, list)
+        for term in (normalize(skill) for skill in skills if isinstance(skill, str)) if term
+    )
+
+
+def encode(ids):
+    out = bytearray()
+    previous = -1
+    for doc in ids:
+        gap = doc - previous - 1
+        while gap >= 0x80:
+            out.append(gap & 0x7f | 0x80)
+            gap >>= 7
+        out.append(gap)
+        previous = doc
+    return bytes(out)
+
+
+def decode(data):
+    ids = []
+    doc, value, shift = -1, 0, 0
+    for byte in data:
+        value |= (byte & 0x7f) << shift
+        if byte & 0x80:
+            shift += 7
+            continue
+        doc += value + 1
+        ids.append(doc)
+        value, shift = 0, 0
+    return ids
+
+
+def to_bitmap(ids):
+    if not ids:
+        return 0
+    bits = bytearray(ids[-1] // 8 + 1)
+    for doc in ids:
+        bits[doc >> 3] |= 1 << (doc & 7)
+    return int.from_bytes(bits, 'little')
+
+
+def bitmap_ids(bitmap, limit, offset=0):
+    # Set bits from the highest down, i.e. newest profiles first
+    ids = []
+    while bitmap and len(ids) < offset + limit:
+        doc = bitmap.bit_length() - 1
+        ids.append(doc)
+        bitmap ^= 1 << doc
+    return ids[offset:]
+
+
+def store_posting(term, ids=None, bitmap=None):
+    # Keeps whichever representation is smaller; drops empty lists
+    if bitmap is not None:
+        count = bitmap.bit_count()
+        if count and count * 2 >= bitmap.bit_length() // 8:
+            _postings[term] = bitmap
+            return
+        ids = bitmap_ids(bitmap, count)[::-1]
+    if not ids:
+        if _postings.pop(term, None) is not None:
+            del _terms[bisect.bisect_left(_terms, term)]
+        return
+    if term not in _postings:
+        bisect.insort(_terms, term)
+    encoded = encode(ids)
+    _postings[term] = encoded if len(encoded) <= ids[-1] // 8 + 1 else to_bitmap(ids)
+
+
+def posting_bitmap(term):
+    posting = _postings.get(term, 0)
+    return posting if isinstance(posting, int) else to_bitmap(decode(posting))
+
+
+def change_posting(term, doc, present):
+    posting = _postings.get(term)
+    if isinstance(posting, int):
+        store_posting(term, bitmap=posting | (1 << doc) if present else posting & ~(1 << doc))
+        return
+    ids = decode(posting) if posting else []
+    position = bisect.bisect_left(ids, doc)
+    found = position < len(ids) and ids[position] == doc
+    if present and not found:
+        ids.insert(position, doc)
+    elif not present and found:
+        del ids[position]
+    else:
+        return
+    store_posting(term, ids=ids)
+
+
+def index_profile(profile_id, technical_skills, updated=None):
+    global _universe
+    new_terms = profile_terms(technical_skills)
+    old_terms = _doc_terms.get(profile_id, frozenset())
+    for term in old_terms - new_terms:
+        change_posting(term, profile_id, False)
+    for term in new_terms - old_terms:
+        change_posting(term, profile_id, True)
+    _doc_terms[profile_id] = new_terms
+    _universe |= 1 << profile_id
+    if updated is not None:
+        _doc_updated[profile_id] = updated
+
+
+def build():
+    # Full load from the profile store; sparse lists are encoded once at the end
+    global _universe, _last_seen
+    rows = profile_store.technical_skills()
+    postings = {}
+    _postings.clear()
+    _terms.clear()
+    _doc_terms.clear()
+    _doc_updated.clear()
+    _universe = 0
+    for profile_id, updated, technical_skills in rows:
+        terms = profile_terms(technical_skills)
+        for term in terms:
+            postings.setdefault(term, []).append(profile_id)
+        _doc_terms[profile_id] = terms
+        _doc_updated[profile_id] = updated
+        _universe |= 1 << profile_id
+    for term, ids in postings.items():
+        store_posting(term, ids=ids)
+    _last_seen = max(_doc_updated.values(), default=0.0)
+    logging.info("Built skill index: %d profiles, %d skills", len(_doc_terms), len(_postings))
+
+
+def refresh():
+    global _last_seen, _last_refresh
+    now = time.monotonic()
+    if _last_seen is None:
+        build()
+        _last_refresh = now
+        return
+    if now - _last_refresh < REFRESH_INTERVAL:
+        return
+    _last_refresh = now
+    changed = [profile_id for profile_id, updated in profile_store.updated_since(_last_seen - REFRESH_OVERLAP)
+               if _doc_updated.get(profile_id) != updated]
+    if not changed:
+        return
+    if len(changed) > max(1000, len(_doc_terms) // 10):
+        # Re-encoding posting lists one profile at a time loses to a rebuild for bulk imports
+        build()
+        return
+    # SQLite caps bound parameters, so read the changed profiles in chunks
+    for start in range(0, len(changed), 500):
+        for profile_id, updated, technical_skills in profile_store.technical_skills(changed[start:start + 500]):
+            index_profile(profile_id, technical_skills, updated)
+            _last_seen = max(_last_seen, updated)
+
+
+def update(profile_id, profile):
+    # Called after this worker saves a profile; other workers catch up in refresh()
+    with _lock:
+        if _last_seen is not None:
+            index_profile(profile_id, profile.get('technical_skills'))
+
+
+def tokenize(query):
+    if len(query) > MAX_QUERY_LENGTH:
+        raise QueryError(f"Query is longer than {MAX_QUERY_LENGTH} characters")
+    if query.count('"') % 2:
+        raise QueryError("Missing closing '\"'")
+    tokens = []
+    for token in TOKEN_RE.findall(query):
+        if token.startswith('"'):
+            tokens.append(('term', token[1:-1]))
+        elif token.upper() in OPERATORS:
+            tokens.append((token.upper(), token))
+        elif token in '()':
+            tokens.append((token, token))
+        elif tokens and tokens[-1][0] == 'word':
+            # Unquoted words run together into one skill: Spring Boot AND Java
+            tokens[-1] = ('word', f"{tokens[-1][1]} {token}")
+        else:
+            tokens.append(('word', token))
+    return [('term', text) if kind == 'word' else (kind, text) for kind, text in tokens]
+
+
+class Parser:
+    # expr := and_expr (OR and_expr)*
+    # and_expr := unary ([AND] unary)*
+    # unary := NOT unary | '(' expr ')' | term
+    def __init__(self, tokens):
+        self.tokens = tokens
+        self.position = 0
+        self.depth = 0
+
+    def peek(self):
+        return self.tokens[self.position][0] if self.position < len(self.tokens) else None
+
+    def take(self):
+        token = self.tokens[self.position]
+        self.position += 1
+        return token
+
+    def parse(self):
+        if not self.tokens:
+            raise QueryError("Enter at least one skill")
+        if len(self.tokens) > MAX_QUERY_TOKENS:
+            raise QueryError(f"Query has more than {MAX_QUERY_TOKENS} skills and operators")
+        node = self.expr()
+        if self.peek() is not None:
+            raise QueryError(f"Unexpected '{self.tokens[self.position][1]}'")
+        return node
+
+    def expr(self):
+        node = self.and_expr()
+        while self.peek() == 'OR':
+            self.take()
+            node = ('or', node, self.and_expr())
+        return node
+
+    def and_expr(self):
+        node = self.unary()
+        while self.peek() in ('AND', 'NOT', '(', 'term'):
+            if self.peek() == 'AND':
+                self.take()
+            node = ('and', node, self.unary())
+        return node
+
+    def unary(self):
+        kind = self.peek()
+        if kind in ('NOT', '('):
+            self.depth += 1
+            if self.depth > MAX_QUERY_DEPTH:
+                raise QueryError(f"Query nests NOT and parentheses more than {MAX_QUERY_DEPTH} deep")
+        if kind == 'NOT':
+            self.take()
+            node = ('not', self.unary())
+            self.depth -= 1
+            return node
+        if kind == '(':
+            self.take()
+            node = self.expr()
+            if self.peek() != ')':
+                raise QueryError("Missing ')'")
+            self.take()
+            self.depth -= 1
+            return node
+        if kind == 'term':
+            return ('term', self.take()[1])
+        raise QueryError("Expected a skill" + (f" before '{self.tokens[self.position][1]}'" if kind else " at the end"))
+
+
+def evaluate(node):
+    kind = node[0]
+    if kind == 'and':
+        return evaluate(node[1]) & evaluate(node[2])
+    if kind == 'or':
+        return evaluate(node[1]) | evaluate(node[2])
+    if kind == 'not':
+        return _universe & ~evaluate(node[1])
+    term = normalize(node[1])
+    if term.endswith('*'):
+        # Prefix match: every indexed skill starting with the given text
+        prefix = term.rstrip('*')
+        bitmap = 0
+        for candidate in _terms[bisect.bisect_left(_terms, prefix):]:
+            if not candidate.startswith(prefix):
+                break
+            bitmap |= posting_bitmap(candidate)
+        return bitmap
+    return posting_bitmap(term)
+
+
+def search(query, limit=50, offset=0):
+    # Returns (total, profile ids newest first); raises QueryError for bad queries
+    tree = Parser(tokenize(query)).parse()
+    with _lock:
+        refresh()
+        bitmap = evaluate(tree)
+    return bitmap.bit_count(), bitmap_ids(bitmap, min(limit, MAX_RESULTS), offset)
+
+
+def stats():
+    with _lock:
+        sparse = [posting for posting in _postings.values() if not isinstance(posting, int)]
+        return {
+            'profiles': len(_doc_terms),
+            'skills': len(_postings),
+            'sparse_lists': len(sparse),
+            'dense_lists': len(_postings) - len(sparse),
+            'posting_bytes': sum(map(len, sparse)) + sum((p.bit_length() + 7) // 8 for p in _postings.values() if isinstance(p, int)),
+        }
+
+
+def _reset_after_fork():
+    global _lock
+    _lock = threading.Lock()
+
+
+os.register_at_fork(after_in_child=_reset_after_fork)
@@ -0,0 +1,471 @@
+        let currentFieldId = '';
+        let educationIndex = 1;
+        let workIndex = 1;
+        let netwebProjectIndex = 1;
+        let pastProjectIndex = 1;
+        let webTechIndex = 1;
+        let scriptLangIndex = 1;
+        let frameworkIndex = 1;
+        let databaseIndex = 1;
+        let webServerIndex = 1;
+        let toolIndex = 1;
+
+        window.addEventListener('load', () => {
+            setupEditableFields();
+            setupValidation();
+        });
+
+        document.getElementById('profile-form').addEventListener('submit', function(e) {
+            if (!validateForm()) {
+                e.preventDefault();
+                return;
+            }
+            updateAllHiddenFields();
+            document.getElementById('loaderOverlay').style.display = 'flex';
+        });
+
+        function setupValidation() {
+            // Age validation
+            const dobInput = document.getElementById('date_of_birth');
+            dobInput.addEventListener('change', validateAge);
+
+            // Contact number validation
+            const contactNumber = document.getElementById('contact_number');
+            contactNumber.addEventListener('input', validateContactNumber);
+
+            // Overall experience calculation
+            const joiningDateInput = document.getElementById('date_of_joining');
+            joiningDateInput.addEventListener('change', updateOverallExperience);
+
+            // Education duration validation
+            document.querySelectorAll('[id^=etc_start_date_]').forEach(startDate => {
+                startDate.addEventListener('change', () => validateEducationDuration(startDate.id));
+            });
+            document.querySelectorAll('[id^=etc_end_date_]').forEach(endDate => {
+                endDate.addEventListener('change', () => validateEducationDuration(endDate.id));
+            });
+        }
+
+        function validateAge() {
+            const dobInput = document.getElementById('date_of_birth');
+            const error = document.getElementById('date_of_birth_error');
+            const dob = new Date(dobInput.value);
+            const today = new Date();
+            const age = today.getFullYear() - dob.getFullYear();
+            const monthDiff = today.getMonth() - dob.getMonth();
+            const dayDiff = today.getDate() - dob.getDate();
+            let adjustedAge = age;
+            if (monthDiff < 0 || (monthDiff === 0 && dayDiff < 0)) {
+                adjustedAge--;
+            }
+            if (adjustedAge < 18) {
+                error.style.display = 'block';
+                return false;
+            } else {
+                error.style.display = 'none';
+                return true;
+            }
+        }
+
+        function validateContactNumber() {
+            const contactNumber = document.getElementById('contact_number');
+            const error = document.getElementById('contact_number_error');
+            const value = contactNumber.innerText.trim();
+            const isValid = /^\d{10}$/.test(value);
+            if (!isValid) {
+                error.style.display = 'block';
+                return false;
+            } else {
+                error.style.display = 'none';
+                return true;
+            }
+        }
+
+        function validateEducationDuration(inputId) {
+            const index = inputId.match(/\d+$/)[0];
+            const startDate = document.getElementById(`etc_start_date_${index}`).value;
+            const endDate = document.getElementById(`etc_end_date_${index}`).value;
+            const error = document.getElementById(`etc_duration_error_${index}`);
+            
+            if (startDate && endDate) {
+                const start = new Date(startDate);
+                const end = new Date(endDate);
+                const diffMonths = (end.getFullYear() - start.getFullYear()) * 12 + end.getMonth() - start.getMonth();
+                
+                if (diffMonths < 3 || diffMonths > 48) {
+                    error.style.display = 'block';
+                    return false;
+                } else {
+                    error.style.display = 'none';
+                    return true;
+                }
+            }
+            return true;
+        }
+
+        function updateOverallExperience() {
+            const joiningDate = document.getElementById('date_of_joining').value;
+            const experienceField = document.getElementById('overall_experience');
+            if (joiningDate) {
+                const joinDate = new Date(joiningDate);
+                const today = new Date();
+                const years = today.getFullYear() - joinDate.getFullYear();
+                const months = today.getMonth() - joinDate.getMonth();
+                let experience = '';
+                if (years > 0) {
+                    experience += `${years} year${years > 1 ? 's' : ''}`;
+                }
+                if (months > 0) {
+                    experience += `${years > 0 ? ' and ' : ''}${months} month${months > 1 ? 's' : ''}`;
+                }
+                experienceField.innerText = experience || '0 years';
+                updateHiddenField('overall_experience');
+            }
+        }
+
+        function validateForm() {
+            let isValid = true;
+            if (!validateAge()) isValid = false;
+            if (!validateContactNumber()) isValid = false;
+            for (let i = 0; i < educationIndex; i++) {
+                if (document.getElementById(`etc_field_${i}`) && !validateEducationDuration(`etc_start_date_${i}`)) {
+                    isValid = false;
+                }
+            }
+            return isValid;
+        }
+
+        function openFormatModal(fieldId) {
+            currentFieldId = fieldId;
+            const field = document.getElementById(fieldId);
+            const editor = document.getElementById('formatEditor');
+            editor.innerHTML = field.innerHTML;
+            document.getElementById('formatModal').style.display = 'flex';
+            editor.focus();
+        }
+
+        function closeFormatModal() {
+            document.getElementById('formatModal').style.display = 'none';
+            currentFieldId = '';
+            document.getElementById('formatEditor').innerHTML = '';
+        }
+
+        function formatModalText(command) {
+            const editor = document.getElementById('formatEditor');
+            document.getSelection().selectAllChildren(editor);
+            document.execCommand(command, false, null);
+            editor.focus();
+            if (currentFieldId) {
+                const field = document.getElementById(currentFieldId);
+                field.innerHTML = editor.innerHTML;
+                field.dispatchEvent(new Event('input'));
+                updateHiddenField(currentFieldId);
+            }
+        }
+
+        function saveFormatChanges() {
+            if (currentFieldId) {
+                const editor = document.getElementById('formatEditor');
+                const field = document.getElementById(currentFieldId);
+                field.innerHTML = editor.innerHTML;
+                field.dispatchEvent(new Event('input'));
+                updateHiddenField(currentFieldId);
+                closeFormatModal();
+            }
+        }
+
+        function updateHiddenField(elementId) {
+            const editable = document.getElementById(elementId);
+            const hiddenInput = document.getElementById(`${elementId}_hidden`);
+            if (editable && hiddenInput) {
+                hiddenInput.value = editable.innerText.trim();
+            }
+        }
+
+        function updateAllHiddenFields() {
+            const fields = [
+                'full_name', 'employee_id', 'contact_number', 'permanent_address', 'local_address',
+                'designation', 'overall_experience', 'passport_details', 'total_experience',
+                'professional_summary', 'roles_responsibilities'
+            ];
+            fields.forEach(field => updateHiddenField(field));
+            document.querySelectorAll('[id^=etc_]').forEach(editable => {
+                if (!editable.id.endsWith('_hidden')) {
+                    updateHiddenField(editable.id);
+                }
+            });
+            document.querySelectorAll('[id^=web_tech_]').forEach(editable => {
+                if (!editable.id.endsWith('_hidden')) {
+                    updateHiddenField(editable.id);
+                }
+            });
+            document.querySelectorAll('[id^=script_lang_]').forEach(editable => {
+                if (!editable.id.endsWith('_hidden')) {
+                    updateHiddenField(editable.id);
+                }
+            });
+            document.querySelectorAll('[id^=framework_]').forEach(editable => {
+                if (!editable.id.endsWith('_hidden')) {
+                    updateHiddenField(editable.id);
+                }
+            });
+            document.querySelectorAll('[id^=database_]').forEach(editable => {
+                if (!editable.id.endsWith('_hidden')) {
+                    updateHiddenField(editable.id);
+                }
+            });
+            document.querySelectorAll('[id^=web_server_]').forEach(editable => {
+                if (!editable.id.endsWith('_hidden')) {
+                    updateHiddenField(editable.id);
+                }
+            });
+            document.querySelectorAll('[id^=tool_]').forEach(editable => {
+                if (!editable.id.endsWith('_hidden')) {
+                    updateHiddenField(editable.id);
+                }
+            });
+            document.querySelectorAll('[id^=netweb_project_]').forEach(editable => {
+                if (!editable.id.endsWith('_hidden')) {
+                    updateHiddenField(editable.id);
+                }
+            });
+            document.querySelectorAll('[id^=past_project_]').forEach(editable => {
+                if (!editable.id.endsWith('_hidden')) {
+                    updateHiddenField(editable.id);
+                }
+            });
+            document.querySelectorAll('[id^=work_role_]').forEach(editable => {
+                if (!editable.id.endsWith('_hidden')) {
+                    updateHiddenField(editable.id);
+                }
+            });
+            document.querySelectorAll('[id^=work_responsibilities_]').forEach(editable => {
+                if (!editable.id.endsWith('_hidden')) {
+                    updateHiddenField(editable.id);
+                }
+            });
+        }
+
+        function setupEditableFields() {
+            const fields = [
+                'full_name', 'employee_id', 'contact_number', 'permanent_address', 'local_address',
+                'designation', 'overall_experience', 'passport_details', 'total_experience',
+                'professional_summary', 'roles_responsibilities'
+            ];
+            fields.forEach(field => {
+                const editable = document.getElementById(field);
+                if (editable) {
+                    editable.addEventListener('input', () => updateHiddenField(field));
+                }
+            });
+            document.querySelectorAll('[id^=etc_]').forEach(editable => {
+                if (!editable.id.endsWith('_hidden')) {
+                    editable.addEventListener('input', () => updateHiddenField(editable.id));
+                }
+            });
+            document.querySelectorAll('[id^=web_tech_]').forEach(editable => {
+                if (!editable.id.endsWith('_hidden')) {
+                    editable.addEventListener('input', () => updateHiddenField(editable.id));
+                }
+            });
+            document.querySelectorAll('[id^=script_lang_]').forEach(editable => {
+                if (!editable.id.endsWith('_hidden')) {
+                    editable.addEventListener('input', () => updateHiddenField(editable.id));
+                }
+            });
+            document.querySelectorAll('[id^=framework_]').forEach(editable => {
+                if (!editable.id.endsWith('_hidden')) {
+                    editable.addEventListener('input', () => updateHiddenField(editable.id));
+                }
+            });
+            document.querySelectorAll('[id^=database_]').forEach(editable => {
+                if (!editable.id.endsWith('_hidden')) {
+                    editable.addEventListener('input', () => updateHiddenField(editable.id));
+                }
+            });
+            document.querySelectorAll('[id^=web_server_]').forEach(editable => {
+                if (!editable.id.endsWith('_hidden')) {
+                    editable.addEventListener('input', () => updateHiddenField(editable.id));
+                }
+            });
+            document.querySelectorAll('[id^=tool_]').forEach(editable => {
+                if (!editable.id.endsWith('_hidden')) {
+                    editable.addEventListener('input', () => updateHiddenField(editable.id));
+                }
+            });
+            document.querySelectorAll('[id^=netweb_project_]').forEach(editable => {
+                if (!editable.id.endsWith('_hidden')) {
+                    editable.addEventListener('input', () => updateHiddenField(editable.id));
+                }
+            });
+            document.querySelectorAll('[id^=past_project_]').forEach(editable => {
+                if (!editable.id.endsWith('_hidden')) {
+                    editable.addEventListener('input', () => updateHiddenField(editable.id));
+                }
+            });
+            document.querySelectorAll('[id^=work_role_]').forEach(editable => {
+                if (!editable.id.endsWith('_hidden')) {
+                    editable.addEventListener('input', () => updateHiddenField(editable.id));
+                }
+            });
+            document.querySelectorAll('[id^=work_responsibilities_]').forEach(editable => {
+                if (!editable.id.endsWith('_hidden')) {
+                    editable.addEventListener('input', () => updateHiddenField(editable.id));
+                }
+            });
+        }
+
+        function addEducationField() {
+            const container = document.getElementById('education_training_certifications');
+            const newField = document.createElement('div');
+            newField.className = 'field field-group';
+            newField.id = `etc_field_${educationIndex}`;
+            newField.innerHTML = `
+                <div class="date-group">
+                    <div class="field">
+                        <label for="etc_start_date_${educationIndex}">Start Date:</label>
+                        <input type="date" class="date-field" id="etc_start_date_${educationIndex}" name="education_start_date[]">
+                    </div>
+                    <div class="field">
+                        <label for="etc_end_date_${educationIndex}">End Date:</label>
+                        <input type="date" class="date-field" id="etc_end_date_${educationIndex}" name="education_end_date[]">
+                    </div>
+                    <div class="error-message" id="etc_duration_error_${educationIndex}">Course duration must be between 3 months and 4 years.</div>
+                </div>
+                <label>Title:</label>
+                <div class="editable" id="etc_${educationIndex}" contenteditable="true" spellcheck="true"></div>
+                <button type="button" class="format-button" onclick="openFormatModal('etc_${educationIndex}')">Format</button>
+                <button type="button" class="remove-button" onclick="removeField('etc_field_${educationIndex}', 'etc_${educationIndex}')">Remove</button>
+                <input type="hidden" name="education_title[]" id="etc_${educationIndex}_hidden">
+            `;
+            container.appendChild(newField);
+            document.getElementById(`etc_${educationIndex}`).addEventListener('input', () => updateHiddenField(`etc_${educationIndex}`));
+            document.getElementById(`etc_start_date_${educationIndex}`).addEventListener('change', () => validateEducationDuration(`etc_start_date_${educationIndex}`));
+            document.getElementById(`etc_end_date_${educationIndex}`).addEventListener('change', () => validateEducationDuration(`etc_end_date_${educationIndex}`));
+            educationIndex++;
+        }
+
+        function addWorkField() {
+            const container = document.getElementById('work_experience');
+            const newField = document.createElement('div');
+            newField.className = 'field field-group';
+            newField.id = `work_${workIndex}`;
+            newField.innerHTML = `
+                <div class="date-group">
+                    <div class="field">
+                        <label for="work_start_date_${workIndex}">Start Date:</label>
+                        <input type="date" class="date-field" id="work_start_date_${workIndex}" name="work_start_date[]">
+                    </div>
+                    <div class="field">
+                        <label for="work_end_date_${workIndex}">End Date:</label>
+                        <input type="date" class="date-field" id="work_end_date_${workIndex}" name="work_end_date[]">
+                    </div>
+                </div>
+                <label>Role:</label>
+                <div class="editable" id="work_role_${workIndex}" contenteditable="true" spellcheck="true"></div>
+                <button type="button" class="format-button" onclick="openFormatModal('work_role_${workIndex}')">Format</button>
+                <input type="hidden" name="work_role[]" id="work_role_${workIndex}_hidden">
+                <label>Responsibilities:</label>
+                <div class="editable" id="work_responsibilities_${workIndex}" contenteditable="true" spellcheck="true"></div>
+                <button type="button" class="format-button" onclick="openFormatModal('work_responsibilities_${workIndex}')">Format</button>
+                <button type="button" class="remove-button" onclick="removeField('work_${workIndex}')">Remove</button>
+                <input type="hidden" name="work_responsibilities[]" id="work_responsibilities_${workIndex}_hidden">
+            `;
+            container.appendChild(newField);
+            document.getElementById(`work_role_${workIndex}`).addEventListener('input', () => updateHiddenField(`work_role_${workIndex}`));
+            document.getElementById(`work_responsibilities_${workIndex}`).addEventListener('input', () => updateHiddenField(`work_responsibilities_${workIndex}`));
+            workIndex++;
+        }
+
+        function addNetWebProjectField() {
+            const container = document.getElementById('netweb_projects');
+            const newField = document.createElement('div');
+            newField.className = 'field field-group';
+            newField.id = `netweb_project_field_${netwebProjectIndex}`;
+            newField.innerHTML = `
+                <label>Project Title:</label>
+                <div class="editable" id="netweb_project_title_${netwebProjectIndex}" contenteditable="true" spellcheck="true"></div>
+                <button type="button" class="format-button" onclick="openFormatModal('netweb_project_title_${netwebProjectIndex}')">Format</button>
+                <input type="hidden" name="netweb_project_title[]" id="netweb_project_title_${netwebProjectIndex}_hidden">
+                <label>Brief Description:</label>
+                <div class="editable" id="netweb_project_description_${netwebProjectIndex}" contenteditable="true" spellcheck="true"></div>
+                <button type="button" class="format-button" onclick="openFormatModal('netweb_project_description_${netwebProjectIndex}')">Format</button>
+                <button type="button" class="remove-button" onclick="removeField('netweb_project_field_${netwebProjectIndex}')">Remove</button>
+                <input type="hidden" name="netweb_project_description[]" id="netweb_project_description_${netwebProjectIndex}_hidden">
+            `;
+            container.appendChild(newField);
+            document.getElementById(`netweb_project_title_${netwebProjectIndex}`).addEventListener('input', () => updateHiddenField(`netweb_project_title_${netwebProjectIndex}`));
+            document.getElementById(`netweb_project_description_${netwebProjectIndex}`).addEventListener('input', () => updateHiddenField(`netweb_project_description_${netwebProjectIndex}`));
+            netwebProjectIndex++;
+        }
+
+        function addPastProjectField() {
+            const container = document.getElementById('past_projects');
+            const newField = document.createElement('div');
+            newField.className = 'field field-group';
+            newField.id = `past_project_field_${pastProjectIndex}`;
+            newField.innerHTML = `
+                <label>Project Title:</label>
+                <div class="editable" id="past_project_title_${pastProjectIndex}" contenteditable="true" spellcheck="true"></div>
+                <button type="button" class="format-button" onclick="openFormatModal('past_project_title_${pastProjectIndex}')">Format</button>
+                <input type="hidden" name="past_project_title[]" id="past_project_title_${pastProjectIndex}_hidden">
+                <label>Brief Description:</label>
+                <div class="editable" id="past_project_description_${pastProjectIndex}" contenteditable="true" spellcheck="true"></div>
+                <button type="button" class="format-button" onclick="openFormatModal('past_project_description_${pastProjectIndex}')">Format</button>
+                <button type="button" class="remove-button" onclick="removeField('past_project_field_${pastProjectIndex}')">Remove</button>
+                <input type="hidden" name="past_project_description[]" id="past_project_description_${pastProjectIndex}_hidden">
+            `;
+            container.appendChild(newField);
+            document.getElementById(`past_project_title_${pastProjectIndex}`).addEventListener('input', () => updateHiddenField(`past_project_title_${pastProjectIndex}`));
+            document.getElementById(`past_project_description_${pastProjectIndex}`).addEventListener('input', () => updateHiddenField(`past_project_description_${pastProjectIndex}`));
+            pastProjectIndex++;
+        }
+
+        function addSkillField(containerId, prefix) {
+            const container = document.getElementById(containerId);
+            let index;
+            switch (containerId) {
+                case 'web_technologies':
+                    index = webTechIndex++;
+                    break;
+                case 'scripting_languages':
+                    index = scriptLangIndex++;
+                    break;
+                case 'frameworks':
+                    index = frameworkIndex++;
+                    break;
+                case 'databases':
+                    index = databaseIndex++;
+                    break;
+                case 'web_servers':
+                    index = webServerIndex++;
+                    break;
+                case 'tools':
+                    index = toolIndex++;
+                    break;
+                default:
+                    return;
+            }
+            const newField = document.createElement('div');
+            newField.className = 'field';
+            newField.id = `${prefix}_field_${index}`;
+            newField.innerHTML = `
+                <div class="editable" id="${prefix}_${index}" contenteditable="true" spellcheck="true"></div>
+                <button type="button" class="format-button" onclick="openFormatModal('${prefix}_${index}')">Format</button>
+                <button type="button" class="remove-button" onclick="removeField('${prefix}_field_${index}', '${prefix}_${index}')">Remove</button>
+                <input type="hidden" name="${containerId}[]" id="${prefix}_${index}_hidden">
+            `;
+            container.appendChild(newField);
+            document.getElementById(`${prefix}_${index}`).addEventListener('input', () => updateHiddenField(`${prefix}_${index}`));
+        }
+
+        function removeField(fieldId, editableId) {
+            const field = document.getElementById(fieldId);
+            if (field) {
+                field.remove();
+                if (editableId) {
+                    updateHiddenField(editableId);
+                }
+            }
+        }
+    
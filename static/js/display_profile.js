@@ -0,0 +1,329 @@
+      let hiddenSections = [];
+      let hiddenDates = [];
+      try {
+        const hiddenSectionsElement = document.getElementById('hidden-sections-data');
+        if (hiddenSectionsElement) {
+          const hiddenSectionsRaw = JSON.parse(hiddenSectionsElement.textContent);
+          hiddenSections = Array.isArray(hiddenSectionsRaw) ? hiddenSectionsRaw : [];
+        }
+        const hiddenDatesElement = document.getElementById('hidden-dates-data');
+        if (hiddenDatesElement) {
+          const hiddenDatesRaw = JSON.parse(hiddenDatesElement.textContent);
+          hiddenDates = Array.isArray(hiddenDatesRaw) ? hiddenDatesRaw : [];
+        }
+      } catch (e) {
+        console.error('Error parsing hidden_sections or hidden_dates from script tag:', e);
+        hiddenSections = [];
+        hiddenDates = [];
+      }
+
+      window.addEventListener('load', () => {
+        hiddenSections.forEach(sectionId => {
+          const section = document.querySelector(`[data-section-id="${sectionId}"]`);
+          const button = document.querySelector(`[data-section="${sectionId}"]`);
+          if (section && button) {
+            section.classList.add('hidden');
+            button.classList.add('hidden-state');
+            const icon = button.querySelector('.toggle-icon');
+            const text = button.querySelector('.toggle-text');
+            icon.textContent = '🙈';
+            text.textContent = sectionId.includes('dates') ? 'Show Dates' : 'Show Section';
+          }
+        });
+        hiddenDates.forEach(datesId => {
+          const dates = document.querySelectorAll(`[data-dates-id="${datesId}"]`);
+          const button = document.querySelector(`[data-dates-id="${datesId}"]`);
+          if (dates.length && button) {
+            dates.forEach(date => date.classList.add('hidden'));
+            button.classList.add('hidden-state');
+            const icon = button.querySelector('.toggle-icon');
+            const text = button.querySelector('.toggle-text');
+            icon.textContent = '🙈';
+            text.textContent = 'Show Dates';
+          }
+        });
+        updateHiddenSectionsInputs();
+        updateHiddenDatesInputs();
+        console.log('Page loaded, hidden sections:', hiddenSections, 'hidden dates:', hiddenDates);
+      });
+
+      function toggleSectionVisibility(sectionId) {
+        const section = document.querySelector(`[data-section-id="${sectionId}"]`);
+        const button = document.querySelector(`[data-section="${sectionId}"]`);
+        const icon = button.querySelector('.toggle-icon');
+        const text = button.querySelector('.toggle-text');
+        
+        if (hiddenSections.includes(sectionId)) {
+          hiddenSections = hiddenSections.filter(id => id !== sectionId);
+          section.classList.remove('hidden');
+          button.classList.remove('hidden-state');
+          icon.textContent = '👁️';
+          text.textContent = 'Hide Section';
+          console.log(`Showing section: ${sectionId}`);
+        } else {
+          hiddenSections.push(sectionId);
+          section.classList.add('hidden');
+          button.classList.add('hidden-state');
+          icon.textContent = '🙈';
+          text.textContent = 'Show Section';
+          console.log(`Hiding section: ${sectionId}`);
+        }
+        
+        updateHiddenSectionsInputs();
+        console.log('Updated hidden sections:', hiddenSections);
+      }
+
+      function toggleDatesVisibility(datesId) {
+        const dates = document.querySelectorAll(`[data-dates-id="${datesId}"]`);
+        const button = document.querySelector(`[data-dates-id="${datesId}"]`);
+        const icon = button.querySelector('.toggle-icon');
+        const text = button.querySelector('.toggle-text');
+        
+        if (hiddenDates.includes(datesId)) {
+          hiddenDates = hiddenDates.filter(id => id !== datesId);
+          dates.forEach(date => date.classList.remove('hidden'));
+          button.classList.remove('hidden-state');
+          icon.textContent = '👁️';
+          text.textContent = 'Hide Dates';
+          console.log(`Showing dates: ${datesId}`);
+        } else {
+          hiddenDates.push(datesId);
+          dates.forEach(date => date.classList.add('hidden'));
+          button.classList.add('hidden-state');
+          icon.textContent = '🙈';
+          text.textContent = 'Show Dates';
+          console.log(`Hiding dates: ${datesId}`);
+        }
+        
+        updateHiddenDatesInputs();
+        console.log('Updated hidden dates:', hiddenDates);
+      }
+
+      function showAllSections() {
+        hiddenSections = [];
+        hiddenDates = [];
+        const sections = document.querySelectorAll('[data-section-id]');
+        const buttons = document.querySelectorAll('.hide-toggle');
+        const dates = document.querySelectorAll('.dates-content');
+        const datesButtons = document.querySelectorAll('.dates-toggle');
+        
+        sections.forEach(section => {
+          section.classList.remove('hidden');
+        });
+        buttons.forEach(button => {
+          button.classList.remove('hidden-state');
+          const icon = button.querySelector('.toggle-icon');
+          const text = button.querySelector('.toggle-text');
+          icon.textContent = '👁️';
+          text.textContent = 'Hide Section';
+        });
+        dates.forEach(date => {
+          date.classList.remove('hidden');
+        });
+        datesButtons.forEach(button => {
+          button.classList.remove('hidden-state');
+          const icon = button.querySelector('.toggle-icon');
+          const text = button.querySelector('.toggle-text');
+          icon.textContent = '👁️';
+          text.textContent = 'Hide Dates';
+        });
+        
+        updateHiddenSectionsInputs();
+        updateHiddenDatesInputs();
+        console.log('Showing all sections and dates');
+      }
+
+      function hideAllSections() {
+        const sections = document.querySelectorAll('[data-section-id]');
+        const buttons = document.querySelectorAll('.hide-toggle');
+        const dates = document.querySelectorAll('.dates-content');
+        const datesButtons = document.querySelectorAll('.dates-toggle');
+        
+        hiddenSections = [];
+        hiddenDates = ['education-dates', 'work-experience-dates', 'personal-dates'];
+        sections.forEach(section => {
+          const sectionId = section.getAttribute('data-section-id');
+          hiddenSections.push(sectionId);
+          section.classList.add('hidden');
+        });
+        buttons.forEach(button => {
+          button.classList.add('hidden-state');
+          const icon = button.querySelector('.toggle-icon');
+          const text = button.querySelector('.toggle-text');
+          icon.textContent = '🙈';
+          text.textContent = 'Show Section';
+        });
+        dates.forEach(date => {
+          date.classList.add('hidden');
+        });
+        datesButtons.forEach(button => {
+          button.classList.add('hidden-state');
+          const icon = button.querySelector('.toggle-icon');
+          const text = button.querySelector('.toggle-text');
+          icon.textContent = '🙈';
+          text.textContent = 'Show Dates';
+        });
+        
+        updateHiddenSectionsInputs();
+        updateHiddenDatesInputs();
+        console.log('Hiding all sections and dates');
+      }
+
+      function updateHiddenSectionsInputs() {
+        const hiddenSectionsJSON = JSON.stringify(hiddenSections);
+        const inputs = [
+          document.getElementById('hidden-sections'),
+          document.getElementById('hidden-sections-skills-xlsx')
+        ];
+        inputs.forEach(input => {
+          if (input) {
+            input.value = hiddenSectionsJSON;
+          }
+        });
+        console.log('Updated hidden sections inputs with:', hiddenSectionsJSON);
+      }
+
+      function updateHiddenDatesInputs() {
+        const hiddenDatesJSON = JSON.stringify(hiddenDates);
+        const inputs = [
+          document.getElementById('hidden-dates'),
+          document.getElementById('hidden-dates-skills-xlsx')
+        ];
+        inputs.forEach(input => {
+          if (input) {
+            input.value = hiddenDatesJSON;
+          }
+        });
+        console.log('Updated hidden dates inputs with:', hiddenDatesJSON);
+      }
+
+      function switchDesign(design) {
+        $.ajax({
+          url: '/switch_design',
+          type: 'POST',
+          data: { design: design },
+          success: function(data) {
+            if (data.html) {
+              $('body').html(data.html);
+              hiddenSections.forEach(sectionId => {
+                const section = document.querySelector(`[data-section-id="${sectionId}"]`);
+                const button = document.querySelector(`[data-section="${sectionId}"]`);
+                if (section && button) {
+                  section.classList.add('hidden');
+                  button.classList.add('hidden-state');
+                  const icon = button.querySelector('.toggle-icon');
+                  const text = button.querySelector('.toggle-text');
+                  icon.textContent = '🙈';
+                  text.textContent = 'Show Section';
+                }
+              });
+              hiddenDates.forEach(datesId => {
+                const dates = document.querySelectorAll(`[data-dates-id="${datesId}"]`);
+                const button = document.querySelector(`[data-dates-id="${datesId}"]`);
+                if (dates.length && button) {
+                  dates.forEach(date => date.classList.add('hidden'));
+                  button.classList.add('hidden-state');
+                  const icon = button.querySelector('.toggle-icon');
+                  const text = button.querySelector('.toggle-text');
+                  icon.textContent = '🙈';
+                  text.textContent = 'Show Dates';
+                }
+              });
+              updateHiddenSectionsInputs();
+              updateHiddenDatesInputs();
+              attachEventListeners();
+              const designInputs = [
+                document.getElementById('design'),
+                document.getElementById('design-skills-xlsx')
+              ];
+              designInputs.forEach(input => {
+                if (input) {
+                  input.value = design;
+                }
+              });
+              console.log(`Switched to design: ${design}`);
+            } else if (data.error) {
+              console.error('Design switch failed:', data.error);
+              alert('Failed to switch design: ' + data.error);
+            }
+          },
+          error: function(xhr, status, error) {
+            console.error('AJAX request for design switch failed:', error);
+            alert('Failed to switch design. Please try again.');
+          }
+        });
+      }
+
+      function handleDownload(action) {
+        updateHiddenSectionsInputs();
+        updateHiddenDatesInputs();
+        const form = document.getElementById('download-form');
+        const profileDataInput = document.getElementById('profile-data');
+        
+        try {
+          const profileData = JSON.parse(profileDataInput.value);
+          profileDataInput.value = encodeURIComponent(JSON.stringify(profileData));
+          console.log('Preparing PDF download with profile_data:', profileData, 'hidden_sections:', hiddenSections, 'hidden_dates:', hiddenDates, 'design:', document.getElementById('design').value);
+          form.action = action || '/download';
+          form.submit();
+        } catch (e) {
+          console.error('Error encoding profile_data for PDF:', e);
+          alert('Error preparing resume data for PDF download. Please try again.');
+        }
+      }
+
+      function handleDownloadSkillsXlsx() {
+        updateHiddenSectionsInputs();
+        updateHiddenDatesInputs();
+        const form = document.getElementById('download-skills-xlsx-form');
+        console.log('Preparing Skills XLSX download with hidden_sections:', hiddenSections, 'hidden_dates:', hiddenDates, 'design:', document.getElementById('design-skills-xlsx').value);
+        form.submit();
+      }
+
+      function attachEventListeners() {
+        const sections = document.querySelectorAll('.section');
+        sections.forEach(section => {
+          section.addEventListener('mouseenter', function() {
+            if (!this.classList.contains('hidden')) {
+              this.style.transform = 'translateX(10px)';
+              this.style.boxShadow = '0 8px 25px rgba(59, 130, 246, 0.2)';
+            }
+          });
+          section.addEventListener('mouseleave', function() {
+            this.style.transform = '';
+            this.style.boxShadow = '';
+          });
+        });
+
+        document.addEventListener('submit', function(event) {
+          updateHiddenSectionsInputs();
+          updateHiddenDatesInputs();
+          console.log('Form submission: hidden sections updated to', JSON.stringify(hiddenSections), 'hidden dates updated to', JSON.stringify(hiddenDates));
+        });
+
+        document.addEventListener('keydown', function(event) {
+          if (event.ctrlKey || event.metaKey) {
+            switch(event.key) {
+              case 'h':
+                event.preventDefault();
+                hideAllSections();
+                break;
+              case 's':
+                event.preventDefault();
+                showAllSections();
+                break;
+              case 'd':
+                event.preventDefault();
+                handleDownload();
+                break;
+            }
+          }
+        });
+
+        window.addEventListener('beforeprint', () => {
+          console.log('Preparing for print: hidden sections:', hiddenSections, 'hidden dates:', hiddenDates);
+        });
+      }
+
+      document.addEventListener('DOMContentLoaded', attachEventListeners);
+    
@@ -0,0 +1,168 @@
+        let hiddenSections = [];
+        try {
+            const hiddenSectionsElement = document.getElementById('hidden-sections-data');
+            if (hiddenSectionsElement) {
+                const hiddenSectionsRaw = JSON.parse(hiddenSectionsElement.textContent);
+                hiddenSections = Array.isArray(hiddenSectionsRaw) ? hiddenSectionsRaw : [];
+            }
+        } catch (e) {
+            console.error('Error parsing hidden_sections from script tag:', e);
+            hiddenSections = [];
+        }
+
+        window.addEventListener('load', () => {
+            hiddenSections.forEach(sectionId => {
+                const section = document.querySelector(`[data-section-id="${sectionId}"]`);
+                const button = document.querySelector(`[data-section="${sectionId}"]`);
+                if (section && button) {
+                    section.classList.add('hidden');
+                    button.classList.add('hidden-state');
+                    const icon = button.querySelector('.toggle-icon');
+                    const text = button.querySelector('.toggle-text');
+                    icon.textContent = '🙈';
+                    text.textContent = 'Show';
+                }
+            });
+            updateHiddenSectionsInputs();
+            console.log('Page loaded, hidden sections initialized:', hiddenSections);
+        });
+
+        function toggleSectionVisibility(sectionId) {
+            const section = document.querySelector(`[data-section-id="${sectionId}"]`);
+            const button = document.querySelector(`[data-section="${sectionId}"]`);
+            const icon = button.querySelector('.toggle-icon');
+            const text = button.querySelector('.toggle-text');
+            
+            if (hiddenSections.includes(sectionId)) {
+                hiddenSections = hiddenSections.filter(id => id !== sectionId);
+                section.classList.remove('hidden');
+                button.classList.remove('hidden-state');
+                icon.textContent = '👁️';
+                text.textContent = 'Hide';
+                console.log(`Showing section: ${sectionId}`);
+            } else {
+                hiddenSections.push(sectionId);
+                section.classList.add('hidden');
+                button.classList.add('hidden-state');
+                icon.textContent = '🙈';
+                text.textContent = 'Show';
+                console.log(`Hiding section: ${sectionId}`);
+            }
+            
+            updateHiddenSectionsInputs();
+            console.log('Updated hidden sections:', hiddenSections);
+        }
+
+        function showAllSections() {
+            hiddenSections = [];
+            const sections = document.querySelectorAll('[data-section-id]');
+            const buttons = document.querySelectorAll('.hide-toggle');
+            
+            sections.forEach(section => {
+                section.classList.remove('hidden');
+            });
+            
+            buttons.forEach(button => {
+                button.classList.remove('hidden-state');
+                const icon = button.querySelector('.toggle-icon');
+                const text = button.querySelector('.toggle-text');
+                icon.textContent = '👁️';
+                text.textContent = 'Hide';
+            });
+            
+            updateHiddenSectionsInputs();
+            console.log('Showing all sections');
+        }
+
+        function hideAllSections() {
+            const sections = document.querySelectorAll('[data-section-id]');
+            const buttons = document.querySelectorAll('.hide-toggle');
+            
+            hiddenSections = [];
+            sections.forEach(section => {
+                const sectionId = section.getAttribute('data-section-id');
+                hiddenSections.push(sectionId);
+                section.classList.add('hidden');
+            });
+            
+            buttons.forEach(button => {
+                button.classList.add('hidden-state');
+                const icon = button.querySelector('.toggle-icon');
+                const text = button.querySelector('.toggle-text');
+                icon.textContent = '🙈';
+                text.textContent = 'Show';
+            });
+            
+            updateHiddenSectionsInputs();
+            console.log('Hiding all sections');
+        }
+
+        function updateHiddenSectionsInputs() {
+            const hiddenSectionsJSON = JSON.stringify(hiddenSections);
+            const mainInput = document.getElementById('hidden-sections');
+            if (mainInput) {
+                mainInput.value = hiddenSectionsJSON;
+            }
+            console.log('Updated hidden sections input with:', hiddenSectionsJSON);
+        }
+
+        function handleDownload() {
+            updateHiddenSectionsInputs();
+            const form = document.getElementById('download-form');
+            const profileDataInput = document.getElementById('profile-data');
+            
+            try {
+                const profileData = JSON.parse(profileDataInput.value);
+                profileDataInput.value = encodeURIComponent(JSON.stringify(profileData));
+            } catch (e) {
+                console.error('Error encoding profile_data:', e);
+                alert('Error preparing resume data for download. Please try again.');
+                return;
+            }
+            
+            form.submit();
+            console.log('Download form submitted with hidden sections:', JSON.stringify(hiddenSections));
+        }
+
+        document.addEventListener('submit', function(event) {
+            updateHiddenSectionsInputs();
+            console.log('Form submission: hidden sections updated to', JSON.stringify(hiddenSections));
+        });
+
+        document.addEventListener('DOMContentLoaded', function() {
+            const sections = document.querySelectorAll('.section');
+            
+            sections.forEach(section => {
+                section.addEventListener('mouseenter', function() {
+                    if (!this.classList.contains('hidden')) {
+                        this.style.transform = 'translateX(10px)';
+                        this.style.boxShadow = '0 8px 25px rgba(59, 130, 246, 0.2)';
+                    }
+                });
+                
+                section.addEventListener('mouseleave', function() {
+                    this.style.transform = '';
+                    this.style.boxShadow = '';
+                });
+            });
+        });
+
+        document.addEventListener('keydown', function(event) {
+            if (event.ctrlKey || event.metaKey) {
+                switch(event.key) {
+                    case 'h':
+                        event.preventDefault();
+                        hideAllSections();
+                        break;
+                    case 's':
+                        event.preventDefault();
+                        showAllSections();
+                        break;
+                    case 'd':
+                        event.preventDefault();
+                        handleDownload();
+                        break;
+                }
+            }
+        });
+    
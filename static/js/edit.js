@@ -0,0 +1,478 @@
+    let hiddenSections = [];
+    let currentFieldId = '';
+
+    function sanitizeHTML(html) {
+      const div = document.createElement('div');
+      div.innerHTML = html;
+
+      // Define allowed tags and attributes
+      const allowedTags = ['strong', 'b', 'i', 'em', 'u', 'ul', 'ol', 'li'];
+      const allowedAttributes = [];
+
+      // Remove unwanted attributes
+      div.querySelectorAll('*').forEach(element => {
+        if (!allowedTags.includes(element.tagName.toLowerCase())) {
+          element.replaceWith(...element.childNodes);
+        } else {
+          Array.from(element.attributes).forEach(attr => {
+            if (!allowedAttributes.includes(attr.name)) {
+              element.removeAttribute(attr.name);
+            }
+          });
+        }
+      });
+
+      // Ensure list styling
+      div.querySelectorAll('ul').forEach(ul => {
+        ul.style.listStyleType = 'disc';
+        ul.style.paddingLeft = '1.5rem';
+        ul.style.marginBottom = '1rem';
+      });
+      div.querySelectorAll('ol').forEach(ol => {
+        ol.style.listStyleType = 'decimal';
+        ol.style.paddingLeft = '1.5rem';
+        ol.style.marginBottom = '1rem';
+      });
+      div.querySelectorAll('li').forEach(li => {
+        li.style.padding = '0.5rem 0';
+      });
+
+      return div.innerHTML.trim();
+    }
+
+    function hasHTMLFormatting(text) {
+      return /<\/?[a-z][\s\S]*>/i.test(text);
+    }
+
+    function convertToBulletPoints(text) {
+      if (!text) return '';
+      const sentences = text.split('.').map(s => s.trim()).filter(s => s.length > 0);
+      if (sentences.length === 0) return '';
+      const bulletPoints = sentences.map(sentence => `<li>${sentence}.</li>`).join('');
+      return `<ul style="list-style-type: disc; padding-left: 1.5rem; margin-bottom: 1rem;">${bulletPoints}</ul>`;
+    }
+
+    try {
+      const hiddenSectionsElement = document.getElementById('hidden_sections');
+      if (hiddenSectionsElement) {
+        const hiddenSectionsRaw = JSON.parse(hiddenSectionsElement.value);
+        hiddenSections = Array.isArray(hiddenSectionsRaw) ? hiddenSectionsRaw : [];
+      }
+    } catch (e) {
+      console.error('Error parsing hidden_sections:', e);
+      hiddenSections = [];
+    }
+
+    window.addEventListener('load', () => {
+      hiddenSections.forEach(sectionId => {
+        const section = document.querySelector(`[data-section-id="${sectionId}"]`);
+        const button = document.querySelector(`[data-section="${sectionId}"]`);
+        if (section && button) {
+          section.classList.add('hidden');
+          button.classList.add('hidden-state');
+          const icon = button.querySelector('.toggle-icon');
+          const text = button.querySelector('.toggle-text');
+          icon.textContent = '🙈';
+          text.textContent = 'Show';
+        }
+      });
+      updateHiddenSectionsInputs();
+      setupEditableFields();
+      setupValidation();
+    });
+
+    function setupEditableFields() {
+      document.querySelectorAll('.contenteditable').forEach(div => {
+        const hiddenInput = document.getElementById(div.id + '_hidden');
+        if (hiddenInput) {
+          div.innerHTML = sanitizeHTML(div.innerHTML);
+          hiddenInput.value = div.innerHTML.trim();
+          console.log(`Initialized ${div.id}_hidden with value:`, hiddenInput.value);
+
+          if (div.id === 'professional_summary') {
+            div.addEventListener('input', () => {
+              const text = div.innerText.trim();
+              if (!hasHTMLFormatting(div.innerHTML) && text) {
+                div.innerHTML = convertToBulletPoints(text);
+              }
+              hiddenInput.value = sanitizeHTML(div.innerHTML.trim());
+              console.log(`Updated ${div.id}_hidden on input:`, hiddenInput.value);
+            });
+          } 
+          else {
+            div.addEventListener('input', () => {
+              hiddenInput.value = sanitizeHTML(div.innerHTML.trim());
+              console.log(`Updated ${div.id}_hidden on input:`, hiddenInput.value);
+            });
+          }
+        } else {
+          console.warn(`No hidden input found for ${div.id}`);
+        }
+      });
+    }
+
+    function setupValidation() {
+      const dobInput = document.getElementById('date_of_birth');
+      dobInput.addEventListener('change', validateAge);
+
+      const joiningDateInput = document.getElementById('date_of_joining');
+      joiningDateInput.addEventListener('change', updateOverallExperience);
+
+      document.querySelectorAll('[id^=edu_start_]').forEach(startDate => {
+        startDate.addEventListener('change', () => validateEducationDuration(startDate.id));
+      });
+      document.querySelectorAll('[id^=edu_end_]').forEach(endDate => {
+        endDate.addEventListener('change', () => validateEducationDuration(endDate.id));
+      });
+    }
+
+    function validateAge() {
+      const dobInput = document.getElementById('date_of_birth');
+      const error = document.getElementById('date_of_birth_error');
+      const dob = new Date(dobInput.value);
+      const today = new Date();
+      const age = today.getFullYear() - dob.getFullYear();
+      const monthDiff = today.getMonth() - dob.getMonth();
+      const dayDiff = today.getDate() - dob.getDate();
+      let adjustedAge = age;
+      if (monthDiff < 0 || (monthDiff === 0 && dayDiff < 0)) {
+        adjustedAge--;
+      }
+      if (adjustedAge < 18) {
+        error.style.display = 'block';
+        dobInput.style.borderColor = '#ef4444';
+        return false;
+      } else {
+        error.style.display = 'none';
+        dobInput.style.borderColor = '#d1d5db';
+        return true;
+      }
+    }
+
+    
+    function validateEducationDuration(inputId) {
+      const index = inputId.match(/\d+$/)[0];
+      const startDate = document.getElementById(`edu_start_${index}`).value;
+      const endDate = document.getElementById(`edu_end_${index}`).value;
+      const error = document.getElementById(`edu_duration_error_${index}`);
+      
+      if (startDate && endDate) {
+        const start = new Date(startDate);
+        const end = new Date(endDate);
+        const diffMonths = (end.getFullYear() - start.getFullYear()) * 12 + end.getMonth() - start.getMonth();
+        
+        if (diffMonths < 3 || diffMonths > 48) {
+          error.style.display = 'block';
+          document.getElementById(`edu_start_${index}`).style.borderColor = '#ef4444';
+          document.getElementById(`edu_end_${index}`).style.borderColor = '#ef4444';
+          return false;
+        } else {
+          error.style.display = 'none';
+          document.getElementById(`edu_start_${index}`).style.borderColor = '#d1d5db';
+          document.getElementById(`edu_end_${index}`).style.borderColor = '#d1d5db';
+          return true;
+        }
+      }
+      return true;
+    }
+
+    function updateOverallExperience() {
+      const joiningDate = document.getElementById('date_of_joining').value;
+      const experienceField = document.getElementById('total_experience');
+      if (joiningDate) {
+        const joinDate = new Date(joiningDate);
+        const today = new Date();
+        const years = today.getFullYear() - joinDate.getFullYear();
+        const months = today.getMonth() - joinDate.getMonth();
+        let experience = '';
+        if (years > 0) {
+          experience += `${years} year${years > 1 ? 's' : ''}`;
+        }
+        if (months > 0) {
+          experience += `${years > 0 ? ' and ' : ''}${months} month${months > 1 ? 's' : ''}`;
+        }
+        experienceField.value = experience || '0 years';
+      }
+    }
+
+    function validateForm() {
+      let isValid = true;
+      const requiredInputs = document.querySelectorAll('input[required]');
+      requiredInputs.forEach(input => {
+        if (!input.value.trim()) {
+          isValid = false;
+          input.style.borderColor = '#ef4444';
+        } else {
+          input.style.borderColor = '#d1d5db';
+        }
+      });
+      if (!validateAge()) isValid = false;
+      document.querySelectorAll('[id^=edu_item_]').forEach(item => {
+        const index = item.id.match(/\d+$/)[0];
+        if (!validateEducationDuration(`edu_start_${index}`)) {
+          isValid = false;
+        }
+      });
+      return isValid;
+    }
+
+    function openFormatModal(fieldId) {
+      currentFieldId = fieldId;
+      const field = document.getElementById(fieldId);
+      const editor = document.getElementById('formatEditor');
+      editor.innerHTML = sanitizeHTML(field.innerHTML);
+      document.getElementById('formatModal').style.display = 'flex';
+      editor.focus();
+    }
+
+    function closeFormatModal() {
+      document.getElementById('formatModal').style.display = 'none';
+      currentFieldId = '';
+      document.getElementById('formatEditor').innerHTML = '';
+    }
+
+    function formatModalText(command) {
+      const editor = document.getElementById('formatEditor');
+      const selection = window.getSelection();
+      let range = selection.rangeCount > 0 ? selection.getRangeAt(0) : null;
+
+      document.execCommand(command, false, null);
+
+      editor.querySelectorAll('ul').forEach(ul => {
+        ul.style.listStyleType = 'disc';
+        ul.style.paddingLeft = '1.5rem';
+        ul.style.marginBottom = '1rem';
+      });
+      editor.querySelectorAll('ol').forEach(ol => {
+        ol.style.listStyleType = 'decimal';
+        ol.style.paddingLeft = '1.5rem';
+        ol.style.marginBottom = '1rem';
+      });
+      editor.querySelectorAll('li').forEach(li => {
+        li.style.padding = '0.5rem 0';
+      });
+
+      editor.focus();
+      if (range) {
+        selection.removeAllRanges();
+        selection.addRange(range);
+      }
+
+      if (currentFieldId) {
+        const field = document.getElementById(currentFieldId);
+        field.innerHTML = sanitizeHTML(editor.innerHTML);
+        field.dispatchEvent(new Event('input'));
+        updateHiddenField(currentFieldId);
+      }
+    }
+
+    function saveFormatChanges() {
+      if (!currentFieldId) {
+        console.error('No currentFieldId set. Cannot save changes.');
+        alert('Error: No field selected for formatting.');
+        return;
+      }
+
+      const editor = document.getElementById('formatEditor');
+      const field = document.getElementById(currentFieldId);
+      const hiddenInput = document.getElementById(`${currentFieldId}_hidden`);
+
+      if (!editor || !field || !hiddenInput) {
+        console.error('Missing elements:', { editor, field, hiddenInput });
+        alert('Error: Unable to find editor or field elements.');
+        return;
+      }
+
+      const sanitizedContent = sanitizeHTML(editor.innerHTML);
+      field.innerHTML = sanitizedContent;
+      hiddenInput.value = sanitizedContent;
+
+      field.dispatchEvent(new Event('input', { bubbles: true }));
+
+      console.log(`Saved content for ${currentFieldId}:`, sanitizedContent);
+      closeFormatModal();
+    }
+
+    function updateHiddenField(elementId) {
+      const editable = document.getElementById(elementId);
+      const hiddenInput = document.getElementById(`${elementId}_hidden`);
+      if (editable && hiddenInput) {
+        hiddenInput.value = sanitizeHTML(editable.innerHTML.trim());
+        console.log(`Updated ${elementId}_hidden:`, hiddenInput.value);
+      } else {
+        console.warn(`Failed to update hidden field for ${elementId}`);
+      }
+    }
+
+    function toggleSectionVisibility(sectionId) {
+      const section = document.querySelector(`[data-section-id="${sectionId}"]`);
+      const button = document.querySelector(`[data-section="${sectionId}"]`);
+      const icon = button.querySelector('.toggle-icon');
+      const text = button.querySelector('.toggle-text');
+      
+      if (hiddenSections.includes(sectionId)) {
+        hiddenSections = hiddenSections.filter(id => id !== sectionId);
+        section.classList.remove('hidden');
+        button.classList.remove('hidden-state');
+        icon.textContent = '👁️';
+        text.textContent = 'Hide';
+      } else {
+        hiddenSections.push(sectionId);
+        section.classList.add('hidden');
+        button.classList.add('hidden-state');
+        icon.textContent = '🙈';
+        text.textContent = 'Show';
+      }
+      
+      updateHiddenSectionsInputs();
+    }
+
+    function showAllSections() {
+      hiddenSections = [];
+      document.querySelectorAll('[data-section-id]').forEach(section => {
+        section.classList.remove('hidden');
+      });
+      document.querySelectorAll('.hide-toggle').forEach(button => {
+        button.classList.remove('hidden-state');
+        const icon = button.querySelector('.toggle-icon');
+        const text = button.querySelector('.toggle-text');
+        icon.textContent = '👁️';
+        text.textContent = 'Hide';
+      });
+      updateHiddenSectionsInputs();
+    }
+
+    function hideAllSections() {
+      hiddenSections = [];
+      document.querySelectorAll('[data-section-id]').forEach(section => {
+        const sectionId = section.getAttribute('data-section-id');
+        hiddenSections.push(sectionId);
+        section.classList.add('hidden');
+      });
+      document.querySelectorAll('.hide-toggle').forEach(button => {
+        button.classList.add('hidden-state');
+        const icon = button.querySelector('.toggle-icon');
+        const text = button.querySelector('.toggle-text');
+        icon.textContent = '🙈';
+        text.textContent = 'Show';
+      });
+      updateHiddenSectionsInputs();
+    }
+
+    function updateHiddenSectionsInputs() {
+      const hiddenSectionsInput = document.getElementById('hidden_sections');
+      if (hiddenSectionsInput) {
+        hiddenSectionsInput.value = JSON.stringify(hiddenSections);
+      }
+    }
+
+    document.querySelectorAll('.add-item').forEach(button => {
+      button.addEventListener('click', function() {
+        const section = this.getAttribute('data-section');
+        const container = document.getElementById(`${section}-items`);
+        const index = container.querySelectorAll('.section-item').length + 1;
+        let itemHtml = '';
+
+        if (section === 'education') {
+          itemHtml = `
+            <div class="section-item" id="edu_item_${index}">
+              <label for="etc_${index}">Title</label>
+              <input type="text" id="etc_${index}" name="education_training_certifications[]" required />
+              <label for="edu_start_${index}">Start Date</label>
+              <input type="date" id="edu_start_${index}" name="education_start_date[]" />
+              <label for="edu_end_${index}">End Date</label>
+              <input type="date" id="edu_end_${index}" name="education_end_date[]" />
+              <div class="error-message" id="edu_duration_error_${index}">Course duration must be between 3 months and 4 years.</div>
+              <button type="button" class="remove-item">Remove</button>
+            </div>`;
+        } else if (section === 'netweb_projects') {
+          itemHtml = `
+            <div class="section-item">
+              <label for="netweb_title_${index}">Title</label>
+              <input type="text" id="netweb_title_${index}" name="netweb_projects[title][]" required />
+              <label for="netweb_desc_${index}">Description</label>
+              <div class="contenteditable" id="netweb_desc_${index}" contenteditable="true"></div>
+              <button type="button" class="format-button" onclick="openFormatModal('netweb_desc_${index}')">Format</button>
+              <input type="hidden" id="netweb_desc_${index}_hidden" name="netweb_projects[description][]">
+              <button type="button" class="remove-item">Remove</button>
+            </div>`;
+        } else if (section === 'past_projects') {
+          itemHtml = `
+            <div class="section-item">
+              <label for="past_title_${index}">Title</label>
+              <input type="text" id="past_title_${index}" name="past_projects[title][]" required />
+              <label for="past_desc_${index}">Description</label>
+              <div class="contenteditable" id="past_desc_${index}" contenteditable="true"></div>
+              <button type="button" class="format-button" onclick="openFormatModal('past_desc_${index}')">Format</button>
+              <input type="hidden" id="past_desc_${index}_hidden" name="past_projects[description][]">
+              <button type="button" class="remove-item">Remove</button>
+            </div>`;
+        } else if (section === 'work_experience') {
+          itemHtml = `
+            <div class="section-item">
+              <label for="work_company_${index}">Company Name</label>
+              <input type="text" id="work_company_${index}" name="work_experience[company_name][]" required />
+              <label for="work_start_${index}">Start Date</label>
+              <input type="date" id="work_start_${index}" name="work_experience[start_date_converted][]" />
+              <label for="work_end_${index}">End Date</label>
+              <input type="date" id="work_end_${index}" name="work_experience[end_date_converted][]" />
+              <label for="work_role_${index}">Role</label>
+              <input type="text" id="work_role_${index}" name="work_experience[role][]" required />
+              <label for="work_resp_${index}">Responsibilities</label>
+              <div class="contenteditable" id="work_resp_${index}" contenteditable="true"></div>
+              <button type="button" class="format-button" onclick="openFormatModal('work_resp_${index}')">Format</button>
+              <input type="hidden" id="work_resp_${index}_hidden" name="work_experience[responsibilities][]">
+              <button type="button" class="remove-item">Remove</button>
+            </div>`;
+        } else {
+          itemHtml = `
+            <div class="section-item">
+              <input type="text" name="technical_skills[${section}][]" required />
+              <button type="button" class="remove-item">Remove</button>
+            </div>`;
+        }
+
+        container.insertAdjacentHTML('beforeend', itemHtml);
+        const newDiv = container.querySelector(`#${section === 'netweb_projects' ? 'netweb_desc' : section === 'past_projects' ? 'past_desc' : section === 'work_experience' ? 'work_resp' : 'etc'}_${index}`);
+        if (newDiv && newDiv.classList.contains('contenteditable')) {
+          const hiddenInput = document.getElementById(newDiv.id + '_hidden');
+          if (hiddenInput) {
+            newDiv.addEventListener('input', () => {
+              hiddenInput.value = sanitizeHTML(newDiv.innerHTML.trim());
+              console.log(`Updated ${newDiv.id}_hidden on dynamic input:`, hiddenInput.value);
+            });
+          } else {
+            console.warn(`No hidden input found for dynamic field ${newDiv.id}`);
+          }
+        }
+        if (section === 'education') {
+          document.getElementById(`edu_start_${index}`).addEventListener('change', () => validateEducationDuration(`edu_start_${index}`));
+          document.getElementById(`edu_end_${index}`).addEventListener('change', () => validateEducationDuration(`edu_end_${index}`));
+        }
+      });
+    });
+
+    document.addEventListener('click', function(e) {
+      if (e.target.classList.contains('remove-item')) {
+        if (confirm('Are you sure you want to remove this item?')) {
+          e.target.closest('.section-item').remove();
+        }
+      }
+    });
+
+    document.getElementById('editForm').addEventListener('submit', function(e) {
+      if (!validateForm()) {
+        e.preventDefault();
+        alert('Please correct the errors in the form.');
+        return;
+      }
+      document.querySelectorAll('.contenteditable').forEach(div => {
+        const hiddenInput = document.getElementById(div.id + '_hidden');
+        if (hiddenInput) {
+          hiddenInput.value = sanitizeHTML(div.innerHTML.trim());
+          console.log(`Submitting ${div.id}_hidden with value:`, hiddenInput.value);
+        }
+      });
+      document.getElementById('loaderOverlay').style.display = 'flex';
+    });
+  
@@ -0,0 +1,22 @@
+        function addField(section) {
+            const container = document.getElementById(section);
+            const input = document.createElement('input');
+            input.type = 'text';
+            input.name = `${section.replace(/_[0-9]+$/, '')}[]`;
+            input.className = 'field';
+            container.appendChild(input);
+        }
+
+        function addProject(section) {
+            const container = document.getElementById(section);
+            const div = document.createElement('div');
+            div.className = 'field field-group';
+            div.innerHTML = `
+                <label>Title:</label>
+                <input type="text" name="${section}[title][]">
+                <label>Description:</label>
+                <textarea name="${section}[description][]"></textarea>
+            `;
+            container.appendChild(div);
+        }
+    
@@ -0,0 +1,4 @@
+    document.getElementById("resumeForm").addEventListener("submit", function () {
+      document.getElementById("loaderOverlay").style.display = "flex";
+    });
+  